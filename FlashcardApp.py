@@ -1,9 +1,13 @@
 import sys
+import time
 import pygame
 
 from core.Settings import *
+from core.Profiler import PROFILER
+from core.TextLayout import TextLayout
 from ui.States.States import MainMenuState
-from resources.Images.Images import load_images
+from resources.Images.Images import IMAGES, load_images
+from ui.ProfilerOverlay import ProfilerOverlay
 
 
 class FlashcardApp:
@@ -12,7 +16,12 @@ class FlashcardApp:
     handling game states, and running the main loop.
     """
 
-    def __init__(self):
+    def __init__(self, profile: bool = False, memory_profiler=None):
+        self.start_time = time.perf_counter()
+        self.first_frame_ms = None
+        self.profile = profile
+        self.memory_profiler = memory_profiler
+
         self.init_pygame()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Girly anki")
@@ -25,6 +34,10 @@ class FlashcardApp:
             sys.exit()
 
         self.clock = pygame.time.Clock()
+        self.overlay = ProfilerOverlay(keep_recording=profile)
+        self.section_names: dict[type, tuple[str, str, str]] = {}  # State type -> profiler section names
+        PROFILER.register_counter("images", lambda: (IMAGES.hits, IMAGES.misses))
+        PROFILER.register_counter("text layout", lambda: (TextLayout.hits, TextLayout.misses))
         self.current_state = MainMenuState(self)
 
     @staticmethod
@@ -42,27 +55,60 @@ class FlashcardApp:
         Args:
             new_state: An instance of a class that inherits from ProgramState.
         """
+        if self.memory_profiler:
+            self.memory_profiler.on_transition(self.current_state, new_state)
+        self.current_state.exit()
         self.current_state = new_state
 
+    def sections(self, state) -> tuple[str, str, str]:
+        """
+        Profiler section names of a state's handle_input, update and draw,
+        built once per state type rather than every frame.
+        """
+        names = self.section_names.get(type(state))
+        if names is None:
+            name = type(state).__name__
+            names = (f"{name}.handle_input", f"{name}.update", f"{name}.draw")
+            self.section_names[type(state)] = names
+        return names
+
     def run(self):
         """
         Run the main loop: handle events, update state, and render frames.
         """
         running = True
         while running:
+            PROFILER.begin_frame()
             events = pygame.event.get()
             keys = pygame.key.get_pressed()
+            input_section, update_section, _ = self.sections(self.current_state)
 
-            for event in events:
-                if event.type == pygame.QUIT:
-                    running = False
-                self.current_state.handle_input(event)
+            with PROFILER.section(input_section):
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        running = False
+                    if self.overlay.handle_input(event):
+                        continue
+                    self.current_state.handle_input(event)
 
-            self.current_state.update(keys)
-            self.current_state.draw(self.screen)
+            with PROFILER.section(update_section):
+                self.current_state.update(keys)
+            with PROFILER.section(self.sections(self.current_state)[2]):
+                self.current_state.draw(self.screen)
+            self.overlay.draw(self.screen)
 
             pygame.display.flip()
+            PROFILER.end_frame()
+            if self.first_frame_ms is None:
+                self.first_frame_ms = (time.perf_counter() - self.start_time) * 1000
+                if self.profile:
+                    print(f"Cold start: {self.first_frame_ms:.1f} ms to first frame")
             self.clock.tick(FPS)
 
+        self.current_state.exit()
+        if self.memory_profiler:
+            from ui.Deck_container import DeckContainer
+            self.memory_profiler.print_report(self.memory_profiler.report(DeckContainer.default_folder, IMAGES))
+
         pygame.quit()
         sys.exit()
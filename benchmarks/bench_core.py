@@ -0,0 +1,117 @@
+"""
+Core benchmarks: deck persistence, card (de)serialization, scheduling,
+subdeck building, collection loading and search.
+
+Run from the repository root:
+    python -m benchmarks.bench_core --decks 5 --cards 2000 --out core.json
+"""
+import os
+import json
+import copy
+import argparse
+import tempfile
+
+from benchmarks.common import Report, measure, setup_environment
+from benchmarks.generate import add_arguments, generate_collection
+
+
+def run(args) -> Report:
+    from core.Card import Card
+    from core.Deck import Deck
+    from core.Enums import Rating
+    from core.Scheduler import Scheduler
+    from core.Subdeck import Subdeck
+    from core.FullTextSearch import CollectionIndex
+    from ui.Deck_container import DeckContainer
+
+    report = Report("core", vars(args))
+    tmp = tempfile.mkdtemp(prefix="flashcard-bench-")
+    folder = os.path.join(tmp, "Decks")
+    paths = generate_collection(folder, args.decks, args.cards, args.history, args.status_mix, args.seed)
+    path = paths[0]
+    repeat = args.repeat
+
+    deck = Deck(None, path)
+    report.add("Deck.load_deck", measure(deck.load_deck, repeat), cards=len(deck.cards))
+    report.add("Deck.save_deck", measure(lambda: deck.save_deck(force=True), repeat), cards=len(deck.cards))
+
+    # Typical save after a rating: one changed card
+    touched = deck.cards[0][2]
+
+    def save_one_dirty():
+        touched.interval = touched.interval
+        deck.save_deck()
+
+    report.add("Deck.save_deck (1 dirty)", measure(save_one_dirty, repeat), cards=len(deck.cards))
+
+    with open(path, "r", encoding="utf-8") as f:
+        raw_cards = json.load(f)["cards"]
+    report.add("Card.from_dict (deck)", measure(lambda: [Card.from_dict(c) for c in raw_cards], repeat),
+               cards=len(raw_cards))
+    cards = [c for _, _, c in deck.cards]
+    report.add("Card.to_dict (deck)", measure(lambda: [c.to_dict() for c in cards], repeat), cards=len(cards))
+
+    subdeck = Subdeck(deck, 20)
+    report.add("Subdeck._generate_cards", measure(lambda: subdeck._generate_cards(deck), repeat))
+
+    def fresh_subdeck():
+        d = Deck(None, path)
+        return Subdeck(d, 20)
+
+    def rate_all(sub):
+        ratings = [Rating.GOOD, Rating.AGAIN, Rating.EASY, Rating.HARD]
+        i = 0
+        while sub.current_card is not None and i < 40:
+            sub.modify_card(ratings[i % len(ratings)])
+            i += 1
+
+    modify_samples = []
+    for _ in range(repeat):
+        sub = fresh_subdeck()
+        modify_samples.extend(
+            measure(lambda: sub.modify_card(Rating.GOOD), repeat=min(10, len(sub.cards)), warmup=0)
+        )
+    report.add("Subdeck.modify_card", modify_samples)
+    report.add("Subdeck session (20 cards)", measure(rate_all, repeat, setup=fresh_subdeck))
+
+    scheduler = Scheduler()
+    pool = [copy.deepcopy(c) for c in cards[:1000]]
+    ratings = list(Rating)
+    report.add("Scheduler.update_card x1000",
+               measure(lambda: [scheduler.update_card(c, ratings[i % 4]) for i, c in enumerate(pool)], repeat))
+
+    report.add("DeckContainer.load_all_decks", measure(lambda: DeckContainer(folder), repeat),
+               decks=args.decks, cards=args.decks * args.cards)
+
+    # DeckContainer already built tmp/Index; the cold rows use their own folder
+    # so they time a real first build and a first load from disk.
+    index_folder = tempfile.mkdtemp(prefix="index-", dir=tmp)
+    index = CollectionIndex(index_folder)
+    decks = [Deck(None, p) for p in paths]
+    report.add("CollectionIndex.sync (cold)", measure(lambda: index.sync(decks), 1, warmup=0))
+    index.sync(decks)
+    for query in ("river", "riv", "rivr stone", "garden winter music"):
+        fresh = CollectionIndex(index_folder)
+        report.add(f"CollectionIndex.search '{query}' (cold)", measure(lambda: fresh.search(query), 1, warmup=0))
+        report.add(f"CollectionIndex.search '{query}'", measure(lambda: index.search(query), repeat))
+
+    trigram = deck.search_index
+    for query in ("ri", "river", "river stone"):
+        report.add(f"TrigramIndex.search '{query}'", measure(lambda: trigram.search(query), repeat))
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark core deck operations")
+    add_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    setup_environment()
+    run(args).write(args.out)
+
+
+if __name__ == "__main__":
+    main()
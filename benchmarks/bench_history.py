@@ -0,0 +1,95 @@
+"""
+History benchmarks: loading and saving decks whose cards have long review
+histories, with history decoded lazily (the default) and eagerly.
+
+Run from the repository root:
+    python -m benchmarks.bench_history --cards 2000 --history 300 --out history.json
+"""
+import os
+import json
+import argparse
+import tempfile
+
+from benchmarks.common import Report, measure, setup_environment
+from benchmarks.generate import add_arguments, generate_collection
+
+
+def run(args) -> Report:
+    from core.Card import Card
+    from core.Deck import Deck
+    from core.Enums import Rating
+    from core.Scheduler import Scheduler
+
+    report = Report("history", vars(args))
+    tmp = tempfile.mkdtemp(prefix="flashcard-bench-")
+    path = generate_collection(os.path.join(tmp, "Decks"), 1, args.cards, args.history,
+                               args.status_mix, args.seed)[0]
+    repeat = args.repeat
+
+    # Rewrite in the line-per-card layout, as the app saves it
+    Deck(None, path).save_deck(force=True)
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    entries = json.loads(text)["cards"]
+    entries_count = sum(len(e.get("history", [])) for e in entries)
+
+    def load_eager():
+        cards = [Card.from_dict(e) for e in entries]
+        for c in cards:
+            c.history
+        return cards
+
+    lazy = report.add("Card.from_dict (lazy history)",
+                      measure(lambda: [Card.from_dict(e) for e in entries], repeat),
+                      cards=len(entries), history_entries=entries_count)
+    eager = report.add("Card.from_dict (decoded history)", measure(load_eager, repeat),
+                       cards=len(entries), history_entries=entries_count)
+    report.data["results"]["Card.from_dict (lazy history)"]["speedup"] = eager["p50_ms"] / lazy["p50_ms"]
+
+    lazy = report.add("Deck.load_deck (lazy history)", measure(lambda: Deck(None, path), repeat))
+
+    def load_deck_eager():
+        deck = Deck(None, path)
+        for _, _, c in deck.cards:
+            c.history
+        return deck
+
+    eager = report.add("Deck.load_deck (decoded history)", measure(load_deck_eager, repeat))
+    report.data["results"]["Deck.load_deck (lazy history)"]["speedup"] = eager["p50_ms"] / lazy["p50_ms"]
+
+    scheduler = Scheduler()
+    ratings = list(Rating)
+
+    def review_and_save(deck):
+        # A short session: rate 20 cards, then save the deck
+        for i, (_, _, card) in enumerate(deck.cards[:20]):
+            scheduler.update_card(card, ratings[i % len(ratings)])
+        deck.save_deck()
+
+    def restored(load):
+        # Undo the previous run's save so every run starts from the same file
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return load()
+
+    report.add("review 20 + save (lazy history)",
+               measure(review_and_save, repeat, setup=lambda: restored(lambda: Deck(None, path))))
+    report.add("review 20 + save (decoded history)",
+               measure(review_and_save, repeat, setup=lambda: restored(load_deck_eager)))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lazy review history decoding")
+    add_arguments(parser)
+    parser.set_defaults(decks=1, cards=2000, history=300)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    setup_environment()
+    run(args).write(args.out)
+
+
+if __name__ == "__main__":
+    main()
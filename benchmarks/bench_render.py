@@ -0,0 +1,214 @@
+"""
+Headless rendering benchmark for every program state.
+
+Each state is created against a synthetic collection with SDL's dummy video
+driver and fed a scripted event sequence (scrolling, typing searches, rating
+cards). handle_input() and draw() are timed per call and reported as
+percentiles. The run fails when frame time exceeds the budget.
+
+Run from the repository root:
+    python -m benchmarks.bench_render --cards 2000 --budget-ms 16.7
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+from benchmarks.common import Report, setup_environment
+from benchmarks.generate import add_arguments, generate_collection
+
+
+class HeadlessGame:
+    """
+    Minimal stand-in for FlashcardApp: a dummy-driver screen, a clock and
+    state changes that are recorded instead of taking over the benchmark.
+    """
+
+    def __init__(self) -> None:
+        import pygame
+        from core.Settings import WIDTH, HEIGHT
+
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.clock = pygame.time.Clock()
+        self.transitions = []
+
+    def change_state(self, new_state) -> None:
+        self.transitions.append(type(new_state).__name__)
+
+
+def click(pos):
+    import pygame
+    return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos)]
+
+
+def wheel(down: bool, pos=(500, 300)):
+    import pygame
+    return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=5 if down else 4, pos=pos)]
+
+
+def key(char: str = "", code: int = 0):
+    import pygame
+    return [pygame.event.Event(pygame.KEYDOWN, key=code or (ord(char) if char else 0), unicode=char, mod=0)]
+
+
+def typing(text: str):
+    """One frame per typed character."""
+    return [key(ch) for ch in text]
+
+
+def backspaces(n: int):
+    import pygame
+    return [key("", pygame.K_BACKSPACE) for _ in range(n)]
+
+
+def idle(frames: int):
+    return [[] for _ in range(frames)]
+
+
+# ─── Scenarios: (state factory, list of per-frame event lists) ────────────
+
+def main_menu_scenario(game, container):
+    from ui.States.States import MainMenuState
+    from ui.Buttons import bunny_mask
+    import pygame
+
+    state = MainMenuState(game)
+    frames = [[pygame.event.Event(pygame.MOUSEMOTION, pos=(x, 300), rel=(4, 0), buttons=(0, 0, 0))]
+              for x in range(0, 1000, 20)]
+    frames += [click(bunny_mask[10])] + idle(20)
+    return state, frames
+
+
+def deck_screen_scenario(game, container):
+    from ui.States.States import DeckScreenState
+    from ui.Buttons import search_bar_rect
+
+    state = DeckScreenState(game)
+    frames = [wheel(True) for _ in range(15)] + [wheel(False) for _ in range(15)]
+    frames += [click(search_bar_rect.center)]
+    frames += typing("synthetic 00") + idle(10) + backspaces(12) + typing("river") + idle(10)
+    return state, frames
+
+
+def deck_edit_scenario(game, container):
+    from ui.States.States import DeckEditState
+
+    deck = container.decks[0]
+    state = DeckEditState(game, deck)
+    state.draw(game.screen)
+    edit = state.deck_edit
+
+    frames = [wheel(True, edit.left_rect.center) for _ in range(20)]
+    frames += [wheel(False, edit.left_rect.center) for _ in range(20)]
+    frames += [click(edit.search_rect.center)] + typing("river st") + idle(10) + backspaces(8) + idle(5)
+    frames += [click(edit.card_rects[0].center) if edit.card_rects else []]
+    frames += [click(edit.back_input_rect.center)] + typing(" more text on the back of the card" * 3)
+    return state, frames
+
+
+def learn_scenario(game, container):
+    from ui.States.States import LearnState
+    from ui.LearningSession import LearningSession
+
+    state = LearnState(game, container.decks[0])
+    frames = []
+    for _ in range(20):
+        frames += [click(state.session.card_rect.center)] + idle(2)
+        frames += [click(LearningSession.medium_rect.center)] + idle(2)
+    return state, frames
+
+
+def finish_scenario(game, container):
+    from ui.States.States import FinishState
+    return FinishState(game), idle(60)
+
+
+SCENARIOS = {
+    "MainMenuState": main_menu_scenario,
+    "DeckScreenState": deck_screen_scenario,
+    "DeckEditState": deck_edit_scenario,
+    "LearnState": learn_scenario,
+    "FinishState": finish_scenario,
+}
+
+
+def replay(game, state, frames):
+    """
+    Play frames through a state and return (handle_input, draw, frame) samples in seconds.
+    Events posted by the app itself (e.g. search results) are delivered as they arrive.
+    """
+    import pygame
+
+    inputs, draws, totals = [], [], []
+    for events in frames:
+        frame_start = time.perf_counter()
+        for event in events + pygame.event.get():
+            start = time.perf_counter()
+            state.handle_input(event)
+            inputs.append(time.perf_counter() - start)
+
+        state.update(pygame.key.get_pressed())
+
+        start = time.perf_counter()
+        state.draw(game.screen)
+        draws.append(time.perf_counter() - start)
+
+        totals.append(time.perf_counter() - frame_start)
+        game.clock.tick()
+    return inputs, draws, totals
+
+
+def run(args) -> tuple[Report, list[str]]:
+    from resources.Images.Images import load_images
+    from ui.Deck_container import DeckContainer
+
+    report = Report("render", vars(args))
+    tmp = tempfile.mkdtemp(prefix="flashcard-render-")
+    folder = os.path.join(tmp, "Decks")
+    generate_collection(folder, args.decks, args.cards, args.history, args.status_mix, args.seed)
+    DeckContainer.default_folder = folder
+
+    game = HeadlessGame()
+    load_images()
+    container = DeckContainer(folder)
+
+    over_budget = []
+    names = args.states.split(",") if args.states else list(SCENARIOS)
+    for name in names:
+        state, frames = SCENARIOS[name](game, container)
+        inputs, draws, totals = replay(game, state, frames)
+
+        report.add(f"{name}.handle_input", inputs)
+        report.add(f"{name}.draw", draws)
+        frame = report.add(f"{name}.frame", totals, transitions=game.transitions[:])
+        game.transitions.clear()
+
+        if frame[f"p{args.budget_percentile}_ms"] > args.budget_ms:
+            over_budget.append(name)
+    return report, over_budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless per-state rendering benchmark")
+    add_arguments(parser)
+    parser.add_argument("--states", help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--budget-ms", type=float, default=1000 / 60, help="frame budget in milliseconds")
+    parser.add_argument("--budget-percentile", type=int, choices=[50, 90, 95, 99], default=95,
+                        help="frame time percentile checked against the budget")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    setup_environment()
+    report, over_budget = run(args)
+    report.data["over_budget"] = over_budget
+    report.write(args.out)
+
+    if over_budget:
+        print(f"Frame budget of {args.budget_ms:.1f} ms (p{args.budget_percentile}) exceeded by: "
+              + ", ".join(over_budget), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import os
+import sys
+import json
+import time
+import platform
+import datetime
+import subprocess
+from typing import Callable, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_environment(headless: bool = True) -> None:
+    """
+    Make the app importable and initialise pygame. Fonts are loaded with
+    paths relative to the repository root, so benchmarks run from there.
+    """
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    import pygame
+    pygame.init()
+
+
+def percentile(sorted_samples: list[float], p: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    k = (len(sorted_samples) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_samples) - 1)
+    return sorted_samples[lo] + (sorted_samples[hi] - sorted_samples[lo]) * (k - lo)
+
+
+def summarize(samples: list[float]) -> dict:
+    """Summarize samples given in seconds; all values are reported in milliseconds."""
+    ordered = sorted(samples)
+    ms = 1000
+    return {
+        "n": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * ms if ordered else 0.0,
+        "min_ms": ordered[0] * ms if ordered else 0.0,
+        "p50_ms": percentile(ordered, 50) * ms,
+        "p90_ms": percentile(ordered, 90) * ms,
+        "p95_ms": percentile(ordered, 95) * ms,
+        "p99_ms": percentile(ordered, 99) * ms,
+        "max_ms": ordered[-1] * ms if ordered else 0.0,
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, warmup: int = 1,
+            setup: Optional[Callable[[], object]] = None) -> list[float]:
+    """
+    Time fn `repeat` times. If setup is given, its result is passed to fn
+    and its cost is not measured.
+    """
+    samples = []
+    for i in range(warmup + repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        fn(arg) if setup else fn()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Report:
+    """
+    Collects benchmark results and writes them as JSON, together with
+    the commit and environment they were measured on.
+    """
+
+    def __init__(self, suite: str, config: dict) -> None:
+        self.data = {
+            "suite": suite,
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": config,
+            "results": {},
+        }
+
+    def add(self, name: str, samples: list[float], **extra) -> dict:
+        result = summarize(samples)
+        result.update(extra)
+        self.data["results"][name] = result
+        print(f"{name:<40} p50 {result['p50_ms']:10.3f} ms   p95 {result['p95_ms']:10.3f} ms   "
+              f"p99 {result['p99_ms']:10.3f} ms", file=sys.stderr)
+        return result
+
+    def write(self, path: Optional[str]) -> None:
+        text = json.dumps(self.data, indent=2)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            print(text)
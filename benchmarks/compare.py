@@ -0,0 +1,47 @@
+"""
+Compare two benchmark reports and flag regressions.
+
+    python -m benchmarks.compare before.json after.json --threshold 1.2
+"""
+import sys
+import json
+import argparse
+
+
+def compare(before: dict, after: dict, metric: str, threshold: float) -> list[str]:
+    """Print a ratio table and return the names of regressed benchmarks."""
+    regressions = []
+    print(f"{'benchmark':<45} {'before':>12} {'after':>12} {'ratio':>8}")
+    for name, new in after["results"].items():
+        old = before["results"].get(name)
+        if old is None:
+            print(f"{name:<45} {'-':>12} {new[metric]:12.3f} {'new':>8}")
+            continue
+        ratio = new[metric] / old[metric] if old[metric] else float("inf")
+        flag = "  <-- regression" if ratio > threshold else ""
+        print(f"{name:<45} {old[metric]:12.3f} {new[metric]:12.3f} {ratio:8.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--metric", default="p50_ms", help="result field to compare (default: p50_ms)")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio counted as a regression")
+    args = parser.parse_args()
+
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+
+    print(f"{before.get('commit')} -> {after.get('commit')} ({args.metric})")
+    regressions = compare(before, after, args.metric, args.threshold)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import os
+import json
+import random
+import argparse
+import datetime
+
+from core.Card import Card
+from core.Enums import CardStatus, Rating
+
+WORDS = (
+    "apple river stone light garden winter paper music window silver forest "
+    "market bridge candle planet ocean letter mirror shadow thunder meadow "
+    "harbor lantern pepper violet cotton engine castle feather island"
+).split()
+
+
+def parse_status_mix(text: str) -> dict[CardStatus, float]:
+    """Parse "new:0.3,learning:0.1,review:0.6" into weights per status."""
+    mix = {}
+    for part in text.split(","):
+        name, weight = part.split(":")
+        mix[CardStatus(name.strip())] = float(weight)
+    return mix
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate_card(rng: random.Random, status: CardStatus, history: int, now: datetime.datetime) -> Card:
+    card = Card(random_text(rng, rng.randint(1, 4)), random_text(rng, rng.randint(3, 20)),
+                card_id=f"{rng.getrandbits(128):032x}")
+    card.create_date = now - datetime.timedelta(days=rng.randint(history, history + 365))
+    card.status = status
+
+    if status == CardStatus.NEW:
+        card.scheduled_date = card.create_date
+        return card
+
+    reviews = rng.randint(max(1, history // 2), max(1, history))
+    day = card.create_date
+    for _ in range(reviews):
+        day += datetime.timedelta(days=rng.randint(1, 10), minutes=rng.randint(0, 600))
+        card.history.append((day, rng.choice(list(Rating))))
+    card.last_review = card.history[-1][0]
+    card.repetition = reviews
+    card.lapses = sum(1 for _, r in card.history if r == Rating.AGAIN)
+    card.easiness = round(rng.uniform(1.3, 2.8), 2)
+
+    if status == CardStatus.LEARNING:
+        card.scheduled_date = now + datetime.timedelta(minutes=rng.choice([-30, 1, 10]))
+    else:
+        card.interval = rng.randint(1, 120)
+        card.scheduled_date = now + datetime.timedelta(days=rng.randint(-5, card.interval))
+    return card
+
+
+def generate_collection(folder: str, decks: int = 5, cards: int = 1000, history: int = 10,
+                        status_mix: str = "new:0.3,learning:0.1,review:0.6", seed: int = 0) -> list[str]:
+    """
+    Write a reproducible synthetic collection of deck files into a folder.
+
+    Args:
+        folder: Target deck folder (created if missing).
+        decks: Number of decks.
+        cards: Cards per deck.
+        history: Maximum number of review history entries per reviewed card.
+        status_mix: Relative share of new, learning and review cards.
+        seed: Random seed; the same arguments always produce the same collection.
+
+    Returns:
+        list[str]: Paths of the written deck files.
+    """
+    rng = random.Random(seed)
+    mix = parse_status_mix(status_mix)
+    statuses, weights = list(mix), list(mix.values())
+    now = datetime.datetime(2025, 1, 1, 12, 0)
+    os.makedirs(folder, exist_ok=True)
+
+    paths = []
+    for d in range(decks):
+        name = f"Synthetic {d:03d}"
+        data = {
+            "name": name,
+            "cards": [
+                generate_card(rng, rng.choices(statuses, weights)[0], history, now).to_dict()
+                for _ in range(cards)
+            ],
+        }
+        path = os.path.join(folder, f"{name}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        paths.append(path)
+    return paths
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--decks", type=int, default=5, help="number of decks")
+    parser.add_argument("--cards", type=int, default=1000, help="cards per deck")
+    parser.add_argument("--history", type=int, default=10, help="max review history entries per card")
+    parser.add_argument("--status-mix", default="new:0.3,learning:0.1,review:0.6",
+                        help="share of each card status, e.g. new:0.3,learning:0.1,review:0.6")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic flashcard collection")
+    parser.add_argument("folder", help="deck folder to write")
+    add_arguments(parser)
+    args = parser.parse_args()
+    paths = generate_collection(args.folder, args.decks, args.cards, args.history, args.status_mix, args.seed)
+    print(f"Wrote {len(paths)} decks to {args.folder}")
+
+
+if __name__ == "__main__":
+    main()
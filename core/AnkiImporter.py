@@ -0,0 +1,192 @@
+import os
+import re
+import html
+import json
+import sqlite3
+import zipfile
+import datetime
+import tempfile
+from typing import Iterator, Optional
+
+from core.Card import Card
+from core.Deck import Deck
+from core.Enums import CardStatus, Rating
+from core.Importer import ProgressCallback, card_key, print_progress
+
+TAG_RE = re.compile(r"<[^>]+>")
+BREAK_RE = re.compile(r"<br\s*/?>|</div>|</p>", re.IGNORECASE)
+UNSAFE_NAME_RE = re.compile(r'[<>:"/\\|?*]+')
+
+# Anki card types: 0 new, 1 learning, 2 review, 3 relearning
+ANKI_STATUS = {0: CardStatus.NEW, 1: CardStatus.LEARNING, 2: CardStatus.REVIEW, 3: CardStatus.LEARNING}
+# Anki answer buttons: 1 again, 2 hard, 3 good, 4 easy
+ANKI_RATING = {1: Rating.AGAIN, 2: Rating.HARD, 3: Rating.GOOD, 4: Rating.EASY}
+# Bound parameters per query; SQLite before 3.32 allows at most 999
+MAX_SQL_VARIABLES = 900
+
+
+def strip_html(text: str) -> str:
+    """Turn an Anki field into plain text."""
+    text = BREAK_RE.sub("\n", text)
+    return html.unescape(TAG_RE.sub("", text)).replace("\xa0", " ").strip()
+
+
+class AnkiImporter:
+    """
+    Imports an Anki package (.apkg) using only the standard library.
+
+    The package's SQLite collection is read in batches, one Anki deck at a
+    time; note fields, scheduling data and the review log are mapped onto
+    Card fields and history, and every deck is written through Deck.add_cards.
+    """
+
+    def __init__(self, folder: str, batch_size: int = MAX_SQL_VARIABLES,
+                 progress: Optional[ProgressCallback] = print_progress) -> None:
+        self.folder = folder
+        self.batch_size = batch_size
+        self.progress = progress
+        self.decks: dict[str, int] = {}
+
+    def run(self, path: str) -> dict[str, int]:
+        """
+        Import every deck from the package.
+
+        Returns:
+            dict[str, int]: Number of cards added per deck name.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = self._extract(path, tmp)
+            con = sqlite3.connect(db_path)
+            try:
+                self._import(con)
+            finally:
+                con.close()
+        return self.decks
+
+    @staticmethod
+    def _extract(path: str, target: str) -> str:
+        with zipfile.ZipFile(path) as z:
+            names = set(z.namelist())
+            # Newer packages keep a placeholder in collection.anki2
+            for name in ("collection.anki21", "collection.anki2"):
+                if name in names:
+                    return z.extract(name, target)
+            if "collection.anki21b" in names:
+                raise ValueError("Packages in the zstd-compressed collection.anki21b format are not supported; "
+                                 "export from Anki with 'Support older Anki versions' enabled")
+        raise ValueError(f"{path} is not an Anki package")
+
+    def _import(self, con: sqlite3.Connection) -> None:
+        crt, decks_json = con.execute("SELECT crt, decks FROM col").fetchone()
+        anki_decks = {int(did): d["name"] for did, d in json.loads(decks_json).items()}
+        collection_day = datetime.datetime.fromtimestamp(crt).date()
+        total = con.execute("SELECT count(*) FROM cards").fetchone()[0] or 1
+
+        done = 0
+        deck_id = None
+        pending: list[Card] = []
+        for did, batch in self._card_batches(con):
+            if did != deck_id:
+                self._write_deck(anki_decks.get(deck_id), pending)
+                deck_id, pending = did, []
+
+            histories = self._histories(con, [row[0] for row in batch])
+            for row in batch:
+                card = self._to_card(row, histories.get(row[0], []), collection_day)
+                if card is not None:
+                    pending.append(card)
+
+            done += len(batch)
+            if self.progress:
+                self.progress(min(done / total, 0.99), done, sum(self.decks.values()) + len(pending))
+
+        self._write_deck(anki_decks.get(deck_id), pending)
+        if self.progress:
+            self.progress(1.0, done, sum(self.decks.values()))
+
+    def _card_batches(self, con: sqlite3.Connection) -> Iterator[tuple[int, list[tuple]]]:
+        """Yield (deck id, rows) batches ordered by deck so decks are written one at a time."""
+        cursor = con.execute(
+            "SELECT c.id, c.did, c.ord, c.type, c.due, c.ivl, c.factor, c.reps, c.lapses, n.id, n.flds "
+            "FROM cards c JOIN notes n ON n.id = c.nid ORDER BY c.did, c.id"
+        )
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            start = 0
+            for i in range(1, len(rows) + 1):
+                if i == len(rows) or rows[i][1] != rows[start][1]:
+                    yield rows[start][1], rows[start:i]
+                    start = i
+
+    @staticmethod
+    def _histories(con: sqlite3.Connection, card_ids: list[int]) -> dict[int, list[tuple[datetime.datetime, Rating]]]:
+        histories: dict[int, list[tuple[datetime.datetime, Rating]]] = {}
+        for start in range(0, len(card_ids), MAX_SQL_VARIABLES):
+            ids = card_ids[start:start + MAX_SQL_VARIABLES]
+            placeholders = ",".join("?" * len(ids))
+            for cid, rid, ease in con.execute(
+                f"SELECT cid, id, ease FROM revlog WHERE cid IN ({placeholders}) ORDER BY cid, id", ids
+            ):
+                rating = ANKI_RATING.get(ease)
+                if rating is not None:
+                    histories.setdefault(cid, []).append((datetime.datetime.fromtimestamp(rid / 1000), rating))
+        return histories
+
+    @staticmethod
+    def _to_card(row: tuple, history: list, collection_day: datetime.date) -> Optional[Card]:
+        _, _, ord_, type_, due, ivl, factor, reps, lapses, nid, flds = row
+        fields = [strip_html(f) for f in flds.split("\x1f")]
+        if len(fields) < 2 or not fields[0]:
+            return None
+
+        # Second template of "Basic (and reversed card)" asks the other way round
+        front, back = (fields[1], fields[0]) if ord_ == 1 else (fields[0], fields[1])
+        card = Card(front, back)
+        card.create_date = datetime.datetime.fromtimestamp(nid / 1000)
+        card.status = ANKI_STATUS.get(type_, CardStatus.NEW)
+        card.interval = max(ivl, 0)
+        card.easiness = factor / 1000 if factor else 2.5
+        card.repetition = reps
+        card.lapses = lapses
+        card.history = history
+        card.last_review = history[-1][0] if history else None
+
+        if card.status == CardStatus.REVIEW:
+            # Review due dates are day numbers relative to the collection creation
+            day = collection_day + datetime.timedelta(days=due)
+            card.scheduled_date = datetime.datetime.combine(day, datetime.time(hour=8))
+        elif card.status == CardStatus.LEARNING:
+            card.scheduled_date = datetime.datetime.fromtimestamp(due)
+        else:
+            # New card due values are queue positions; keep their order
+            card.scheduled_date = datetime.datetime.now() + datetime.timedelta(microseconds=due)
+        return card
+
+    def _write_deck(self, anki_name: Optional[str], cards: list[Card]) -> None:
+        if anki_name is None or not cards:
+            return
+
+        name = UNSAFE_NAME_RE.sub("_", anki_name.replace("::", " - ")).strip() or "Anki"
+        deck = Deck(name, os.path.join(self.folder, f"{name}.json"))
+        seen = {card_key(c.front, c.back) for _, _, c in deck.cards}
+
+        new_cards = []
+        for card in cards:
+            key = card_key(card.front, card.back)
+            if key not in seen:
+                seen.add(key)
+                new_cards.append(card)
+
+        self.decks[name] = self.decks.get(name, 0) + deck.add_cards(new_cards)
+
+
+def import_apkg(path: str, folder: str, progress: Optional[ProgressCallback] = print_progress) -> dict[str, int]:
+    """
+    Import an Anki package into the deck folder.
+
+    Returns:
+        dict[str, int]: Number of cards added per deck name.
+    """
+    return AnkiImporter(folder, progress=progress).run(path)
@@ -1,65 +1,273 @@
+import json
+import time
+import uuid
 from datetime import datetime
 from core.Enums import CardStatus
-from functools import total_ordering
 
-@total_ordering
+
+def new_card_id() -> str:
+    return uuid.uuid4().hex
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+# Attributes written to the deck file; assigning one marks the card dirty.
+# The sync fields usn and mod are written as well, and stamped by mark_dirty().
+PERSISTED_FIELDS = frozenset({
+    "id", "front", "back", "create_date", "last_review", "interval", "repetition",
+    "easiness", "lapses", "scheduled_date", "history", "status",
+})
+
+# Attributes changed by Scheduler.update_card (besides the appended history entry)
+SCHEDULING_FIELDS = (
+    "status", "last_review", "interval", "repetition", "easiness", "lapses", "scheduled_date", "learning_index",
+)
+
+
 class Card:
     """
     Represents a single flashcard used in spaced repetition learning (SM-2).
     Tracks learning stats, scheduling, and historical review data.
+
+    Every card has a persistent id, stored in the deck file; cards are equal
+    and hash by id, so they can be used as dict keys and set members.
+
+    The card's serialized JSON is cached after a load or save. Assigning a
+    persisted field drops the cache and reports the card to the decks that
+    hold it (see Deck.save_deck), so unchanged cards are never re-encoded.
+
+    Review history is kept as loaded from the file ([iso date, rating]
+    pairs) until it is first read. Reviews recorded with append_history go
+    to a separate tail, and saving writes the raw entries plus the encoded
+    tail, so reviewing never decodes the history of a card.
+
+    A card can be held at an earlier serialized state (see hold()); decks
+    then keep writing that state, e.g. while a rating can still be undone.
+
+    For syncing (see core.Sync), every change stamps the card with its
+    modification time (mod, epoch ms) and an update sequence number (usn)
+    of -1, meaning "not sent to the sync server yet".
     """
-    def __init__(self, f, b):
-        self.front = f
-        self.back = b
-        self.create_date = datetime.today()
-
-        self.status = CardStatus.NEW
-        self.last_review = None
-        self.interval = 0
-        self.repetition = 0
-        self.easiness = 2.5
-        self.lapses = 0
-        self.scheduled_date = None
-        self.history = []
-
-        self.learning_index = 0
-        self.learning_steps = [1, 10]
+    def __init__(self, f, b, card_id: str = None):
+        # Set through __dict__: a new card has no cached JSON or owners to notify yet
+        self.__dict__.update(
+            _json=None,
+            _held=None,
+            _history_len=0,
+            _owners=[],
+            id=card_id or new_card_id(),
+            front=f,
+            back=b,
+            create_date=datetime.today(),
+            status=CardStatus.NEW,
+            last_review=None,
+            interval=0,
+            repetition=0,
+            easiness=2.5,
+            lapses=0,
+            scheduled_date=None,
+            _history=[],
+            _raw_history=None,
+            _history_tail=[],
+            learning_index=0,
+            learning_steps=[1, 10],
+            usn=-1,
+            mod=now_ms(),
+        )
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in PERSISTED_FIELDS:
+            self.mark_dirty()
+
+    def __getstate__(self):
+        # Copies (and pickles) of a card do not belong to its decks
+        state = self.__dict__.copy()
+        state["_owners"] = []
+        return state
+
+    def mark_dirty(self) -> None:
+        """Stamp a change for syncing and tell the owning decks this card needs saving."""
+        self.__dict__.update(usn=-1, mod=now_ms())
+        self._notify()
+
+    def mark_synced(self, usn: int, mod: int = None) -> None:
+        """Store the card's sync state; unlike mark_dirty() this is not a change to send."""
+        self.__dict__["usn"] = usn
+        if mod is not None:
+            self.__dict__["mod"] = mod
+        self._notify()
+
+    def _notify(self) -> None:
+        """Drop the cached JSON and tell the owning decks this card needs saving."""
+        self.__dict__["_json"] = None
+        for deck in self._owners:
+            deck.dirty_cards.add(self.id)
+
+    @property
+    def dirty(self) -> bool:
+        # A decoded history can be appended to in place, so its length is checked as well
+        if self._json is None:
+            return True
+        return self._history is not None and self._history_len != len(self._history)
+
+    def to_json(self) -> str:
+        """
+        Return the card as a JSON object string, re-encoding it only if it changed.
+        """
+        if self.dirty:
+            self.__dict__["_json"] = json.dumps(self.to_dict(), ensure_ascii=False, default=str)
+            self.__dict__["_history_len"] = self.history_count
+        return self._json
+
+    def persisted_json(self) -> str:
+        """The JSON written to disk: the held state if there is one, else the current one."""
+        return self._held if self._held is not None else self.to_json()
+
+    def hold(self, state_json: str) -> None:
+        """Keep writing state_json to disk instead of the card's current state."""
+        self.__dict__["_held"] = state_json
+        self._notify()
+
+    def release(self) -> None:
+        """Stop holding: the current state is written from the next save on."""
+        if self._held is not None:
+            self.__dict__["_held"] = None
+            self._notify()
+
+    def scheduling_state(self) -> tuple:
+        """Values of SCHEDULING_FIELDS, for restoring them later."""
+        return tuple(getattr(self, name) for name in SCHEDULING_FIELDS)
+
+    def restore_scheduling(self, state: tuple) -> None:
+        for name, value in zip(SCHEDULING_FIELDS, state):
+            setattr(self, name, value)
+
+    def adopt(self, other: 'Card') -> None:
+        """
+        Take over the saved state of another copy of this card (e.g. one
+        written by another program), keeping this object and its decks.
+        """
+        state = {k: v for k, v in other.__dict__.items() if k not in ("id", "_owners", "_held")}
+        self.__dict__.update(state)
+
+    @property
+    def history(self) -> list:
+        """Review history as (datetime, rating) pairs, decoded on first access."""
+        if self._history is None:
+            decoded = [(datetime.fromisoformat(dt), rating) for dt, rating in self._raw_history]
+            decoded.extend(self._history_tail)
+            self.__dict__.update(_history=decoded, _raw_history=None, _history_tail=[])
+        return self._history
+
+    @history.setter
+    def history(self, value: list) -> None:
+        self.__dict__.update(_history=value, _raw_history=None, _history_tail=[])
+
+    @property
+    def history_count(self) -> int:
+        """Number of reviews, without decoding the history."""
+        if self._history is not None:
+            return len(self._history)
+        return len(self._raw_history) + len(self._history_tail)
+
+    def append_history(self, when: datetime, rating) -> None:
+        """Record a review without decoding the stored history."""
+        if self._history is not None:
+            self._history.append((when, rating))
+        else:
+            self._history_tail.append((when, rating))
+        self.mark_dirty()
+
+    def pop_history(self) -> None:
+        """Remove the latest review, without decoding the stored history."""
+        if self._history is not None:
+            self._history.pop()
+        elif self._history_tail:
+            self._history_tail.pop()
+        else:
+            self.__dict__["_raw_history"] = self._raw_history[:-1]
+        self.mark_dirty()
+
+    def merge_history(self, entries: list) -> bool:
+        """
+        Add the reviews of another copy of this card that are missing here,
+        keeping the history in time order and undecoded.
+
+        Args:
+            entries (list): [iso date, rating] pairs.
+
+        Returns:
+            bool: True if any review was added.
+        """
+        encoded = self._encoded_history()
+        known = {(dt, int(rating)) for dt, rating in encoded}
+        missing = [[dt, int(rating)] for dt, rating in entries if (dt, int(rating)) not in known]
+        if not missing:
+            return False
+        merged = sorted(encoded + missing, key=lambda entry: datetime.fromisoformat(entry[0]))
+        self.__dict__.update(_history=None, _raw_history=merged, _history_tail=[])
+        self._notify()
+        return True
+
+    def _encoded_history(self) -> list:
+        if self._history is not None:
+            return [[dt.isoformat(), int(rating)] for dt, rating in self._history]
+        return self._raw_history + [[dt.isoformat(), int(rating)] for dt, rating in self._history_tail]
 
     @property
     def graduated(self) -> bool:
         return self.status == CardStatus.REVIEW
 
     def __eq__(self, other):
-        return self.scheduled_date == other.scheduled_date
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.id == other.id
 
     def __lt__(self, other):
         return self.scheduled_date < other.scheduled_date
 
     def __hash__(self):
-        return hash((self.front, self.back))
+        return hash(self.id)
 
     def __str__(self):
         return f"Front: {self.front}, Back: {self.back}"
 
     @staticmethod
-    def from_dict(data: dict) -> 'Card':
-        c = Card(data["front"], data["back"])
-        c.create_date = datetime.fromisoformat(data.get("create_date")) if data.get("create_date") else datetime.today()
-        c.last_review = datetime.fromisoformat(data.get("last_review")) if data.get("last_review") else None
-        c.interval = data.get("interval", 0)
-        c.repetition = data.get("repetition", 0)
-        c.easiness = data.get("easiness", 2.5)
-        c.lapses = data.get("lapses", 0)
-        c.scheduled_date = datetime.fromisoformat(data.get("scheduled_date")) if data.get("scheduled_date") else datetime.max
-        c.history = [
-            (datetime.fromisoformat(dt), rating) for dt, rating in data.get("history", [])
-        ]
+    def from_dict(data: dict, raw: str = None) -> 'Card':
+        """
+        Build a card from its deck file entry.
+
+        Args:
+            data (dict): Decoded card entry.
+            raw (str, optional): The entry's JSON text, kept as the cached serialization.
+        """
+        c = Card(data["front"], data["back"], data.get("id"))
+        history = data.get("history") or []
+        c.__dict__.update(
+            create_date=datetime.fromisoformat(data.get("create_date")) if data.get("create_date") else datetime.today(),
+            last_review=datetime.fromisoformat(data.get("last_review")) if data.get("last_review") else None,
+            interval=data.get("interval", 0),
+            repetition=data.get("repetition", 0),
+            easiness=data.get("easiness", 2.5),
+            lapses=data.get("lapses", 0),
+            scheduled_date=datetime.fromisoformat(data.get("scheduled_date")) if data.get("scheduled_date") else datetime.max,
+            _history=None,
+            _raw_history=history,
+            usn=data.get("usn", -1),
+            mod=data.get("mod", 0),
+        )
         if data.get("status"):
-            c.status = CardStatus(data.get("status"))
+            c.__dict__["status"] = CardStatus(data.get("status"))
+        if raw is not None and "id" in data:
+            c.__dict__.update(_json=raw, _history_len=len(history))
         return c
 
     def to_dict(self) -> dict:
         return {
+            "id": self.id,
             "front": self.front,
             "back": self.back,
             "create_date": self.create_date.isoformat(),
@@ -69,6 +277,8 @@ class Card:
             "easiness": self.easiness,
             "lapses": self.lapses,
             "scheduled_date": self.scheduled_date.isoformat() if self.scheduled_date else datetime.max,
-            "history": [(dt.isoformat(), int(rating)) for dt, rating in self.history],
+            "history": self._encoded_history(),
             "status": self.status.value,
+            "usn": self.usn,
+            "mod": self.mod,
         }
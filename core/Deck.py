@@ -1,27 +1,81 @@
 import datetime
 import os
+import contextlib
 import json
 import heapq
 import pygame
-from typing import Optional, Union
+from typing import Iterable, Optional, Union
 
-from core.Card import Card
+from core.Card import Card, new_card_id
 from core.Enums import CardStatus
+from core.FileLock import FileLock, lock_path
+from core.Profiler import timed
 from core.Settings import font_path
+from core.Storage import DEFAULT_SHARD_SIZE, META_FILE, SHARD_SUFFIX, ShardedStorage, file_version, is_sharded
+from core.TrigramIndex import TrigramIndex
+
+# Deck files hold a header line ending in CARDS_MARKER, then one card object per line
+CARDS_MARKER = '"cards": ['
 
 
 class Deck:
     """
     Represents a flashcard deck. Handles card management,
     scheduling, JSON persistence, and rendering logic.
+
+    Changes are tracked so saving only does work when needed: cards report
+    themselves in dirty_cards when a persisted field changes, renames mark
+    the metadata dirty and adding or removing cards marks the card list
+    dirty. Saving a clean deck is a no-op, and unchanged cards are written
+    from the JSON cached at load or at the last save.
+
+    A deck path may also be a sharded deck directory (see core.Storage);
+    such decks load their shards in parallel and save only the shards
+    holding changed cards.
+
+    Several processes can share a deck (e.g. two app instances, or the app
+    and an importer). The deck file stores a version number that every
+    save increments. Saves, and loads of sharded decks (whose files a save
+    replaces one by one), hold an advisory lock on the deck (see
+    core.FileLock). Saves compare the version on disk, and the file's
+    modification time and size (see core.Storage.file_version), with the
+    ones seen at the last load or save. If someone else saved in between,
+    their changes are merged in by card id before writing: cards added,
+    removed or edited on only one side keep that side's change, and for
+    cards changed on both sides the later save wins.
     """
 
+    # Callables run with the deck after every successful save (e.g. search indexing)
+    save_listeners: list = []
+
+    # Callables run with the deck and the list of cards removed by one deletion (e.g. sync bookkeeping)
+    delete_listeners: list = []
+
+    # Register as an owner of the cards so their changes end up in dirty_cards
+    tracks_changes = True
+
+    # Single-file decks reaching this many cards are moved to a sharded directory on save
+    shard_threshold: Optional[int] = None
+
     def __init__(self, name: Optional[str] = None, path: Optional[str] = None) -> None:
+        self.dirty_cards: set[str] = set()  # Ids of cards changed since the last save
+        self._meta_dirty = False
+        self._cards_changed = False
         self.name: str = name
         self.date = datetime.datetime.today()
-        self.cards: list[tuple[datetime.datetime, int, Card]] = []
+        self.cards: list[tuple[datetime.datetime, str, Card]] = []
+        self.card_map: dict[str, Card] = {}  # Card id -> card
+        self._positions: dict[str, int] = {}  # Card id -> index of its entry in the heap
         self.file_path = path
+        self.storage: Optional[ShardedStorage] = None  # Set for sharded deck directories
+        self.version = 0  # Version number stored in the file at the last load or save
+        self.disk_version: Optional[tuple[int, int]] = None  # File version at the last load or save
+        self._added_ids: set[str] = set()  # Cards added since the last save
+        self._removed_ids: set[str] = set()  # Cards removed since the last save
+        self._untracked = False  # Cards were replaced or merged from disk without recording their ids
+        self.saved_ids: Optional[set[str]] = None  # Cards added, changed or removed by the last save; None if unknown
         self.last_practised: Optional[datetime.datetime] = None
+        self._search_index: Optional[TrigramIndex] = None
 
         self.rect: Optional[pygame.Rect] = None
         self.edit_rect: Optional[pygame.Rect] = None
@@ -36,21 +90,64 @@ class Deck:
     def __str__(self) -> str:
         return f"DECK {self.name}"
 
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        if "_name" not in self.__dict__ or self._name != value:
+            self._name = value
+            self._meta_dirty = True
+
+    @property
+    def dirty(self) -> bool:
+        """True if the deck has changes that are not saved yet."""
+        return self._meta_dirty or self._cards_changed or bool(self.dirty_cards)
+
+    def _mark_clean(self) -> None:
+        self.dirty_cards.clear()
+        self._added_ids.clear()
+        self._removed_ids.clear()
+        self._untracked = False
+        self._meta_dirty = False
+        self._cards_changed = False
+
+    @property
+    def search_index(self) -> TrigramIndex:
+        """Trigram index over the deck's card texts, built on first use."""
+        return self.build_search_index()
+
+    def build_search_index(self) -> TrigramIndex:
+        """
+        Build the trigram index if it doesn't exist yet. Call it on the main
+        thread before handing the index to a worker thread.
+        """
+        if self._search_index is None:
+            self._search_index = TrigramIndex(c for _, _, c in self.cards)
+        return self._search_index
+
     def load_deck(self) -> None:
         """Load deck data from JSON and initialize as a min-heap."""
 
         cards_list = []
-        if os.path.exists(self.file_path):
+        missing_ids = False
+        self.storage = None
+        self.disk_version = file_version(self.file_path)
+        if self.disk_version is not None:
+            # A save replaces a sharded deck's files one by one, so read them while nobody saves
+            lock = FileLock(self.lock_path) if os.path.isdir(self.file_path) else contextlib.nullcontext()
             try:
-                with open(self.file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.name = data.get("name", self.name)
-                    cards_list = [Card.from_dict(c) for c in data.get("cards", [])]
+                with lock:
+                    self.disk_version = file_version(self.file_path)
+                    meta, cards_list, missing_ids, self.storage = self._read_disk()
+                self.name = meta.get("name", self.name)
+                self.version = meta.get("version", 0)
             except (json.JSONDecodeError, IOError) as e:
+                # Without readable metadata, saving could drop the shards: keep the deck read-only
                 print(f"Error loading deck from {self.file_path}: {e}")
 
         now = datetime.datetime.today()
-        heap_items = []
         for card in cards_list:
             sd = card.scheduled_date
             if isinstance(sd, str):
@@ -60,11 +157,316 @@ class Deck:
                     sd = now
             if not isinstance(sd, datetime.datetime):
                 sd = now
-            card.scheduled_date = sd
-            heap_items.append((sd, id(card), card))
-
-        self.cards = heap_items
+            if sd is not card.scheduled_date:
+                # A repaired date is not a change to sync
+                card.__dict__.update(scheduled_date=sd, _json=None)
+
+        self._set_cards(cards_list)
+        self._search_index = None
+        self._mark_clean()
+
+        # Decks written before cards had ids: store the new ids right away
+        if missing_ids:
+            self._cards_changed = True
+            self._untracked = True
+            self.save_deck()
+
+    def _read_disk(self) -> tuple[dict, list[Card], bool, Optional[ShardedStorage]]:
+        """
+        Read the deck file or sharded deck directory.
+
+        Returns:
+            tuple[dict, list[Card], bool, ShardedStorage]: Deck metadata, cards, whether
+            any card lacked an id, and the storage of a sharded deck (else None).
+        """
+        if is_sharded(self.file_path):
+            storage = ShardedStorage(self.file_path)
+            meta, cards, missing_ids = storage.load()
+            return meta, cards, missing_ids, storage
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            meta, cards, missing_ids = self.decode(f.read())
+        return meta, cards, missing_ids, None
+
+    def reload(self) -> None:
+        """
+        Bring the deck up to date with changes saved by someone else. Cards
+        are updated in place; unsaved changes are kept and saved on top.
+        """
+        try:
+            with FileLock(self.lock_path):
+                self._merge_from_disk()
+        except Exception as e:
+            print(f"Error reloading deck from {self.file_path}: {e}")
+            return
+        if self.dirty:
+            self.save_deck()
+
+    def changed_on_disk(self) -> bool:
+        """True if the deck's file was written by someone else since the last load or save."""
+        current = file_version(self.file_path)
+        return current is not None and current != self.disk_version
+
+    @property
+    def lock_path(self) -> str:
+        return lock_path(self.file_path)
+
+    def _stored_version(self) -> Optional[int]:
+        """Version number of the deck on disk, read without its cards. None if there is no deck file."""
+        sharded = os.path.isdir(self.file_path)
+        path = os.path.join(self.file_path, META_FILE) if sharded else self.file_path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if sharded:
+                    return json.load(f).get("version", 0)
+                head = f.readline().rstrip("\n")
+                meta = self._decode_header(head)
+                if meta is None:
+                    meta = json.loads(head + f.read())
+        except FileNotFoundError:
+            return None
+        return meta.get("version", 0)
+
+    def _merge_from_disk(self) -> None:
+        """
+        Merge the deck saved by someone else into this one, by card id.
+        Their new cards are added, cards they removed are dropped and cards
+        they changed are updated, unless the same card was added, removed or
+        changed here since the last save. Must run while holding the deck lock.
+        """
+        if file_version(self.file_path) is None:
+            return
+        meta, theirs, _, storage = self._read_disk()
+
+        cards_changed = self._cards_changed
+        kept_local = self.dirty_cards | self._added_ids
+        their_ids = set()
+        for card in theirs:
+            their_ids.add(card.id)
+            mine = self.card_map.get(card.id)
+            if mine is None:
+                if card.id not in self._removed_ids:
+                    self._push(self._entry(card))
+                    if self._search_index is not None:
+                        self._search_index.add(card)
+            elif card.id not in kept_local and mine._held is None and mine.to_json() != card.to_json():
+                mine.adopt(card)
+                self.reschedule_card(mine)
+                if self._search_index is not None:
+                    self._search_index.update(mine)
+
+        gone = [i for i in self.card_map if i not in their_ids and i not in kept_local]
+        if storage is not None and storage.missing:
+            gone = []  # Some of their shards could not be read, so a card missing there may not be removed
+        for card_id in gone:
+            removed = self._remove_at(self._heap_index(card_id))
+            self._removed_ids.discard(card_id)
+            if self._search_index is not None:
+                self._search_index.remove(removed)
+
+        # Their additions and removals are on disk already
+        self._cards_changed = cards_changed
+        self._untracked = True
+        if not self._meta_dirty:
+            self.__dict__["_name"] = meta.get("name", self.name)
+        if storage is not None:
+            self.storage = storage
+        self.version = meta.get("version", 0)
+        self.disk_version = file_version(self.file_path)
+
+    @staticmethod
+    def _decode_header(head: str) -> Optional[dict]:
+        """Deck metadata from the header line of a deck file, or None if it has no such header."""
+        if not head.endswith(CARDS_MARKER):
+            return None
+        try:
+            return json.loads(head[:-len(CARDS_MARKER)].rstrip().rstrip(",") + "}")
+        except json.JSONDecodeError:
+            return None
+
+    @staticmethod
+    def decode(text: str) -> tuple[dict, list[Card], bool]:
+        """
+        Parse a deck file. Files in the one-card-per-line layout written by
+        save_deck keep every line as the card's cached JSON; anything else
+        (e.g. older indented files) is parsed as a whole.
+
+        Returns:
+            tuple[dict, list[Card], bool]: Deck metadata, cards, and whether any card lacked an id.
+        """
+        head, _, rest = text.partition("\n")
+        meta = Deck._decode_header(head)
+        if meta is not None:
+            try:
+                cards, missing_ids = [], False
+                for line in rest.split("\n"):
+                    line = line.strip().rstrip(",")
+                    if not line or line == "]}":
+                        continue
+                    data = json.loads(line)
+                    missing_ids = missing_ids or "id" not in data
+                    cards.append(Card.from_dict(data, line))
+                return meta, cards, missing_ids
+            except json.JSONDecodeError:
+                pass
+
+        data = json.loads(text)
+        raw_cards = data.pop("cards", [])
+        return data, [Card.from_dict(c) for c in raw_cards], any("id" not in c for c in raw_cards)
+
+    def encode(self) -> str:
+        """Serialize the deck, reusing the cached JSON of unchanged cards."""
+        header = json.dumps({"name": self.name, "version": self.version}, ensure_ascii=False)[:-1] + ", " + CARDS_MARKER
+        return header + "\n" + ",\n".join(c.persisted_json() for _, _, c in self.cards) + "\n]}\n"
+
+    # ─── Card lookup ────────────────────────────────────────────────────
+
+    def _entry(self, card: Card) -> tuple[datetime.datetime, str, Card]:
+        """Create the heap entry of a card and register the card."""
+        entry = (card.scheduled_date, card.id, card)
+        self.card_map[card.id] = card
+        if self.tracks_changes and self not in card._owners:
+            card._owners.append(self)
+        return entry
+
+    def _release(self, card: Card) -> None:
+        """Stop tracking a card that left the deck."""
+        del self.card_map[card.id]
+        del self._positions[card.id]
+        if self in card._owners:
+            card._owners.remove(self)
+        self.dirty_cards.discard(card.id)
+        if card.id in self._added_ids:
+            self._added_ids.discard(card.id)
+        else:
+            self._removed_ids.add(card.id)
+
+    def _claim_id(self, card: Card) -> bool:
+        """
+        Make sure a card joining the deck has an id not used here yet. A deck
+        that tracks its cards gives a duplicate a new id; a view over other
+        decks' cards (see tracks_changes) must not change them and skips it.
+
+        Returns:
+            bool: True if the card can be added.
+
+        Raises:
+            ValueError: If the id is taken and the card belongs to another deck.
+        """
+        if card.id not in self.card_map:
+            return True
+        if not self.tracks_changes:
+            return False
+        if any(owner is not self for owner in card._owners):
+            raise ValueError(f"Card {card.id} belongs to another deck and its id is taken here")
+        card.id = new_card_id()
+        return True
+
+    def _set_cards(self, cards: Iterable[Card]) -> None:
+        """Replace all cards with a single heapify. Duplicate ids are handled by _claim_id."""
+        for _, _, card in self.cards:
+            if self in card._owners:
+                card._owners.remove(self)
+        self.card_map.clear()
+        self._cards_changed = True
+        self._untracked = True
+        heap = []
+        for card in cards:
+            if self._claim_id(card):
+                heap.append(self._entry(card))
+        self.cards = heap
+        self._heapify()
+
+    def get_card(self, card_id: str) -> Optional[Card]:
+        """Return the card with the given id, or None."""
+        return self.card_map.get(card_id)
+
+    # ─── Heap ───────────────────────────────────────────────────────────
+    # self.cards is a binary min-heap of (scheduled_date, id, card) entries.
+    # The sifts keep _positions up to date, so a card's entry is found in
+    # O(1) and removing or moving it is O(log n).
+
+    def _heap_index(self, card_id: str) -> int:
+        return self._positions[card_id]
+
+    def _heapify(self) -> None:
+        """Restore the heap invariant over all entries and index their positions."""
         heapq.heapify(self.cards)
+        self._positions = {entry[1]: i for i, entry in enumerate(self.cards)}
+
+    def _push(self, entry: tuple[datetime.datetime, str, Card]) -> None:
+        self.cards.append(entry)
+        self._sift_up(len(self.cards) - 1)
+
+    def _sift_up(self, pos: int) -> None:
+        """Move the entry at pos towards the root until its parent is not larger."""
+        heap, positions = self.cards, self._positions
+        entry = heap[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            above = heap[parent]
+            if not entry < above:
+                break
+            heap[pos] = above
+            positions[above[1]] = pos
+            pos = parent
+        heap[pos] = entry
+        positions[entry[1]] = pos
+
+    def _sift_down(self, pos: int) -> None:
+        """Move the entry at pos towards the leaves until its children are not smaller."""
+        heap, positions = self.cards, self._positions
+        end = len(heap)
+        entry = heap[pos]
+        child = 2 * pos + 1
+        while child < end:
+            if child + 1 < end and heap[child + 1] < heap[child]:
+                child += 1
+            below = heap[child]
+            if not below < entry:
+                break
+            heap[pos] = below
+            positions[below[1]] = pos
+            pos = child
+            child = 2 * pos + 1
+        heap[pos] = entry
+        positions[entry[1]] = pos
+
+    def _remove_at(self, idx: int) -> Card:
+        """Remove the heap entry at idx and restore the heap invariant in O(log n)."""
+        entry = self.cards[idx]
+        removed = entry[2]
+        last = self.cards.pop()
+        if idx < len(self.cards):
+            self.cards[idx] = last
+            if last < entry:
+                self._sift_up(idx)
+            else:
+                self._sift_down(idx)
+        self._release(removed)
+        self._cards_changed = True
+        return removed
+
+    def renumber_card(self, card: Card) -> None:
+        """Give a card of this deck a new id, e.g. when another deck holds a card with the same id."""
+        self._remove_at(self._heap_index(card.id))
+        if self._search_index is not None:
+            self._search_index.remove(card)
+        card.id = new_card_id()
+        self._push(self._entry(card))
+        self._added_ids.add(card.id)
+        if self._search_index is not None:
+            self._search_index.add(card)
+
+    def reschedule_card(self, card: Card) -> None:
+        """Move a card to its place in the heap after its scheduled_date changed."""
+        idx = self._heap_index(card.id)
+        old = self.cards[idx]
+        entry = self._entry(card)
+        self.cards[idx] = entry
+        if entry < old:
+            self._sift_up(idx)
+        else:
+            self._sift_down(idx)
 
     def add_card(self, card: Card) -> Card:
         """Add a card to the heap and save."""
@@ -78,33 +480,104 @@ class Deck:
         if not isinstance(card.scheduled_date, datetime.datetime):
             card.scheduled_date = now
 
-        heapq.heappush(self.cards, (card.scheduled_date, id(card), card))
+        if not self._claim_id(card):
+            return card  # Already in this view
+        self._push(self._entry(card))
+        self._added_ids.add(card.id)
+        self._cards_changed = True
+        if self._search_index is not None:
+            self._search_index.add(card)
         self._save_cards_only()
         return card
 
-    def delete_card(self, card_or_index: Union[int, Card]) -> Card:
-        """Remove a card by index or instance and re-heapify."""
+    def add_cards(self, cards: Iterable[Card], save: bool = True, heapify: bool = True) -> int:
+        """
+        Add many cards with a single heapify and at most one save.
+
+        A caller adding several batches can pass heapify=False (and save=False)
+        for all but the last, or call _heapify() itself once they are all in;
+        until then the heap order and positions are not valid.
+        """
+
+        now = datetime.datetime.today()
+        added = 0
+        for card in cards:
+            if not isinstance(card.scheduled_date, datetime.datetime):
+                card.scheduled_date = now
+            if not self._claim_id(card):
+                continue
+            self.cards.append(self._entry(card))
+            self._added_ids.add(card.id)
+            if self._search_index is not None:
+                self._search_index.add(card)
+            added += 1
+
+        if added:
+            if heapify:
+                self._heapify()
+            self._cards_changed = True
+            if save:
+                self.save_deck()
+        return added
+
+    def delete_card(self, card_or_index: Union[int, str, Card]) -> Card:
+        """Remove a card by heap index, card id or instance."""
 
         if isinstance(card_or_index, int):
-            if 0 <= card_or_index < len(self.cards):
-                _, _, removed = self.cards.pop(card_or_index)
-            else:
+            if not 0 <= card_or_index < len(self.cards):
                 raise IndexError(f"No card at index {card_or_index}")
+            idx = card_or_index
         else:
-            idx = next((i for i, (_, _, c) in enumerate(self.cards) if c is card_or_index), None)
-            if idx is None:
+            card_id = card_or_index if isinstance(card_or_index, str) else card_or_index.id
+            if card_id not in self.card_map:
                 raise ValueError("Card not found in deck")
-            _, _, removed = self.cards.pop(idx)
+            idx = self._heap_index(card_id)
 
-        heapq.heapify(self.cards)
+        removed = self._remove_at(idx)
+        if self._search_index is not None:
+            self._search_index.remove(removed)
+        for listener in Deck.delete_listeners:
+            listener(self, [removed])
         self._save_cards_only()
         return removed
 
+    def delete_cards(self, cards: Iterable[Union[str, Card]], save: bool = True) -> list[Card]:
+        """Remove many cards (by id or instance) with at most one save. Cards not in the deck are skipped."""
+
+        removed = []
+        for card in cards:
+            card_id = card if isinstance(card, str) else card.id
+            if card_id not in self.card_map:
+                continue
+            card = self._remove_at(self._heap_index(card_id))
+            if self._search_index is not None:
+                self._search_index.remove(card)
+            removed.append(card)
+
+        if removed:
+            for listener in Deck.delete_listeners:
+                listener(self, removed)
+            if save:
+                self.save_deck()
+        return removed
+
+    def edit_card(self, card: Union[str, Card], front: str, back: str) -> Card:
+        """Change a card's text (card given by instance or id), re-index it and save."""
+
+        if isinstance(card, str):
+            card = self.card_map[card]
+        card.front = front
+        card.back = back
+        if self._search_index is not None:
+            self._search_index.update(card)
+        self._save_cards_only()
+        return card
+
     def reset_deck(self) -> None:
         """Reset all cards to initial learning state."""
 
         now = datetime.datetime.now()
-        new_heap = []
+        cards = []
 
         for _, _, card in self.cards:
             card.status = CardStatus.NEW
@@ -116,34 +589,83 @@ class Deck:
             card.last_review = None
             card.scheduled_date = now
             card.history = []
-            new_heap.append((card.scheduled_date, id(card), card))
+            cards.append(card)
 
-        self.cards = new_heap
-        heapq.heapify(self.cards)
+        self._set_cards(cards)
         self._save_cards_only()
 
-    def save_deck(self) -> None:
-        """Save full deck to JSON."""
+    @timed()
+    def save_deck(self, force: bool = False) -> None:
+        """
+        Save the deck to JSON if anything changed since the last load or save.
+        Changes saved by someone else in the meantime are merged in first.
+
+        Args:
+            force (bool): Write the file even if the deck is clean.
+        """
+        if not (force or self.dirty):
+            return
+        if self.storage is None and self.shard_threshold and len(self.cards) >= self.shard_threshold:
+            self.use_shards()
+            return
 
-        data = {
-            "name": self.name,
-            "cards": [c.to_dict() for _, _, c in self.cards]
-        }
         try:
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with FileLock(self.lock_path):
+                stored = self._stored_version()
+                if stored is not None and (stored != self.version or self.changed_on_disk()):
+                    self._merge_from_disk()
+                self.version = max(stored or 0, self.version) + 1
+                if self.storage is not None:
+                    self.storage.save(self.name, self.card_map, self.dirty_cards, self._cards_changed,
+                                      rewrite=force, version=self.version)
+                else:
+                    # Write a temporary file and swap it in, so readers never see a partial deck
+                    tmp = self.file_path + ".tmp"
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        f.write(self.encode())
+                    os.replace(tmp, self.file_path)
         except Exception as e:
             print(f"Error saving deck to {self.file_path}: {e}")
+            return
+        self.disk_version = file_version(self.file_path)
+        self.saved_ids = None if self._untracked else self.dirty_cards | self._added_ids | self._removed_ids
+        self._mark_clean()
+        self._notify_saved()
+
+    def use_shards(self, shard_size: int = DEFAULT_SHARD_SIZE) -> None:
+        """
+        Move a single-file deck into a sharded directory next to its file
+        (Decks/Name.json becomes Decks/Name.shards/).
+
+        Args:
+            shard_size (int): Maximum number of cards per shard.
+        """
+        if self.storage is not None:
+            return
+
+        folder = os.path.splitext(self.file_path)[0] + SHARD_SUFFIX
+        storage = ShardedStorage(folder, shard_size)
+        try:
+            storage.save(self.name, self.card_map, (), rewrite=True, version=self.version + 1)
+            if os.path.isfile(self.file_path):
+                os.remove(self.file_path)
+        except Exception as e:
+            print(f"Error converting deck {self.file_path} to shards: {e}")
+            return
+        self.storage, self.file_path = storage, folder
+        self.version += 1
+        self.disk_version = file_version(folder)
+        self.saved_ids = None
+        self._mark_clean()
+        self._notify_saved()
 
     def _save_cards_only(self) -> None:
-        """Helper to save only cards (no name/metadata)."""
+        """Save after a card change (the deck file always holds name and cards)."""
+        self.save_deck()
 
-        data = {"cards": [c.to_dict() for _, _, c in self.cards]}
-        try:
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Error saving deck after change: {e}")
+    def _notify_saved(self) -> None:
+        for listener in Deck.save_listeners:
+            listener(self)
 
     def draw(self, surface: pygame.Surface, x: int, y: int, width: int = 216, height: int = 138) -> None:
         if self.side:
@@ -0,0 +1,243 @@
+import os
+import csv
+import json
+import hashlib
+import zipfile
+import datetime
+from typing import Iterable, Iterator, Optional
+
+from core.Card import Card
+from core.Deck import Deck
+from core.Storage import is_sharded
+
+BACKUP_FOLDER = os.path.join(os.getcwd(), "resources", "Backups")
+BUFFER_SIZE = 1 << 20
+
+
+def iter_cards(deck: Deck) -> Iterator[Card]:
+    """Yield a deck's cards straight from its heap, without copying it."""
+    for _, _, card in deck.cards:
+        yield card
+
+
+def iter_decks(folder: str) -> Iterator[Deck]:
+    """Load the decks of a folder one at a time."""
+    for filename in sorted(os.listdir(folder)):
+        path = os.path.join(folder, filename)
+        if filename.endswith(".json") or is_sharded(path):
+            yield Deck(os.path.splitext(filename)[0], path)
+
+
+def archive_name(deck: Deck) -> str:
+    """File name of a deck inside archives; sharded decks are archived (and restored) as one file."""
+    return os.path.splitext(os.path.basename(deck.file_path))[0] + ".json"
+
+
+def encode_deck(deck: Deck) -> Iterator[str]:
+    """
+    Stream a deck in the same JSON layout as Deck.save_deck, one card at a time,
+    instead of building the whole {"cards": [...]} structure first.
+    """
+    yield json.dumps({"name": deck.name, "version": deck.version}, ensure_ascii=False)[:-1] + ', "cards": ['
+    first = True
+    for card in iter_cards(deck):
+        yield ("\n" if first else ",\n") + card.persisted_json()
+        first = False
+    yield "\n]}\n"
+
+
+def deck_hash(deck: Deck) -> str:
+    """
+    Content hash of a deck's name and serialized cards. Cards with equal
+    scheduled dates have no fixed heap order, so per-card digests are
+    combined order-independently.
+    """
+    total = 0
+    count = 0
+    for card in iter_cards(deck):
+        data = card.persisted_json().encode("utf-8")
+        total += int.from_bytes(hashlib.sha256(data).digest(), "big")
+        count += 1
+    h = hashlib.sha256(json.dumps(deck.name, ensure_ascii=False).encode("utf-8"))
+    h.update(f":{count}:{total % (1 << 256):x}".encode())
+    return h.hexdigest()
+
+
+def export_csv(decks: Iterable[Deck], path: str, delimiter: str = ",") -> int:
+    """
+    Write front, back, deck and scheduling columns for every card.
+    The first two columns can be imported back with core.Importer.
+
+    Returns:
+        int: Number of cards written.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(["front", "back", "deck", "status", "scheduled_date", "interval", "easiness"])
+        for deck in decks:
+            for card in iter_cards(deck):
+                writer.writerow([
+                    card.front, card.back, deck.name, card.status.value,
+                    card.scheduled_date.isoformat() if card.scheduled_date else "",
+                    card.interval, card.easiness,
+                ])
+                count += 1
+    return count
+
+
+def export_jsonl(decks: Iterable[Deck], path: str) -> int:
+    """
+    Write one JSON object per card (Card.to_dict plus the deck name).
+
+    Returns:
+        int: Number of cards written.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+        for deck in decks:
+            for card in iter_cards(deck):
+                data = card.to_dict()
+                data["deck"] = deck.name
+                f.write(json.dumps(data, ensure_ascii=False, default=str))
+                f.write("\n")
+                count += 1
+    return count
+
+
+def export_decks(decks: Iterable[Deck], path: str) -> int:
+    """
+    Export decks to CSV, TSV, JSON Lines or a compressed archive, chosen by file extension.
+
+    Returns:
+        int: Number of cards (or decks, for archives) written.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return export_csv(decks, path)
+    if ext in (".tsv", ".txt"):
+        return export_csv(decks, path, delimiter="\t")
+    if ext == ".jsonl":
+        return export_jsonl(decks, path)
+    if ext == ".zip":
+        return len(write_archive(decks, path))
+    raise ValueError(f"Unsupported export format: {ext}")
+
+
+def write_deck_entry(z: zipfile.ZipFile, deck: Deck) -> None:
+    """Stream one deck's JSON into an open archive."""
+    with z.open(archive_name(deck), "w") as out:
+        for chunk in encode_deck(deck):
+            out.write(chunk.encode("utf-8"))
+
+
+def write_archive(decks: Iterable[Deck], path: str) -> dict[str, str]:
+    """
+    Write decks into a compressed zip archive with a manifest of their content hashes.
+
+    Returns:
+        dict[str, str]: Content hash of every archived deck, keyed by deck file name.
+    """
+    written: dict[str, str] = {}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for deck in decks:
+            write_deck_entry(z, deck)
+            written[archive_name(deck)] = deck_hash(deck)
+        z.writestr("manifest.json", json.dumps(written, indent=2))
+    return written
+
+
+class BackupManager:
+    """
+    Creates collection backups in resources/Backups.
+
+    A full backup archives every deck. An incremental backup archives only
+    decks whose content hash changed since the last backup; the backup
+    manifest records which archive holds the latest copy of every deck.
+    """
+
+    def __init__(self, folder: str = BACKUP_FOLDER) -> None:
+        self.folder = folder
+        self.manifest_path = os.path.join(folder, "manifest.json")
+        os.makedirs(folder, exist_ok=True)
+        self.manifest: dict[str, dict[str, str]] = {}
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self.manifest = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Error loading backup manifest: {e}")
+
+    def backup(self, decks: Iterable[Deck], incremental: bool = True, complete: bool = True) -> Optional[str]:
+        """
+        Archive the given decks.
+
+        Args:
+            decks (Iterable[Deck]): Decks to back up.
+            incremental (bool): Skip decks that did not change since their last backup.
+            complete (bool): decks is the whole collection, so decks missing from it
+                were deleted and are dropped from the manifest. Pass False when
+                backing up a selection of decks.
+
+        Returns:
+            str or None: Path of the new archive, or None if nothing changed.
+        """
+        name = "backup-" + datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f") + ".zip"
+        path = os.path.join(self.folder, name)
+        archive: Optional[zipfile.ZipFile] = None
+        written: dict[str, str] = {}
+        present = set()
+
+        try:
+            for deck in decks:
+                key = archive_name(deck)
+                present.add(key)
+                digest = deck_hash(deck)
+                if incremental and self.manifest.get(key, {}).get("hash") == digest:
+                    continue
+                if archive is None:
+                    archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+                write_deck_entry(archive, deck)
+                written[key] = digest
+        finally:
+            if archive is not None:
+                archive.writestr("manifest.json", json.dumps(written, indent=2))
+                archive.close()
+
+        removed = [key for key in self.manifest if key not in present] if complete else []
+        for key, digest in written.items():
+            self.manifest[key] = {"hash": digest, "archive": name}
+        for key in removed:
+            del self.manifest[key]
+        if written or removed:
+            self._save_manifest()
+        return path if archive is not None else None
+
+    def restore(self, target_folder: str) -> list[str]:
+        """
+        Restore the latest backed-up copy of every deck into a folder.
+
+        Returns:
+            list[str]: Restored deck file names.
+        """
+        os.makedirs(target_folder, exist_ok=True)
+        by_archive: dict[str, list[str]] = {}
+        for key, entry in self.manifest.items():
+            by_archive.setdefault(entry["archive"], []).append(key)
+
+        restored = []
+        for archive, keys in by_archive.items():
+            with zipfile.ZipFile(os.path.join(self.folder, archive)) as z:
+                for key in keys:
+                    with z.open(key) as src, open(os.path.join(target_folder, key), "wb") as dst:
+                        while chunk := src.read(BUFFER_SIZE):
+                            dst.write(chunk)
+                    restored.append(key)
+        return restored
+
+    def _save_manifest(self) -> None:
+        try:
+            with open(self.manifest_path, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        except IOError as e:
+            print(f"Error saving backup manifest: {e}")
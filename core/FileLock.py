@@ -0,0 +1,87 @@
+import os
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+class FileLock:
+    """
+    Advisory exclusive lock on a file, held for the duration of a with block.
+
+    Uses fcntl.flock where available (Linux, macOS) and msvcrt.locking on
+    Windows; on other platforms the lock does nothing. The lock is advisory:
+    it only keeps out processes that take the same lock, such as other
+    instances of the app or scripts saving through core.Deck. The lock is
+    not re-entrant, so it must not be taken again while it is held.
+    """
+
+    # Seconds to wait for another process to release the lock
+    timeout = 10.0
+    poll_interval = 0.02
+
+    def __init__(self, path: str, timeout: Optional[float] = None) -> None:
+        self.path = path
+        if timeout is not None:
+            self.timeout = timeout
+        self._file = None
+
+    def acquire(self) -> None:
+        """
+        Raises:
+            TimeoutError: If the lock is still held by someone else after the timeout.
+        """
+        self._file = open(self.path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._lock()
+                return
+            except OSError:
+                if time.monotonic() >= deadline:
+                    self._file.close()
+                    self._file = None
+                    raise TimeoutError(f"Timed out waiting for lock {self.path}")
+                time.sleep(self.poll_interval)
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self._unlock()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def _lock(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+def lock_path(path: str) -> str:
+    """Lock file of a deck file or sharded deck directory (next to it)."""
+    return os.path.normpath(path) + ".lock"
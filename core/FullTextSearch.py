@@ -0,0 +1,562 @@
+import os
+import re
+import json
+import math
+import bisect
+import hashlib
+import threading
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from core.Deck import Deck
+
+DECK_FOLDER = os.path.join(os.getcwd(), "resources", "Decks")
+INDEX_FOLDER = os.path.join(os.getcwd(), "resources", "Index")
+TOKEN_RE = re.compile(r"\w+")
+HASH_MOD = 1 << 128
+
+
+class SearchHit(NamedTuple):
+    score: float
+    deck_key: str
+    deck_name: str
+    doc: int
+    front: str
+    back: str
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def card_digest(card_id: str, front: str, back: str) -> int:
+    """Hash of one card's indexed text. A deck's text hash is the sum of its cards' digests."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (card_id, front, back):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1f")
+    return int.from_bytes(h.digest(), "big")
+
+
+def term_trigrams(term: str) -> set[str]:
+    """Trigrams of a word padded with one "$" on each side, for fuzzy candidate lookup."""
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance between a and b, giving up early once it exceeds limit.
+    Returns limit + 1 when the distance is larger than limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        best = i
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            best = min(best, cur[j])
+        if best > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+class DeckIndex:
+    """
+    Inverted index of a single deck: card ids, document texts, lengths and
+    term -> [[doc, term frequency], ...] postings sorted by doc. Stored as one
+    JSON file per deck.
+
+    Cards changed after the file was written are re-indexed in place and
+    appended to a journal next to it, which load() replays. A changed card
+    is indexed as a new doc and its old doc is left empty, until the journal
+    grows as large as the deck and the index is compacted and rewritten.
+    """
+
+    min_journal = 100  # Journal entries always allowed before compacting
+
+    def __init__(self, key: str, name: str) -> None:
+        self.key = key
+        self.name = name
+        self.hash_value = 0
+        self.ids: list[Optional[str]] = []
+        self.docs: list[Optional[tuple[str, str]]] = []
+        self.lengths: list[int] = []
+        self.postings: dict[str, list[list[int]]] = {}
+        self.doc_of: dict[str, int] = {}  # Card id -> doc
+        self.journal_size = 0
+
+    @property
+    def text_hash(self) -> str:
+        return f"{self.hash_value:032x}"
+
+    @property
+    def live(self) -> int:
+        """Number of indexed cards (docs that are not empty)."""
+        return len(self.doc_of)
+
+    @classmethod
+    def build(cls, key: str, deck: Deck) -> 'DeckIndex':
+        index = cls(key, deck.name)
+        for _, _, card in deck.cards:
+            index._add(card.id, card.front, card.back)
+        return index
+
+    def _add(self, card_id: str, front: str, back: str) -> set[str]:
+        doc = len(self.docs)
+        self.ids.append(card_id)
+        self.docs.append((front, back))
+        self.doc_of[card_id] = doc
+        tokens = tokenize(front) + tokenize(back)
+        self.lengths.append(len(tokens))
+
+        counts: dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            self.postings.setdefault(token, []).append([doc, tf])
+        self.hash_value = (self.hash_value + card_digest(card_id, front, back)) % HASH_MOD
+        return set(counts)
+
+    def _remove(self, card_id: str) -> set[str]:
+        doc = self.doc_of.pop(card_id)
+        front, back = self.docs[doc]
+        terms = set(tokenize(front)) | set(tokenize(back))
+        for term in terms:
+            posting = self.postings[term]
+            del posting[bisect.bisect_left(posting, doc, key=lambda p: p[0])]
+            if not posting:
+                del self.postings[term]
+        self.ids[doc] = None
+        self.docs[doc] = None
+        self.lengths[doc] = 0
+        self.hash_value = (self.hash_value - card_digest(card_id, front, back)) % HASH_MOD
+        return terms
+
+    def set_card(self, card_id: str, text: Optional[tuple[str, str]]) -> Optional[tuple[set[str], set[str]]]:
+        """
+        Index a card's current (front, back) text, or drop the card if text is None.
+
+        Returns:
+            tuple[set[str], set[str]]: Terms of the old and of the new text,
+            or None if the index already had this text.
+        """
+        doc = self.doc_of.get(card_id)
+        if (self.docs[doc] if doc is not None else None) == text:
+            return None
+        old = self._remove(card_id) if doc is not None else set()
+        new = self._add(card_id, *text) if text is not None else set()
+        return old, new
+
+    def compacted(self) -> 'DeckIndex':
+        """A copy of the index without empty docs."""
+        index = DeckIndex(self.key, self.name)
+        for card_id, doc in sorted(self.doc_of.items(), key=lambda item: item[1]):
+            index._add(card_id, *self.docs[doc])
+        return index
+
+    @classmethod
+    def load(cls, path: str) -> 'DeckIndex':
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(data["key"], data["name"])
+        index.hash_value = int(data["text_hash"], 16)
+        index.ids = data["ids"]
+        index.docs = [tuple(d) for d in data["docs"]]
+        index.lengths = data["lengths"]
+        index.postings = data["postings"]
+        index.doc_of = {card_id: doc for doc, card_id in enumerate(index.ids)}
+
+        try:
+            with open(path + ".journal", "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Torn last line of an interrupted append
+                    index.set_card(entry[0], tuple(entry[1:]) or None)
+                    index.journal_size += 1
+        except FileNotFoundError:
+            pass
+        return index
+
+    def save(self, path: str) -> None:
+        """Write the whole index (which must be compact) and drop its journal."""
+        data = {
+            "key": self.key,
+            "name": self.name,
+            "text_hash": self.text_hash,
+            "ids": self.ids,
+            "docs": self.docs,
+            "lengths": self.lengths,
+            "postings": self.postings,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        if os.path.exists(path + ".journal"):
+            os.remove(path + ".journal")
+        self.journal_size = 0
+
+    def append(self, path: str, changes: list[list[str]]) -> None:
+        """Append [card id, front, back] or, for removed cards, [card id] entries to the journal."""
+        with open(path + ".journal", "a", encoding="utf-8") as f:
+            for entry in changes:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.journal_size += len(changes)
+
+
+class CollectionIndex:
+    """
+    Full-text search over every card of every deck.
+
+    The index is persisted per deck in resources/Index and only decks whose
+    card texts changed are re-indexed; after a save only the cards the save
+    recorded as added, changed or removed are. Queries are ranked with BM25; the last
+    query word also matches as a prefix and longer words tolerate typos;
+    typo candidates are narrowed down with a trigram index over the
+    vocabulary before edit distances are computed.
+    Results are produced deck by deck so callers can show them as they arrive.
+    Queries may run on a background thread while decks are re-indexed.
+    """
+
+    k1 = 1.2
+    b = 0.75
+    prefix_weight = 0.8
+    fuzzy_weight = 0.5
+
+    def __init__(self, folder: str = INDEX_FOLDER, deck_folder: Optional[str] = None) -> None:
+        self.folder = folder
+        self.deck_folder = os.path.abspath(deck_folder) if deck_folder else None
+        self.manifest_path = os.path.join(folder, "manifest.json")
+        self.manifest: dict[str, str] = {}
+        self.names: dict[str, str] = {}
+        self.decks: dict[str, DeckIndex] = {}
+
+        self._vocabulary: Optional[dict[str, int]] = None
+        self._sorted_terms: Optional[list[str]] = None
+        self._term_grams: Optional[dict[str, list[str]]] = None  # Trigram -> vocabulary terms holding it
+        self._lock = threading.RLock()
+
+        os.makedirs(folder, exist_ok=True)
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self.manifest = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Error loading search manifest: {e}")
+
+    # ─── Maintenance ────────────────────────────────────────────────────
+
+    @staticmethod
+    def deck_key(deck: Deck) -> str:
+        return os.path.basename(deck.file_path)
+
+    @staticmethod
+    def text_hash(deck: Deck) -> str:
+        total = sum(card_digest(card.id, card.front, card.back) for _, _, card in deck.cards)
+        return f"{total % HASH_MOD:032x}"
+
+    def _index_path(self, key: str) -> str:
+        return os.path.join(self.folder, key + ".idx")
+
+    def sync(self, decks: list[Deck]) -> None:
+        """
+        Bring the index up to date with the given decks: re-index decks whose
+        card texts changed and drop decks that no longer exist.
+        """
+        present = set()
+        changed = False
+        for deck in decks:
+            key = self.deck_key(deck)
+            present.add(key)
+            self.names[key] = deck.name
+            if self._update_deck(key, deck):
+                changed = True
+
+        for key in list(self.manifest):
+            if key not in present:
+                self._drop(key)
+                changed = True
+
+        if changed:
+            self._save_manifest()
+
+    def update_deck(self, deck: Deck) -> None:
+        """Re-index a single deck if its texts changed (called after saves)."""
+        key = self.deck_key(deck)
+        self.names[key] = deck.name
+        if self._update_deck(key, deck):
+            self._save_manifest()
+
+    def update_cards(self, deck: Deck, card_ids: Iterable[str]) -> None:
+        """Re-index the given cards of a deck whose index was up to date before they changed."""
+        key = self.deck_key(deck)
+        self.names[key] = deck.name
+        index = self._loaded(key)
+        if index is None:
+            self.update_deck(deck)
+            return
+
+        changes = []
+        with self._lock:
+            for card_id in card_ids:
+                card = deck.card_map.get(card_id)
+                text = None if card is None else (card.front, card.back)
+                terms = index.set_card(card_id, text)
+                if terms is not None:
+                    changes.append([card_id, *text] if text is not None else [card_id])
+                    self._count_terms(terms[0] - terms[1], -1)
+                    self._count_terms(terms[1] - terms[0], 1)
+        if not changes:
+            return
+
+        path = self._index_path(key)
+        try:
+            if index.journal_size + len(changes) > max(DeckIndex.min_journal, index.live):
+                compacted = index.compacted()
+                compacted.save(path)
+                with self._lock:
+                    self.decks[key] = compacted
+            else:
+                index.append(path, changes)
+        except IOError as e:
+            print(f"Error saving search index for {key}: {e}")
+            return
+        self.manifest[key] = index.text_hash
+        self._save_manifest()
+
+    def on_deck_saved(self, deck: Deck) -> None:
+        """
+        Save listener: re-index the cards the save changed in decks that belong
+        to this collection, or the whole deck if the save doesn't know them.
+        """
+        if self.deck_folder is None or os.path.dirname(os.path.abspath(deck.file_path)) == self.deck_folder:
+            if deck.saved_ids is None:
+                self.update_deck(deck)
+            elif deck.saved_ids:
+                self.update_cards(deck, deck.saved_ids)
+
+    def remove_deck(self, deck_or_key) -> None:
+        key = deck_or_key if isinstance(deck_or_key, str) else self.deck_key(deck_or_key)
+        if key in self.manifest or key in self.decks:
+            self._drop(key)
+            self._save_manifest()
+
+    def _update_deck(self, key: str, deck: Deck) -> bool:
+        text_hash = self.text_hash(deck)
+        if self.manifest.get(key) == text_hash and os.path.exists(self._index_path(key)):
+            loaded = self.decks.get(key)
+            if loaded is not None:
+                loaded.name = deck.name
+            return False
+
+        index = DeckIndex.build(key, deck)
+        try:
+            index.save(self._index_path(key))
+        except IOError as e:
+            print(f"Error saving search index for {key}: {e}")
+            return False
+        with self._lock:
+            self.decks[key] = index
+            self.manifest[key] = text_hash
+            self._invalidate_vocabulary()
+        return True
+
+    def _drop(self, key: str) -> None:
+        with self._lock:
+            self.manifest.pop(key, None)
+            self.decks.pop(key, None)
+            self.names.pop(key, None)
+            self._invalidate_vocabulary()
+        path = self._index_path(key)
+        for stale in (path, path + ".journal"):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+    def _save_manifest(self) -> None:
+        try:
+            with open(self.manifest_path, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        except IOError as e:
+            print(f"Error saving search manifest: {e}")
+
+    def _load_all(self) -> None:
+        for key in list(self.manifest):
+            self._loaded(key)
+
+    def _loaded(self, key: str) -> Optional[DeckIndex]:
+        """The index of a deck in the manifest, loaded from disk if needed. None if it can't be loaded."""
+        with self._lock:
+            if key not in self.decks and key in self.manifest:
+                try:
+                    self.decks[key] = DeckIndex.load(self._index_path(key))
+                except (json.JSONDecodeError, IOError, KeyError) as e:
+                    print(f"Error loading search index for {key}: {e}")
+            return self.decks.get(key)
+
+    def _invalidate_vocabulary(self) -> None:
+        self._vocabulary = None
+        self._sorted_terms = None
+        self._term_grams = None
+
+    def _count_terms(self, terms: set[str], delta: int) -> None:
+        """Add delta to the document counts of terms in a built vocabulary, adding or dropping terms."""
+        vocabulary = self._vocabulary
+        if vocabulary is None:
+            return
+        for term in terms:
+            count = vocabulary.get(term, 0) + delta
+            if count > 0:
+                if term not in vocabulary:
+                    bisect.insort(self._sorted_terms, term)
+                    for gram in term_trigrams(term):
+                        self._term_grams.setdefault(gram, []).append(term)
+                vocabulary[term] = count
+            elif term in vocabulary:
+                del vocabulary[term]
+                del self._sorted_terms[bisect.bisect_left(self._sorted_terms, term)]
+                for gram in term_trigrams(term):
+                    holders = self._term_grams[gram]
+                    holders.remove(term)
+                    if not holders:
+                        del self._term_grams[gram]
+
+    def _snapshot(self) -> tuple[dict[str, int], list[str], dict[str, list[str]], dict[str, DeckIndex]]:
+        """
+        Return the (vocabulary, sorted terms, term trigrams, deck indexes)
+        view, building the vocabulary if needed. Saves update the vocabulary
+        and deck indexes in place, so use them while holding the lock.
+        """
+        with self._lock:
+            if self._vocabulary is None:
+                self._load_all()
+                vocabulary: dict[str, int] = {}
+                for index in self.decks.values():
+                    for term, posting in index.postings.items():
+                        vocabulary[term] = vocabulary.get(term, 0) + len(posting)
+                term_grams: dict[str, list[str]] = {}
+                for term in vocabulary:
+                    for gram in term_trigrams(term):
+                        term_grams.setdefault(gram, []).append(term)
+                self._vocabulary = vocabulary
+                self._sorted_terms = sorted(vocabulary)
+                self._term_grams = term_grams
+            return self._vocabulary, self._sorted_terms, self._term_grams, dict(self.decks)
+
+    # ─── Querying ───────────────────────────────────────────────────────
+
+    def expand(self, query: str) -> dict[str, float]:
+        """
+        Map the query to weighted index terms: exact words, prefix
+        completions of the last word and close misspellings.
+        """
+        with self._lock:
+            vocabulary, sorted_terms, term_grams, _ = self._snapshot()
+            return self._expand(query, vocabulary, sorted_terms, term_grams)
+
+    def _expand(self, query: str, vocabulary: dict[str, int], sorted_terms: list[str],
+                term_grams: dict[str, list[str]]) -> dict[str, float]:
+        tokens = tokenize(query)
+        terms: dict[str, float] = {}
+
+        for i, token in enumerate(tokens):
+            if token in vocabulary:
+                terms[token] = max(terms.get(token, 0.0), 1.0)
+
+            if i == len(tokens) - 1:
+                start = bisect.bisect_left(sorted_terms, token)
+                for term in sorted_terms[start:]:
+                    if not term.startswith(token):
+                        break
+                    if term != token:
+                        terms[term] = max(terms.get(term, 0.0), self.prefix_weight)
+
+            limit = 0 if len(token) < 4 else 1 if len(token) < 8 else 2
+            if limit:
+                for term in self._fuzzy_candidates(token, limit, vocabulary, term_grams):
+                    if term != token and edit_distance(token, term, limit) <= limit:
+                        terms[term] = max(terms.get(term, 0.0), self.fuzzy_weight)
+
+        return terms
+
+    @staticmethod
+    def _fuzzy_candidates(token: str, limit: int, vocabulary: dict[str, int],
+                          term_grams: dict[str, list[str]]) -> Iterable[str]:
+        """
+        Vocabulary terms that may be within limit edits of token. An edit
+        changes at most three of a word's trigrams, so a match shares all
+        but 3 * limit of the token's trigrams.
+        """
+        grams = term_trigrams(token)
+        needed = len(grams) - 3 * limit
+        if needed <= 0:
+            return vocabulary
+        shared: dict[str, int] = {}
+        for gram in grams:
+            for term in term_grams.get(gram, ()):
+                shared[term] = shared.get(term, 0) + 1
+        return [term for term, count in shared.items() if count >= needed]
+
+    def search_iter(self, query: str) -> Iterator[list[SearchHit]]:
+        """
+        Yield ranked hits one deck at a time. Scores are comparable across
+        batches, so callers can merge them into a single ranking as they arrive.
+        """
+        with self._lock:
+            vocabulary, sorted_terms, term_grams, decks = self._snapshot()
+            terms = self._expand(query, vocabulary, sorted_terms, term_grams)
+            if not terms:
+                return
+
+            total_docs = sum(i.live for i in decks.values())
+            if not total_docs:
+                return
+            avg_len = sum(sum(i.lengths) for i in decks.values()) / total_docs or 1.0
+            idf = {
+                t: math.log(1 + (total_docs - vocabulary[t] + 0.5) / (vocabulary[t] + 0.5))
+                for t in terms
+            }
+
+        for key, index in decks.items():
+            with self._lock:
+                scores: dict[int, float] = {}
+                for term, weight in terms.items():
+                    for doc, tf in index.postings.get(term, ()):
+                        norm = tf + self.k1 * (1 - self.b + self.b * index.lengths[doc] / avg_len)
+                        scores[doc] = scores.get(doc, 0.0) + weight * idf[term] * tf * (self.k1 + 1) / norm
+                if not scores:
+                    continue
+
+                name = self.names.get(key, index.name)
+                batch = [
+                    SearchHit(score, key, name, doc, *index.docs[doc])
+                    for doc, score in scores.items()
+                ]
+            batch.sort(key=lambda h: -h.score)
+            yield batch
+
+    def search(self, query: str, limit: int = 50) -> list[SearchHit]:
+        """Return the best `limit` hits across the whole collection."""
+        hits = [hit for batch in self.search_iter(query) for hit in batch]
+        hits.sort(key=lambda h: -h.score)
+        return hits[:limit]
+
+
+_shared: dict[str, CollectionIndex] = {}
+
+
+def get_collection_index(deck_folder: str = DECK_FOLDER) -> CollectionIndex:
+    """
+    Return the shared index of a deck folder, creating it on first use and
+    hooking it into deck saves. The index lives in an "Index" folder next to the decks.
+    """
+    key = os.path.abspath(deck_folder)
+    index = _shared.get(key)
+    if index is None:
+        index = CollectionIndex(os.path.join(os.path.dirname(key), "Index"), key)
+        Deck.save_listeners.append(index.on_deck_saved)
+        _shared[key] = index
+    return index
@@ -0,0 +1,138 @@
+import os
+import csv
+import sys
+import hashlib
+from typing import Callable, Iterator, Optional
+
+from core.Card import Card
+from core.Deck import Deck
+
+# Called with (fraction done, rows read, new cards)
+ProgressCallback = Callable[[float, int, int], None]
+
+
+def card_key(front: str, back: str) -> bytes:
+    """Compact hash of a card's text used for de-duplication."""
+    return hashlib.blake2b(f"{front}\x1f{back}".encode("utf-8"), digest_size=12).digest()
+
+
+def print_progress(fraction: float, rows: int, added: int) -> None:
+    """Default progress indicator: a single updating line on stdout."""
+    width = 30
+    filled = int(width * fraction)
+    sys.stdout.write(f"\r[{'#' * filled}{'.' * (width - filled)}] {fraction:6.1%}  {rows} rows, {added} new")
+    if fraction >= 1:
+        sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+class BulkImporter:
+    """
+    Streams cards from CSV/TSV files or tab-separated text dumps into a deck.
+
+    Rows are parsed in chunks, de-duplicated against the deck and the file
+    itself by a (front, back) hash, and added to the deck one chunk at a time
+    (so only one chunk of rows is held in memory); the deck is saved once at
+    the end.
+    """
+
+    def __init__(self, deck: Deck, chunk_size: int = 5000,
+                 progress: Optional[ProgressCallback] = print_progress) -> None:
+        self.deck = deck
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.seen = {card_key(c.front, c.back) for _, _, c in deck.cards}
+
+        self.rows = 0
+        self.skipped = 0
+
+    @staticmethod
+    def detect_delimiter(path: str, sample: str) -> str:
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".csv":
+            return ","
+        if ext in (".tsv", ".tab"):
+            return "\t"
+        if "\t" in sample:
+            return "\t"
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+        except csv.Error:
+            return "\t"
+
+    @staticmethod
+    def _lines(f, counter: list[int]) -> Iterator[str]:
+        quoted = False  # Inside a quoted field that spans lines
+        for line in f:
+            counter[0] += len(line)
+            # Header lines of Anki-style text exports ("#separator:tab")
+            if line.startswith("#") and not quoted:
+                continue
+            # An escaped quote ("") counts twice, so only field quotes change the parity
+            if line.count('"') % 2:
+                quoted = not quoted
+            yield line
+
+    def chunks(self, path: str) -> Iterator[list[Card]]:
+        """
+        Yield lists of new (not yet seen) cards, reading at most chunk_size rows at a time.
+        """
+        total = max(os.path.getsize(path), 1)
+        read = [0]
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            delimiter = self.detect_delimiter(path, f.read(64 * 1024))
+            f.seek(0)
+
+            chunk: list[Card] = []
+            for row in csv.reader(self._lines(f, read), delimiter=delimiter):
+                self.rows += 1
+                if len(row) < 2 or not row[0].strip():
+                    self.skipped += 1
+                    continue
+
+                front, back = row[0].strip(), row[1].strip()
+                key = card_key(front, back)
+                if key in self.seen:
+                    self.skipped += 1
+                    continue
+                self.seen.add(key)
+                chunk.append(Card(front, back))
+
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+                    if self.progress:
+                        self.progress(min(read[0] / total, 0.99), self.rows, self.rows - self.skipped)
+            if chunk:
+                yield chunk
+
+    def run(self, path: str) -> int:
+        """
+        Import a file into the deck with a single heapify and save it once.
+
+        Returns:
+            int: Number of cards added.
+        """
+        added = 0
+        try:
+            for chunk in self.chunks(path):
+                added += self.deck.add_cards(chunk, save=False, heapify=False)
+        finally:
+            if added:
+                self.deck._heapify()
+        if added:
+            self.deck.save_deck()
+        if self.progress:
+            self.progress(1.0, self.rows, added)
+        return added
+
+
+def import_file(path: str, deck: Deck, chunk_size: int = 5000,
+                progress: Optional[ProgressCallback] = print_progress) -> int:
+    """
+    Import cards from a CSV/TSV/text file into a deck.
+
+    Returns:
+        int: Number of cards added.
+    """
+    return BulkImporter(deck, chunk_size, progress).run(path)
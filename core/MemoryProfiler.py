@@ -0,0 +1,187 @@
+import gc
+import os
+import json
+import tracemalloc
+from typing import Callable, Optional
+
+from core.Card import Card
+from core.Deck import Deck
+from core.Settings import font_path
+
+# Classes whose live instances are counted at every state transition
+WATCHED_TYPES = ("DeckContainer", "Deck", "Card", "DeckEdit", "LearningSession", "TrigramIndex")
+
+
+def _traced_bytes(build: Callable[[], object]) -> tuple[object, int]:
+    """Run build() and return its result with the number of bytes it kept allocated."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    return result, tracemalloc.get_traced_memory()[0] - before
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size:.0f} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class MemoryProfiler:
+    """
+    tracemalloc-based memory profiling mode (main.py --profile-memory).
+
+    Every state transition takes a snapshot, prints the largest allocation
+    changes since the previous one and the number of live instances of the
+    main model/UI classes, so objects that pile up across screens (e.g. a
+    DeckContainer re-created by every DeckScreenState) show up as leaks.
+    report() measures the cost of cards, history entries, decks and
+    cached surfaces for a collection.
+    """
+
+    def __init__(self, frames: int = 10, top: int = 10) -> None:
+        self.frames = frames
+        self.top = top
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.counts: dict[str, int] = {}
+        self.root = os.getcwd()
+
+    def start(self) -> None:
+        tracemalloc.start(self.frames)
+        self.snapshot = self._take_snapshot()
+        self.counts = self.live_counts()
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        gc.collect()
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+
+    @staticmethod
+    def live_counts() -> dict[str, int]:
+        """Count live instances of the watched classes."""
+        gc.collect()
+        counts = dict.fromkeys(WATCHED_TYPES, 0)
+        for obj in gc.get_objects():
+            name = type(obj).__name__
+            if name in counts:
+                counts[name] += 1
+        return counts
+
+    def on_transition(self, old_state, new_state) -> None:
+        """
+        Print the allocation diff and live instance counts since the previous transition.
+        """
+        snapshot = self._take_snapshot()
+        counts = self.live_counts()
+        old_name, new_name = type(old_state).__name__, type(new_state).__name__
+
+        stats = snapshot.compare_to(self.snapshot, "lineno")
+        growth = sum(s.size_diff for s in stats)
+        current, peak = tracemalloc.get_traced_memory()
+        print(f"[memory] {old_name} -> {new_name}: {_format_bytes(growth):>10} "
+              f"(traced {_format_bytes(current)}, peak {_format_bytes(peak)})")
+
+        for stat in sorted(stats, key=lambda s: abs(s.size_diff), reverse=True)[:self.top]:
+            if stat.size_diff == 0:
+                break
+            frame = stat.traceback[0]
+            filename = os.path.relpath(frame.filename, self.root) if frame.filename.startswith(self.root) else frame.filename
+            print(f"    {_format_bytes(stat.size_diff):>10} {stat.count_diff:+7d} blocks  {filename}:{frame.lineno}")
+
+        changes = [f"{name} {count} ({count - self.counts.get(name, 0):+d})"
+                   for name, count in counts.items() if count != self.counts.get(name, 0)]
+        if changes:
+            print("    live: " + ", ".join(changes))
+
+        self.snapshot, self.counts = snapshot, counts
+
+    def report(self, folder: str, images=None) -> dict[str, float]:
+        """
+        Measure per-object memory for the decks in a folder.
+
+        Python-side sizes come from tracemalloc. Fonts and surfaces live in
+        SDL's native heap, which tracemalloc cannot see, so their sizes are
+        estimated (font file size, pixel buffer size).
+
+        Args:
+            folder (str): Deck folder to measure.
+            images (ImageRegistry, optional): Registry whose cached surfaces are reported.
+
+        Returns:
+            dict[str, float]: Measured sizes in bytes.
+        """
+        started = tracemalloc.is_tracing()
+        if not started:
+            tracemalloc.start(self.frames)
+
+        payloads = []
+        for filename in sorted(os.listdir(folder)):
+            if filename.endswith(".json"):
+                with open(os.path.join(folder, filename), "r", encoding="utf-8") as f:
+                    payloads.append((filename, f.read()))
+
+        def load_cards(strip_history: bool):
+            cards = []
+            for _, payload in payloads:
+                for data in json.loads(payload).get("cards", []):
+                    if strip_history:
+                        data["history"] = []
+                    cards.append(Card.from_dict(data))
+            return cards
+
+        bare, bare_bytes = _traced_bytes(lambda: load_cards(True))
+        n_cards = len(bare)
+        del bare
+        full, full_bytes = _traced_bytes(lambda: load_cards(False))
+        n_history = sum(c.history_count for c in full)
+        del full
+
+        missing = os.path.join(folder, "__memory_profile__.json")
+        empty_decks, deck_bytes = _traced_bytes(lambda: [Deck("x", missing) for _ in range(max(len(payloads), 1))])
+        n_decks = len(empty_decks)
+        del empty_decks
+
+        loaded, loaded_bytes = _traced_bytes(
+            lambda: [Deck(os.path.splitext(name)[0], os.path.join(folder, name)) for name, _ in payloads]
+        )
+        del loaded
+
+        result = {
+            "cards": n_cards,
+            "history_entries": n_history,
+            "decks": len(payloads),
+            "bytes_per_card": bare_bytes / n_cards if n_cards else 0.0,
+            "bytes_per_history_entry": (full_bytes - bare_bytes) / n_history if n_history else 0.0,
+            "bytes_per_deck_object": deck_bytes / n_decks,
+            "bytes_per_loaded_deck": loaded_bytes / len(payloads) if payloads else 0.0,
+            "font_native_bytes_estimate": float(os.path.getsize(font_path)) if os.path.exists(font_path) else 0.0,
+        }
+
+        if images is not None:
+            surfaces = images.cached()
+            pixels = [s.get_pitch() * s.get_height() for _, s in surfaces]
+            result["cached_surfaces"] = len(surfaces)
+            result["bytes_per_cached_surface"] = sum(pixels) / len(pixels) if pixels else 0.0
+            result["cached_surface_bytes"] = float(sum(pixels))
+
+        if not started:
+            tracemalloc.stop()
+        return result
+
+    @staticmethod
+    def print_report(result: dict[str, float]) -> None:
+        print(f"[memory] {result['decks']} decks, {result['cards']} cards, "
+              f"{result['history_entries']} history entries")
+        print(f"    per card (without history): {_format_bytes(result['bytes_per_card'])}")
+        print(f"    per history entry:          {_format_bytes(result['bytes_per_history_entry'])}")
+        print(f"    per Deck object:            {_format_bytes(result['bytes_per_deck_object'])} "
+              f"+ title font (native, ~{_format_bytes(result['font_native_bytes_estimate'])})")
+        print(f"    per loaded deck:            {_format_bytes(result['bytes_per_loaded_deck'])}")
+        if "cached_surfaces" in result:
+            print(f"    per cached surface:         {_format_bytes(result['bytes_per_cached_surface'])} "
+                  f"(native, {result['cached_surfaces']} surfaces, "
+                  f"{_format_bytes(result['cached_surface_bytes'])} total)")
@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import datetime
+import functools
+from collections import deque
+from typing import Callable, Optional
+
+PROFILE_FOLDER = os.path.join(os.getcwd(), "resources", "Profiles")
+
+
+class _Section:
+    """Context manager that records the wall time of one named section."""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullSection:
+    """Shared no-op context manager returned while profiling is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SECTION = _NullSection()
+
+
+class Profiler:
+    """
+    Opt-in wall-time profiler for the main loop and hot paths.
+
+    Samples are (frame, section, seconds) tuples kept in a fixed-size ring
+    buffer. While disabled, section() returns a shared no-op object and
+    @timed functions only pay for one attribute check.
+    """
+
+    def __init__(self, capacity: int = 8192) -> None:
+        self.enabled = False
+        self.samples: deque[tuple[int, str, float]] = deque(maxlen=capacity)
+        self.frame = 0
+        self._frame_start = 0.0
+        self._counters: dict[str, Callable[[], tuple[int, int]]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        self.samples.append((self.frame, name, seconds))
+
+    def section(self, name: str):
+        """
+        Time a block of code:
+
+            with PROFILER.section("Deck.save_deck"):
+                ...
+        """
+        if not self.enabled:
+            return NULL_SECTION
+        return _Section(self, name)
+
+    def begin_frame(self) -> None:
+        self.frame += 1
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        if self.enabled:
+            self.record("frame", time.perf_counter() - self._frame_start)
+
+    def register_counter(self, name: str, counter: Callable[[], tuple[int, int]]) -> None:
+        """
+        Register a cache whose hit rate is shown in the overlay and dumps.
+
+        Args:
+            name (str): Label of the cache.
+            counter (Callable): Returns the current (hits, misses).
+        """
+        self._counters[name] = counter
+
+    def hit_rates(self) -> dict[str, tuple[int, int, float]]:
+        """
+        Returns:
+            dict[str, tuple[int, int, float]]: (hits, misses, hit rate) per registered cache.
+        """
+        rates = {}
+        for name, counter in self._counters.items():
+            hits, misses = counter()
+            total = hits + misses
+            rates[name] = (hits, misses, hits / total if total else 0.0)
+        return rates
+
+    def summary(self, frames: int = 30) -> dict[str, dict[str, float]]:
+        """
+        Aggregate the samples of the last few frames.
+
+        Returns:
+            dict[str, dict[str, float]]: count, total_ms, mean_ms and max_ms per section.
+        """
+        first = self.frame - frames
+        stats: dict[str, list[float]] = {}
+        for frame, name, seconds in reversed(self.samples):
+            if frame <= first:
+                break
+            entry = stats.get(name)
+            if entry is None:
+                stats[name] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                if seconds > entry[2]:
+                    entry[2] = seconds
+
+        return {
+            name: {
+                "count": count,
+                "total_ms": total * 1000,
+                "mean_ms": total / count * 1000,
+                "max_ms": peak * 1000,
+            }
+            for name, (count, total, peak) in stats.items()
+        }
+
+    def dump(self, path: Optional[str] = None) -> str:
+        """
+        Write the ring buffer, a summary and the cache counters to a JSON file.
+
+        Returns:
+            str: Path of the written file.
+        """
+        if path is None:
+            os.makedirs(PROFILE_FOLDER, exist_ok=True)
+            name = "profile-" + datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+            path = os.path.join(PROFILE_FOLDER, name)
+
+        data = {
+            "frames": self.frame,
+            "summary": self.summary(frames=self.frame),
+            "caches": {name: {"hits": h, "misses": m, "hit_rate": r}
+                       for name, (h, m, r) in self.hit_rates().items()},
+            "samples": [[frame, name, seconds * 1000] for frame, name, seconds in self.samples],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return path
+
+
+PROFILER = Profiler()
+
+
+def timed(name: Optional[str] = None):
+    """
+    Decorator recording a function's wall time under the given section name
+    (defaults to its qualified name) whenever the profiler is enabled.
+    """
+    def decorator(func):
+        section = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(section, time.perf_counter() - start)
+        return wrapper
+    return decorator
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 import random
 from core.Enums import Rating, CardStatus
+from core.Profiler import timed
 
 class Scheduler:
     """
@@ -24,6 +25,7 @@ class Scheduler:
         self.hard_multiplier = 1.2
         self.minimum_ease_factor = 1.3
 
+    @timed("Scheduler.update_card")
     def update_card(self, card, rating: Rating) -> None:
         """
         Update the card's scheduling data based on the given rating.
@@ -34,7 +36,7 @@ class Scheduler:
         """
         now = datetime.now()
         card.last_review = now
-        card.history.append((now, rating))
+        card.append_history(now, rating)
 
         # -----------------------------
         # NEW → LEARNING or REVIEW
@@ -4,3 +4,6 @@ WIDTH = 1000
 
 font_path = "resources/Fonts/Amatic-Bold.ttf"
 card_font_path = "resources/Fonts/WorkSans-Italic-VariableFont_wght.ttf"
+
+SEARCH_DEBOUNCE_MS = 120
+DECK_WATCH_INTERVAL_MS = 2000
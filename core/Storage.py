@@ -0,0 +1,265 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Union
+
+from core.Card import Card
+
+SHARD_SUFFIX = ".shards"
+META_FILE = "meta.json"
+DEFAULT_SHARD_SIZE = 5000
+
+
+def is_sharded(path: str) -> bool:
+    """True if path is a sharded deck directory."""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_FILE))
+
+
+def file_version(path: str) -> Optional[tuple[int, int]]:
+    """
+    Version of a deck on disk: modification time (ns) and size of its file,
+    or of the metadata file of a sharded deck (rewritten by every save).
+    None if the deck does not exist.
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, META_FILE)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Shard:
+    """A fixed-size group of cards stored in one file."""
+    __slots__ = ("file", "checksum", "ids", "dirty")
+
+    def __init__(self, file: Optional[str] = None, checksum: Optional[str] = None,
+                 ids: Optional[list[str]] = None) -> None:
+        self.file = file
+        self.checksum = checksum
+        self.ids: list[str] = ids if ids is not None else []
+        self.dirty = file is None
+
+
+class ShardedStorage:
+    """
+    Deck storage as a directory of card shards plus a metadata file.
+
+    meta.json holds the deck name and version and, for every shard, its file name,
+    card count and SHA-256 checksum. A shard file holds up to shard_size
+    cards, one card object per line. Shards are read in parallel and
+    verified against their checksums; a corrupt shard (checksum or parse
+    failure) is left out of the deck, so the other shards still load, and
+    is moved aside (renamed to *.corrupt) by the next save. A shard file
+    that is missing or can't be read is reported and stays in the metadata,
+    so saving never drops its cards. Loading never writes anything.
+    Saving rewrites only the shards holding dirty, added or removed cards. Shard files are named after their checksum and the
+    metadata is replaced last, so an interrupted save leaves the previous
+    version of the deck intact.
+    """
+
+    # Threads used to read and verify shards
+    max_workers = 4
+
+    def __init__(self, folder: str, shard_size: int = DEFAULT_SHARD_SIZE) -> None:
+        self.folder = folder
+        self.shard_size = shard_size
+        self.shards: list[Shard] = []
+        self.shard_of: dict[str, Shard] = {}  # Card id -> shard holding it
+        self.corrupt: list[str] = []  # Corrupt shard files, moved aside by the next save
+        self.missing: list[dict] = []  # Metadata entries of shards that could not be read
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.folder, META_FILE)
+
+    # ─── Loading ────────────────────────────────────────────────────────
+
+    def load(self) -> tuple[dict, list[Card], bool]:
+        """
+        Read the metadata and all shards.
+
+        Returns:
+            tuple[dict, list[Card], bool]: Deck metadata, cards, and whether any card lacked an id.
+        """
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.shard_size = meta.pop("shard_size", self.shard_size)
+        entries = meta.pop("shards", [])
+
+        workers = max(1, min(self.max_workers, len(entries)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self._try_read_shard, entries))
+
+        self.shards = []
+        self.shard_of = {}
+        self.corrupt = []
+        self.missing = []
+        cards: dict[str, Card] = {}
+        missing_ids = False
+        for entry, result in zip(entries, results):
+            if isinstance(result, OSError):
+                print(f"Error reading shard {os.path.join(self.folder, entry['file'])}: {result}; "
+                      f"its {entry.get('count', 0)} cards are kept on disk but not loaded")
+                self.missing.append(entry)
+                continue
+            if result is None:
+                self.corrupt.append(entry["file"])
+                continue
+            shard_cards, shard_missing = result
+            shard = Shard(entry["file"], entry["sha256"], [c.id for c in shard_cards])
+            self.shards.append(shard)
+            for card in shard_cards:
+                other = cards.get(card.id)
+                if other is not None:
+                    # Stored twice (e.g. a missing shard came back): keep the later version
+                    if other.mod >= card.mod:
+                        shard.ids.remove(card.id)
+                        shard.dirty = True
+                        continue
+                    self.shard_of[card.id].ids.remove(card.id)
+                    self.shard_of[card.id].dirty = True
+                self.shard_of[card.id] = shard
+                cards[card.id] = card
+            missing_ids = missing_ids or shard_missing
+        return meta, list(cards.values()), missing_ids
+
+    def _try_read_shard(self, entry: dict) -> Union[tuple[list[Card], bool], OSError, None]:
+        try:
+            return self._read_shard(entry)
+        except OSError as e:
+            return e
+
+    def _read_shard(self, entry: dict) -> Optional[tuple[list[Card], bool]]:
+        """
+        Read and verify one shard. Returns None if it is corrupt.
+
+        Raises:
+            OSError: If the file is missing or can't be read.
+        """
+        path = os.path.join(self.folder, entry["file"])
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if hashlib.sha256(data).hexdigest() != entry.get("sha256"):
+            print(f"Error loading shard {path}: checksum mismatch")
+            return None
+
+        cards = []
+        missing_ids = False
+        try:
+            for line in data.decode("utf-8").split("\n"):
+                if not line:
+                    continue
+                card_data = json.loads(line)
+                missing_ids = missing_ids or "id" not in card_data
+                cards.append(Card.from_dict(card_data, line))
+        except (UnicodeDecodeError, json.JSONDecodeError, KeyError) as e:
+            print(f"Error loading shard {path}: {e}")
+            return None
+        return cards, missing_ids
+
+    def _quarantine(self, file: str) -> None:
+        path = os.path.join(self.folder, file)
+        if os.path.exists(path):
+            try:
+                os.replace(path, path + ".corrupt")
+            except OSError as e:
+                print(f"Error moving corrupt shard {path}: {e}")
+
+    # ─── Saving ─────────────────────────────────────────────────────────
+
+    def save(self, name: str, card_map: dict[str, Card], dirty_ids: Iterable[str],
+             cards_changed: bool = True, rewrite: bool = False, version: int = 0) -> int:
+        """
+        Write the shards that changed, then the metadata.
+
+        Args:
+            name (str): Deck name.
+            card_map (dict[str, Card]): All cards of the deck by id.
+            dirty_ids (Iterable[str]): Ids of cards whose content changed.
+            cards_changed (bool): Cards were added or removed since the last save.
+            rewrite (bool): Rewrite every shard.
+            version (int): Deck version stored in the metadata.
+
+        Returns:
+            int: Number of shard files written.
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        dirty_ids = list(dirty_ids)
+        if cards_changed or rewrite or any(i not in self.shard_of for i in dirty_ids):
+            self._assign(card_map)
+        for card_id in dirty_ids:
+            shard = self.shard_of.get(card_id)
+            if shard is not None:
+                shard.dirty = True
+
+        written = 0
+        for shard in self.shards:
+            if shard.dirty or rewrite:
+                self._write_shard(shard, card_map)
+                written += 1
+        # Move corrupt shards aside before the metadata stops referencing them
+        for file in self.corrupt:
+            self._quarantine(file)
+        self.corrupt = []
+        self._write_meta(name, version)
+        self._remove_stale()
+        return written
+
+    def _assign(self, card_map: dict[str, Card]) -> None:
+        """Drop removed cards from their shards and put new cards into the last shards."""
+        for shard in self.shards:
+            kept = [i for i in shard.ids if i in card_map]
+            if len(kept) != len(shard.ids):
+                shard.ids = kept
+                shard.dirty = True
+        self.shards = [s for s in self.shards if s.ids]
+        self.shard_of = {i: shard for shard in self.shards for i in shard.ids}
+
+        for card_id in card_map:
+            if card_id in self.shard_of:
+                continue
+            if not self.shards or len(self.shards[-1].ids) >= self.shard_size:
+                self.shards.append(Shard())
+            shard = self.shards[-1]
+            shard.ids.append(card_id)
+            shard.dirty = True
+            self.shard_of[card_id] = shard
+
+    def _write_shard(self, shard: Shard, card_map: dict[str, Card]) -> None:
+        data = ("\n".join(card_map[i].persisted_json() for i in shard.ids) + "\n").encode("utf-8")
+        checksum = hashlib.sha256(data).hexdigest()
+        file = f"shard-{checksum[:16]}.jsonl"
+        self._write_file(file, data)
+        shard.file, shard.checksum, shard.dirty = file, checksum, False
+
+    def _write_meta(self, name: str, version: int) -> None:
+        meta = {
+            "name": name,
+            "version": version,
+            "shard_size": self.shard_size,
+            "shards": [{"file": s.file, "count": len(s.ids), "sha256": s.checksum} for s in self.shards]
+                      + self.missing,
+        }
+        self._write_file(META_FILE, json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def _write_file(self, file: str, data: bytes) -> None:
+        """Write a file atomically (temporary file, then rename)."""
+        path = os.path.join(self.folder, file)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _remove_stale(self) -> None:
+        """Delete shard files no longer referenced by the metadata."""
+        referenced = {s.file for s in self.shards} | {entry["file"] for entry in self.missing}
+        for file in os.listdir(self.folder):
+            if file.startswith("shard-") and file.endswith(".jsonl") and file not in referenced:
+                try:
+                    os.remove(os.path.join(self.folder, file))
+                except OSError as e:
+                    print(f"Error removing old shard {file}: {e}")
@@ -0,0 +1,278 @@
+import os
+import json
+import datetime
+import heapq
+from typing import Iterable, Optional
+
+from core.Card import Card
+from core.Deck import Deck
+from core.Enums import CardStatus
+
+DECK_FOLDER = os.path.join(os.getcwd(), "resources", "Decks")
+
+
+class StudyPlan:
+    """
+    Daily study plan over a collection.
+
+    Once per day every deck gets a quota of new and review cards and a
+    queue of the card ids picked for the day, with new cards spread evenly
+    between the reviews. Sessions take their cards from the front of the
+    queues, round-robin over the decks, so starting one costs O(limit)
+    instead of a scan of the whole collection. Ratings update the done
+    counters and drop cards that are finished for the day. The plan is
+    stored as JSON, so the daily limits survive restarts; decks that were
+    not planned yet (e.g. created today) are planned when first seen. When
+    cards are added to (or imported into) a planned deck, or its planned
+    cards run out after it was saved, the deck is topped up from the rest
+    of its daily quota.
+    """
+
+    # Default daily limits per deck (override per deck with set_limits)
+    new_per_day = 20
+    reviews_per_day = 200
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.day = datetime.date.today()
+        self.limits: dict[str, dict[str, int]] = {}  # Deck key -> {"new": n, "reviews": n}
+        # Deck key -> {"queue": [ids], "new_done": n, "reviews_done": n,
+        #              "version": deck version and "size": card count when planned}
+        self.decks: dict[str, dict] = {}
+        self.owner: dict[str, str] = {}  # Planned card id -> deck key
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def deck_key(deck: Deck) -> str:
+        return os.path.basename(deck.file_path)
+
+    # ─── Persistence ────────────────────────────────────────────────────
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.limits = data.get("limits", {})
+            if data.get("day") == self.day.isoformat():
+                self.decks = data.get("decks", {})
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading study plan: {e}")
+            return
+        self.owner = {card_id: key for key, entry in self.decks.items() for card_id in entry["queue"]}
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        data = {"day": self.day.isoformat(), "limits": self.limits, "decks": self.decks}
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+        except IOError as e:
+            print(f"Error saving study plan: {e}")
+            return
+        self.dirty = False
+
+    # ─── Planning ───────────────────────────────────────────────────────
+
+    def set_limits(self, deck: Deck, new: Optional[int] = None, reviews: Optional[int] = None) -> None:
+        """
+        Set a deck's daily limits; they apply from the next plan of the deck.
+        """
+        limits = self.limits.setdefault(self.deck_key(deck), {})
+        if new is not None:
+            limits["new"] = new
+        if reviews is not None:
+            limits["reviews"] = reviews
+        self.dirty = True
+
+    def ensure(self, decks: Iterable[Deck]) -> None:
+        """
+        Start a new plan after a day boundary, plan the given decks that are
+        not part of today's plan yet, and top up decks that changed since they
+        were planned if cards were added or removed, or their planned cards
+        ran out.
+        """
+        today = datetime.date.today()
+        if today != self.day:
+            self.day = today
+            self.decks.clear()
+            self.owner.clear()
+            self.dirty = True
+
+        for deck in decks:
+            entry = self.decks.get(self.deck_key(deck))
+            if entry is None:
+                self.plan_deck(deck)
+            elif entry.get("version") != deck.version:
+                if entry.get("size") != len(deck.card_map) or not self._prune(deck, entry):
+                    self.plan_deck(deck)
+        self.save()
+
+    def plan_deck(self, deck: Deck) -> None:
+        """Pick today's review and new cards of a deck."""
+        key = self.deck_key(deck)
+        limits = self.limits.get(key, {})
+        entry = self.decks.get(key, {"queue": [], "new_done": 0, "reviews_done": 0})
+        for card_id in entry["queue"]:
+            self.owner.pop(card_id, None)
+
+        review_quota = max(limits.get("reviews", self.reviews_per_day) - entry["reviews_done"], 0)
+        new_quota = max(limits.get("new", self.new_per_day) - entry["new_done"], 0)
+        due, new = [], []
+        if review_quota or new_quota:
+            for item in deck.cards:
+                card = item[2]
+                if card.status == CardStatus.NEW:
+                    new.append(item)
+                elif self._due(card):
+                    due.append(item)
+        reviews = [card.id for _, _, card in heapq.nsmallest(review_quota, due)]
+        new = [card.id for _, _, card in heapq.nsmallest(new_quota, new)]
+
+        entry["queue"] = self._interleave(reviews, new)
+        entry["version"] = deck.version
+        entry["size"] = len(deck.card_map)
+        self.decks[key] = entry
+        for card_id in entry["queue"]:
+            self.owner[card_id] = key
+        self.dirty = True
+
+    @staticmethod
+    def _interleave(reviews: list[str], new: list[str]) -> list[str]:
+        """Spread new cards evenly between the reviews."""
+        if not new or not reviews:
+            return reviews + new
+        queue = []
+        step = len(reviews) / (len(new) + 1)
+        r = 0
+        for i, card_id in enumerate(new, 1):
+            end = round(step * i)
+            queue.extend(reviews[r:end])
+            queue.append(card_id)
+            r = end
+        queue.extend(reviews[r:])
+        return queue
+
+    def _due(self, card: Card) -> bool:
+        return card.status != CardStatus.NEW and card.scheduled_date is not None \
+            and card.scheduled_date.date() <= self.day
+
+    def _plannable(self, card: Optional[Card]) -> bool:
+        """True if a planned card still exists and is still to be studied today."""
+        return card is not None and (card.status == CardStatus.NEW or self._due(card))
+
+    def _prune(self, deck: Deck, entry: dict) -> int:
+        """
+        Drop planned cards of a deck that were deleted or are no longer due.
+
+        Returns:
+            int: Number of cards still planned.
+        """
+        queue = [card_id for card_id in entry["queue"] if self._plannable(deck.card_map.get(card_id))]
+        if len(queue) != len(entry["queue"]):
+            for card_id in set(entry["queue"]).difference(queue):
+                self.owner.pop(card_id, None)
+            entry["queue"] = queue
+            self.dirty = True
+        return len(queue)
+
+    # ─── Sessions ───────────────────────────────────────────────────────
+
+    def take(self, decks: list[Deck], limit: int) -> list[Card]:
+        """
+        Return up to limit planned cards of the given decks, interleaved
+        round-robin over the decks. Planned cards that were deleted or are
+        no longer due are dropped from the plan on the way.
+
+        Args:
+            decks (list[Deck]): Decks to study (planned with ensure()).
+            limit (int): Maximum number of cards.
+        """
+        queues = []
+        for deck in decks:
+            entry = self.decks.get(self.deck_key(deck))
+            if entry and entry["queue"]:
+                queues.append((deck, entry, 0))
+
+        cards: list[Card] = []
+        while queues and len(cards) < limit:
+            remaining = []
+            for deck, entry, i in queues:
+                queue = entry["queue"]
+                while i < len(queue):
+                    if self._plannable(deck.card_map.get(queue[i])):
+                        break
+                    self.owner.pop(queue.pop(i), None)
+                    self.dirty = True
+                if i < len(queue) and len(cards) < limit:
+                    cards.append(deck.card_map[queue[i]])
+                    remaining.append((deck, entry, i + 1))
+            queues = remaining
+        return cards
+
+    def on_rated(self, card: Card, previous_status: CardStatus) -> None:
+        """
+        Count a rating against its deck's quota and drop the card from the
+        plan once it is no longer due today.
+
+        Args:
+            card (Card): The card after scheduling.
+            previous_status (CardStatus): The card's status before the rating.
+        """
+        key = self.owner.get(card.id)
+        if key is None:
+            return
+        entry = self.decks[key]
+        if previous_status == CardStatus.NEW:
+            entry["new_done"] += 1
+        elif previous_status == CardStatus.REVIEW:
+            entry["reviews_done"] += 1
+        if not self._due(card):
+            entry["queue"].remove(card.id)
+            del self.owner[card.id]
+        self.dirty = True
+
+    def on_unrated(self, card: Card, previous_status: CardStatus, key: Optional[str]) -> None:
+        """
+        Revert on_rated() for an undone rating.
+
+        Args:
+            card (Card): The card, restored to its state before the rating.
+            previous_status (CardStatus): The card's status before the rating.
+            key (str, optional): Key of the deck that planned the card when it was rated.
+        """
+        entry = self.decks.get(key) if key is not None else None
+        if entry is None:
+            return
+        if previous_status == CardStatus.NEW:
+            entry["new_done"] = max(entry["new_done"] - 1, 0)
+        elif previous_status == CardStatus.REVIEW:
+            entry["reviews_done"] = max(entry["reviews_done"] - 1, 0)
+        if card.id not in self.owner:
+            entry["queue"].insert(0, card.id)
+            self.owner[card.id] = key
+        self.dirty = True
+
+    def remaining(self, deck: Deck) -> int:
+        """Number of cards still planned for a deck today."""
+        entry = self.decks.get(self.deck_key(deck))
+        return len(entry["queue"]) if entry else 0
+
+
+_shared: dict[str, StudyPlan] = {}
+
+
+def get_study_plan(deck_folder: str = DECK_FOLDER) -> StudyPlan:
+    """
+    Return the shared study plan of a deck folder. The plan is stored in
+    StudyPlan.json next to the deck folder.
+    """
+    key = os.path.abspath(deck_folder)
+    plan = _shared.get(key)
+    if plan is None:
+        plan = StudyPlan(os.path.join(os.path.dirname(key), "StudyPlan.json"))
+        _shared[key] = plan
+    return plan
@@ -1,10 +1,29 @@
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 import datetime
-import heapq
+from collections import deque
 from core.Enums import CardStatus, Rating
 from core.Deck import Deck
 from core.Scheduler import Scheduler
 from core.Card import Card
+from core.TimerWheel import TimerWheel
+
+
+class RatingDelta:
+    """
+    One applied rating: the card's scheduling fields before and after it,
+    its serialized state before it (kept on disk while the rating can be
+    undone) and the wheel slot it waits in, if any.
+    """
+    __slots__ = ("card", "rating", "before", "after", "before_json", "plan_key", "slot")
+
+    def __init__(self, card: Card, rating: Rating, plan_key: Optional[str] = None) -> None:
+        self.card = card
+        self.rating = rating
+        self.before = card.scheduling_state()
+        self.after: tuple = ()
+        self.before_json = card.to_json()
+        self.plan_key = plan_key
+        self.slot: Optional[int] = None
 
 
 class Subdeck(Deck):
@@ -12,31 +31,65 @@ class Subdeck(Deck):
     A temporary subset of a deck (or decks) for learning purposes.
     Pulls a limited number of cards from a source deck or container,
     supports modifying card states and syncing changes back.
+
+    With a StudyPlan the cards are taken from today's plan (respecting the
+    daily per-deck limits) instead of being picked by scanning the source.
+
+    With a clock (a function returning milliseconds, e.g. the main loop's
+    pygame.time.get_ticks), cards rescheduled into the future by a learning
+    step wait in a TimerWheel instead of the queue, so the remaining
+    review/new cards are shown first; release_due() moves them back once
+    they are due.
+
+    Ratings are recorded as RatingDeltas, so the last undo_depth ratings
+    can be undone and redone; each step is O(log n) on the subdeck queue and
+    the owning deck's heap. Until a rating leaves the undo window its card
+    is held at the pre-rating state on disk, so an undone rating is never
+    saved; save_deck() only needs to run after a rating was committed.
     """
 
-    def __init__(self, source: Union[Deck, object], limit: int = 20) -> None:
+    # Changes are saved through the original decks, which track them
+    tracks_changes = False
+
+    # Number of ratings that can be undone
+    undo_depth = 10
+
+    def __init__(self, source: Union[Deck, object], limit: int = 20, plan=None,
+                 clock: Optional[Callable[[], int]] = None) -> None:
         self.limit = limit
         self.original_deck = source
+        self.plan = plan
+        self.clock = clock
+        self.waiting: Optional[TimerWheel] = TimerWheel(now=clock()) if clock else None
         self.scheduler = Scheduler()
         self.modified_cards = set()
+        self.undo_stack: deque[RatingDelta] = deque()
+        self.redo_stack: list[RatingDelta] = []
+        self._pending: dict[str, int] = {}  # Card id -> ratings of it in the undo window
+        self.pending_save = False  # A rating left the undo window since the last save
 
         if isinstance(source, Deck):
             super().__init__(name=source.name, path=source.file_path)
         else:
             super().__init__(name="Subdeck", path="")
 
-        self.cards = self._generate_cards(source)
+        self._set_cards(self._generate_cards(source))
         self.current_card: Optional[Card] = self.get_next_card()
 
-    def _generate_cards(self, source: Union[Deck, object]) -> list[tuple[datetime.datetime, int, Card]]:
+    def _generate_cards(self, source: Union[Deck, object]) -> list[Card]:
         """
         Extract a limited number of due and new cards from the source.
         """
+        if self.plan is not None:
+            decks = [source] if isinstance(source, Deck) else list(source.decks)
+            self.plan.ensure(decks)
+            return self.plan.take(decks, self.limit)
+
         today = datetime.date.today()
         review_cards = []
         new_cards = []
 
-        def process(card_heap: list[tuple[datetime.datetime, int, Card]]) -> None:
+        def process(card_heap: list[tuple[datetime.datetime, str, Card]]) -> None:
             for sd, _, card in sorted(card_heap):
                 if card.status in {CardStatus.REVIEW, CardStatus.LEARNING}:
                     if card.scheduled_date and card.scheduled_date.date() <= today:
@@ -54,11 +107,45 @@ class Subdeck(Deck):
         else:
             raise TypeError(f"Expected Deck or DeckContainer, got {type(source)}")
 
-        selected = (review_cards + new_cards)[:self.limit]
-        return [(card.scheduled_date, id(card), card) for card in selected]
+        return (review_cards + new_cards)[:self.limit]
 
     def has_cards(self) -> bool:
-        return bool(self.cards)
+        return bool(self.cards) or bool(self.waiting)
+
+    def _requeue(self, card: Card) -> Optional[int]:
+        """
+        Put a card back into the queue, or into the timer wheel if it is not due yet.
+
+        Returns:
+            int or None: The card's wheel slot, or None if it was queued.
+        """
+        if self.waiting is not None:
+            delay = (card.scheduled_date - datetime.datetime.now()).total_seconds()
+            if delay > 0:
+                return self.waiting.schedule(card, self.clock() + int(delay * 1000))
+        self._push(self._entry(card))
+        return None
+
+    def release_due(self) -> int:
+        """
+        Move waiting cards that became due back into the queue.
+
+        Returns:
+            int: Number of released cards.
+        """
+        if self.waiting is None:
+            return 0
+        due = self.waiting.advance(self.clock())
+        for card in due:
+            self._push(self._entry(card))
+        return len(due)
+
+    def next_due_in(self) -> Optional[int]:
+        """Milliseconds until the next waiting card is due, or None if none is waiting."""
+        if self.waiting is None:
+            return None
+        due = self.waiting.next_due()
+        return None if due is None else max(due - self.clock(), 0)
 
     def get_next_card(self) -> Optional[Card]:
         if self.cards:
@@ -68,16 +155,20 @@ class Subdeck(Deck):
         return None
 
     def pop_current_card(self) -> Optional[Card]:
-        if self.cards:
-            _, _, card = heapq.heappop(self.cards)
-            self.current_card = None
-            return card
-        return None
+        # The current card is not necessarily the heap top: release_due() may
+        # have queued an earlier card while it was shown
+        card = self.current_card
+        if card is None or card.id not in self.card_map:
+            return None
+        self._remove_at(self._heap_index(card.id))
+        self.current_card = None
+        return card
 
-    def again_insert(self) -> None:
+    def again_insert(self) -> Optional[int]:
         if self.current_card:
             card = self.pop_current_card()
-            heapq.heappush(self.cards, (card.scheduled_date, id(card), card))
+            return self._requeue(card)
+        return None
 
     def modify_card(self, rating: Rating) -> None:
         """
@@ -88,22 +179,114 @@ class Subdeck(Deck):
             return
 
         card = self.current_card
+        delta = RatingDelta(card, rating, self.plan.owner.get(card.id) if self.plan is not None else None)
         self.scheduler.update_card(card, rating)
+        delta.after = card.scheduling_state()
+        self._apply(delta)
+        self.redo_stack.clear()
+        self._record(delta)
+
+    def _apply(self, delta: RatingDelta) -> None:
+        """Move the just rated current card and sync the change to its deck and the plan."""
+        card, rating = delta.card, delta.rating
         self.modified_cards.add(card)
+        if self.plan is not None:
+            self.plan.on_rated(card, delta.before[0])
 
+        delta.slot = None
         if rating == Rating.AGAIN:
-            self.again_insert()
+            delta.slot = self.again_insert()
         elif rating == Rating.EASY:
             self.pop_current_card()
         elif card.status == CardStatus.LEARNING:
             self.pop_current_card()
-            heapq.heappush(self.cards, (card.scheduled_date, id(card), card))
+            delta.slot = self._requeue(card)
         elif card.status == CardStatus.REVIEW:
             self.pop_current_card()
 
         self._update_original_card(card)
         self.current_card = self.get_next_card()
 
+    # ─── Undo / redo ────────────────────────────────────────────────────
+
+    def _record(self, delta: RatingDelta) -> None:
+        card = delta.card
+        if not self._pending.get(card.id):
+            card.hold(delta.before_json)
+        self._pending[card.id] = self._pending.get(card.id, 0) + 1
+        self.undo_stack.append(delta)
+        if len(self.undo_stack) > self.undo_depth:
+            self._commit(self.undo_stack.popleft())
+
+    def _commit(self, delta: RatingDelta) -> None:
+        """A rating left the undo window: let the next save write it."""
+        card = delta.card
+        self._pending[card.id] -= 1
+        if self._pending[card.id]:
+            # Still hold the state before the card's next undoable rating
+            card.hold(next(d.before_json for d in self.undo_stack if d.card is card))
+        else:
+            del self._pending[card.id]
+            card.release()
+        self.modified_cards.add(card)
+        self.pending_save = True
+
+    def commit_all(self) -> None:
+        """End the undo window (e.g. when the session ends)."""
+        while self.undo_stack:
+            self._commit(self.undo_stack.popleft())
+        self.redo_stack.clear()
+
+    def undo(self) -> Optional[Card]:
+        """
+        Revert the latest rating and make its card the current card again.
+
+        Returns:
+            Card or None: The restored card, or None if there is nothing to undo.
+        """
+        if not self.undo_stack:
+            return None
+        delta = self.undo_stack.pop()
+        card = delta.card
+
+        if card.id in self.card_map:
+            self._remove_at(self._heap_index(card.id))
+        elif delta.slot is not None and self.waiting is not None:
+            self.waiting.remove(card, delta.slot)
+        card.restore_scheduling(delta.before)
+        card.pop_history()
+        self._push(self._entry(card))
+        self.current_card = card
+        self._update_original_card(card)
+        if self.plan is not None:
+            self.plan.on_unrated(card, delta.before[0], delta.plan_key)
+
+        self._pending[card.id] -= 1
+        if not self._pending[card.id]:
+            del self._pending[card.id]
+            card.release()
+        self.modified_cards.add(card)
+        self.redo_stack.append(delta)
+        return card
+
+    def redo(self) -> Optional[Card]:
+        """
+        Re-apply the latest undone rating (with the same scheduling result).
+
+        Returns:
+            Card or None: The re-rated card, or None if there is nothing to redo.
+        """
+        if not self.redo_stack:
+            return None
+        delta = self.redo_stack.pop()
+        card = delta.card
+        self.current_card = card
+        card.restore_scheduling(delta.after)
+        card.append_history(card.last_review, delta.rating)
+        self._apply(delta)
+        self._record(delta)
+        return card
+
     def _update_original_card(self, updated_card: Card) -> None:
         """
         Update the card's data in the original deck or decks.
@@ -115,11 +298,9 @@ class Subdeck(Deck):
             decks = self.original_deck.decks
 
         for deck in decks:
-            for i, (_, _, c) in enumerate(deck.cards):
-                if c is updated_card:
-                    deck.cards[i] = (updated_card.scheduled_date, id(updated_card), updated_card)
-                    heapq.heapify(deck.cards)
-                    break
+            if updated_card.id in deck.card_map:
+                deck.reschedule_card(updated_card)
+                break
 
     def save_deck(self) -> None:
         """
@@ -131,12 +312,16 @@ class Subdeck(Deck):
             affected = set()
             for card in self.modified_cards:
                 for deck in self.original_deck.decks:
-                    if any(c is card for _, _, c in deck.cards):
+                    if card.id in deck.card_map:
                         affected.add(deck)
+                        break
             for deck in affected:
                 deck.save_deck()
 
+        if self.plan is not None:
+            self.plan.save()
         self.modified_cards.clear()
+        self.pending_save = False
 
     def get_stats(self) -> dict[CardStatus, int]:
         """
@@ -0,0 +1,278 @@
+import os
+import json
+import uuid
+import datetime
+import urllib.request
+from urllib.parse import urlencode
+from typing import Iterable, Optional
+
+from core.Card import Card, now_ms
+from core.Deck import Deck
+from core.SyncServer import BATCH_SIZE, decode_batch, encode_batch
+
+DECK_FOLDER = os.path.join(os.getcwd(), "resources", "Decks")
+
+
+class SyncState:
+    """
+    Client side sync bookkeeping of a collection: the client id, the server
+    URL, how far the server's changes were pulled, and the cards deleted
+    since the last sync. Stored in SyncState.json next to the deck folder.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.client = uuid.uuid4().hex
+        self.url: Optional[str] = None
+        self.usn = 0  # Server usn up to which changes were pulled
+        self.last_sync: Optional[str] = None  # Local time (iso) the last sync collected changes
+        self.graves: dict[str, int] = {}  # Deleted card id -> deletion time (epoch ms), not sent yet
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading sync state: {e}")
+            return
+        self.client = data.get("client", self.client)
+        self.url = data.get("url")
+        self.usn = data.get("usn", 0)
+        self.last_sync = data.get("last_sync")
+        self.graves = data.get("graves", {})
+
+    def save(self) -> None:
+        data = {"client": self.client, "url": self.url, "usn": self.usn,
+                "last_sync": self.last_sync, "graves": self.graves}
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+        except IOError as e:
+            print(f"Error saving sync state: {e}")
+
+    def on_cards_deleted(self, deck: Deck, cards: list[Card]) -> None:
+        """Deck delete listener: remember deleted cards for the next sync, writing the state once."""
+        now = now_ms()
+        for card in cards:
+            self.graves[card.id] = now
+        self.save()
+
+
+class SyncClient:
+    """
+    Syncs a collection with a sync server (see core.SyncServer), sending
+    and receiving only what changed since the last sync.
+
+    Cards changed locally carry usn -1 (see Card.mark_dirty), so collecting
+    the changes needs no comparison with the server, and only their reviews
+    made since the last sync are sent. Changes travel as zlib-compressed
+    batches. Card fields are merged last-writer-wins on the cards'
+    modification times, review histories are merged as a union.
+
+    A sync runs in three steps, so the network part can run on a worker
+    thread: collect() and apply() touch the decks, exchange() only talks to
+    the server. Cards changed while the exchange was running stay marked
+    for the next sync.
+    """
+
+    # Seconds to wait for the server
+    timeout = 10
+    batch_size = BATCH_SIZE
+
+    def __init__(self, url: str, state: SyncState) -> None:
+        self.url = url.rstrip("/")
+        self.state = state
+
+    def sync(self, decks: list[Deck], folder: str = DECK_FOLDER) -> dict:
+        """
+        Run a whole sync.
+
+        Returns:
+            dict: Counts of pushed and pulled changes, bytes sent and received, and new decks.
+        """
+        changes = self.collect(decks)
+        result = self.exchange(changes)
+        return self.apply(decks, changes, result, folder)
+
+    def collect(self, decks: Iterable[Deck]) -> dict:
+        """Gather the local changes since the last sync."""
+        since = datetime.datetime.fromisoformat(self.state.last_sync) if self.state.last_sync else None
+        started = datetime.datetime.now().isoformat()
+        cards, reviews, pushed = [], [], {}
+        for deck in decks:
+            for card in deck.card_map.values():
+                if card.usn != -1:
+                    continue
+                data = card.to_dict()
+                data["deck"] = deck.name
+                for when, rating in data.pop("history"):
+                    if since is None or datetime.datetime.fromisoformat(when) > since:
+                        reviews.append([card.id, when, rating])
+                cards.append(data)
+                pushed[card.id] = card.mod
+
+        removed = [[card_id, mod] for card_id, mod in self.state.graves.items()]
+        return {"cards": cards, "reviews": reviews, "removed": removed, "pushed": pushed, "started": started}
+
+    def exchange(self, changes: dict) -> dict:
+        """
+        Pull the server's changes since the last sync, then push the local ones.
+        Safe to run on a worker thread.
+
+        Raises:
+            OSError: If the server can't be reached or rejects a request.
+        """
+        client = self.state.client
+        sent = received = 0
+        pulled = {"cards": [], "reviews": [], "removed": []}
+        since, until = self.state.usn, None
+        while True:
+            query = {"client": client, "since": since}
+            if until is not None:
+                query["until"] = until
+            data = self._request("/pull?" + urlencode(query))
+            received += len(data)
+            page = decode_batch(data)
+            for key in pulled:
+                pulled[key].extend(page[key])
+            since, until = page["usn"], page["until"]
+            if not page["more"]:
+                break
+
+        lists = [changes["cards"], changes["reviews"], changes["removed"]]
+        batches = max(1, *((len(items) + self.batch_size - 1) // self.batch_size for items in lists))
+        usn = None
+        for i in range(batches):
+            window = slice(i * self.batch_size, (i + 1) * self.batch_size)
+            body = encode_batch({"cards": lists[0][window], "reviews": lists[1][window], "removed": lists[2][window]})
+            sent += len(body)
+            data = self._request("/push?" + urlencode({"client": client}), body)
+            received += len(data)
+            usn = decode_batch(data)["usn"]
+
+        return {"pulled": pulled, "until": until, "usn": usn, "sent": sent, "received": received}
+
+    def _request(self, path: str, body: Optional[bytes] = None) -> bytes:
+        request = urllib.request.Request(self.url + path, data=body, method="GET" if body is None else "POST",
+                                         headers={"Content-Type": "application/octet-stream"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def apply(self, decks: list[Deck], changes: dict, result: dict, folder: str = DECK_FOLDER) -> dict:
+        """
+        Merge the pulled changes into the decks and record the sync.
+        Cards of decks that don't exist here go into new decks in folder.
+        """
+        pulled = result["pulled"]
+        decks = list(decks)
+        by_name = {deck.name: deck for deck in decks}
+        new_decks: list[Deck] = []
+        touched: set[Deck] = set()
+
+        def find(card_id: str) -> tuple[Optional[Deck], Optional[Card]]:
+            for deck in decks:
+                card = deck.card_map.get(card_id)
+                if card is not None:
+                    return deck, card
+            return None, None
+
+        reviews: dict[str, list] = {}
+        for card_id, when, rating in pulled["reviews"]:
+            reviews.setdefault(card_id, []).append([when, rating])
+
+        for data in pulled["cards"]:
+            deck, local = find(data["id"])
+            if local is None:
+                if data["id"] in self.state.graves:
+                    continue
+                deck = by_name.get(data["deck"])
+                if deck is None:
+                    deck = Deck(data["deck"], os.path.join(folder, f"{data['deck']}.json"))
+                    by_name[deck.name] = deck
+                    decks.append(deck)
+                    new_decks.append(deck)
+                card = Card.from_dict(dict(data, history=reviews.pop(data["id"], [])))
+                deck.add_cards([card], save=False)
+                card.mark_synced(data["usn"], data["mod"])
+                touched.add(deck)
+            elif local.usn == -1 and local.mod >= data["mod"]:
+                continue  # The local change is newer and was pushed
+            else:
+                history = local._encoded_history()
+                local.adopt(Card.from_dict(dict(data, history=history)))
+                local.mark_synced(data["usn"], data["mod"])
+                deck.reschedule_card(local)
+                if deck._search_index is not None:
+                    deck._search_index.update(local)
+                touched.add(deck)
+
+        for card_id, entries in reviews.items():
+            deck, local = find(card_id)
+            if local is not None and local.merge_history(entries):
+                touched.add(deck)
+
+        removals: dict[Deck, list[Card]] = {}
+        for card_id, mod in pulled["removed"]:
+            deck, local = find(card_id)
+            if local is not None and not (local.usn == -1 and local.mod > mod):
+                removals.setdefault(deck, []).append(local)
+        for deck, cards in removals.items():
+            deck.delete_cards(cards, save=False)
+            for card in cards:
+                self.state.graves.pop(card.id, None)
+            touched.add(deck)
+
+        # Pushed cards that did not change during the exchange are on the server now
+        if result["usn"] is not None:
+            for card_id, mod in changes["pushed"].items():
+                deck, local = find(card_id)
+                if local is not None and local.usn == -1 and local.mod == mod:
+                    local.mark_synced(result["usn"])
+                    touched.add(deck)
+
+        for deck in touched:
+            deck.save_deck()
+
+        for card_id, _ in changes["removed"]:
+            self.state.graves.pop(card_id, None)
+        self.state.usn = result["until"]
+        self.state.last_sync = changes["started"]
+        self.state.url = self.url
+        self.state.save()
+
+        return {
+            "pushed": len(changes["cards"]) + len(changes["reviews"]) + len(changes["removed"]),
+            "pulled": sum(len(items) for items in pulled.values()),
+            "sent": result["sent"],
+            "received": result["received"],
+            "new_decks": new_decks,
+        }
+
+
+_shared: dict[str, SyncState] = {}
+
+
+def get_sync_state(deck_folder: str = DECK_FOLDER) -> SyncState:
+    """
+    Return the shared sync state of a deck folder, stored in SyncState.json
+    next to the deck folder.
+    """
+    key = os.path.abspath(deck_folder)
+    state = _shared.get(key)
+    if state is None:
+        state = SyncState(os.path.join(os.path.dirname(key), "SyncState.json"))
+        _shared[key] = state
+    return state
+
+
+def watch_deletions(deck_folder: str = DECK_FOLDER) -> None:
+    """
+    Record deleted cards for the next sync, once the collection was synced
+    (before the first sync the server has none of its cards).
+    """
+    state = get_sync_state(deck_folder)
+    if os.path.exists(state.path) and state.on_cards_deleted not in Deck.delete_listeners:
+        Deck.delete_listeners.append(state.on_cards_deleted)
@@ -0,0 +1,307 @@
+import os
+import json
+import zlib
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+SERVER_FILE = os.path.join(os.getcwd(), "resources", "SyncServer.json")
+
+# Changes per pushed batch and (about) per pulled page
+BATCH_SIZE = 500
+
+
+def encode_batch(payload: dict) -> bytes:
+    """Serialize a request or response body: compact JSON, zlib-compressed."""
+    return zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_batch(data: bytes) -> dict:
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+class SyncStore:
+    """
+    Server side of the collection sync.
+
+    Holds the latest version of every card, the review log of every card
+    and the deleted card ids. Each push gets the next update sequence
+    number (usn), and everything the push changed is stamped with it and
+    with the pushing client's id. A pull then returns the changes between
+    two usns that came from other clients, so a client only ever downloads
+    what changed since its last sync. Card versions are merged
+    last-writer-wins on their modification time; review logs are merged as
+    a union.
+
+    Changes are also kept in a change log in usn order, so a pull finds its
+    first change with a binary search and reads only its page; entries of
+    cards changed again later are skipped and dropped when the log is
+    compacted. Pushes are appended to a journal next to the data file
+    (path + ".journal"); the whole store is only written every
+    snapshot_every pushes, and loading replays the journal on top of it.
+    """
+
+    # Pushes between two full writes of the store
+    snapshot_every = 100
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.usn = 0
+        self.cards: dict[str, dict] = {}  # Card id -> {"data", "mod", "usn", "origin"}
+        self.reviews: dict[str, list] = {}  # Card id -> [[iso date, rating, usn, origin], ...]
+        self.graves: dict[str, dict] = {}  # Deleted card id -> {"mod", "usn", "origin"}
+        # (usn, kind, card id, review entry) in usn order; kind is "cards", "reviews" or "removed"
+        self.log: list[tuple[int, str, str, Optional[list]]] = []
+        self.journaled = 0  # Pushes in the journal since the last snapshot
+        self.lock = threading.Lock()
+        self.load()
+
+    @property
+    def journal_path(self) -> str:
+        return self.path + ".journal"
+
+    # ─── Persistence ────────────────────────────────────────────────────
+
+    def load(self) -> None:
+        if not self.path:
+            return
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Error loading sync data: {e}")
+                return
+            self.usn = data.get("usn", 0)
+            self.cards = data.get("cards", {})
+            self.reviews = data.get("reviews", {})
+            self.graves = data.get("graves", {})
+        self._rebuild_log()
+
+        if not os.path.exists(self.journal_path):
+            return
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if record["usn"] > self.usn:
+                        self._apply(record["client"], record["batch"], record["usn"])
+                        self.usn = record["usn"]
+                    self.journaled += 1
+        except (json.JSONDecodeError, KeyError) as e:
+            # A push cut off while it was written was never acknowledged: keep what was read
+            print(f"Error reading sync journal, dropping its last entry: {e}")
+            self.save()
+        except IOError as e:
+            print(f"Error loading sync journal: {e}")
+
+    def save(self) -> None:
+        """Write the whole store and start an empty journal."""
+        if not self.path:
+            return
+        data = {"usn": self.usn, "cards": self.cards, "reviews": self.reviews, "graves": self.graves}
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        except IOError as e:
+            print(f"Error saving sync data: {e}")
+            return
+        self.journaled = 0
+        self._rebuild_log()
+
+    def _record(self, usn: int, client: str, batch: dict) -> None:
+        """
+        Persist a push by appending it to the journal. Every snapshot_every
+        pushes the whole store is written instead, which also compacts the
+        change log.
+        """
+        if not self.path:
+            if usn % self.snapshot_every == 0:
+                self._rebuild_log()
+            return
+        if self.journaled + 1 >= self.snapshot_every:
+            self.save()
+            return
+        record = json.dumps({"usn": usn, "client": client, "batch": batch}, ensure_ascii=False, separators=(",", ":"))
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(record + "\n")
+        except IOError as e:
+            print(f"Error writing sync journal: {e}")
+            return
+        self.journaled += 1
+
+    def _rebuild_log(self) -> None:
+        """Build the change log from the current state, without superseded entries."""
+        log = [(entry["usn"], "cards", card_id, None) for card_id, entry in self.cards.items()]
+        log += [(entry["usn"], "removed", card_id, None) for card_id, entry in self.graves.items()]
+        log += [(review[2], "reviews", card_id, review) for card_id, reviews in self.reviews.items() for review in reviews]
+        log.sort(key=lambda item: item[0])
+        self.log = log
+
+    # ─── Sync ───────────────────────────────────────────────────────────
+
+    def push(self, client: str, batch: dict) -> int:
+        """
+        Merge a batch of changes sent by a client.
+
+        Args:
+            client (str): Id of the sending client.
+            batch (dict): "cards" (card dicts with "deck" and "mod", without history),
+                "reviews" ([card id, iso date, rating]) and "removed" ([card id, deletion time]).
+
+        Returns:
+            int: The usn of this push.
+        """
+        with self.lock:
+            usn = self.usn + 1
+            self._apply(client, batch, usn)
+            self.usn = usn
+            self._record(usn, client, batch)
+            return usn
+
+    def _apply(self, client: str, batch: dict, usn: int) -> None:
+        for data in batch.get("cards", []):
+            card_id, mod = data["id"], data.get("mod", 0)
+            current = self.cards.get(card_id)
+            grave = self.graves.get(card_id)
+            if (current is not None and current["mod"] > mod) or (grave is not None and grave["mod"] > mod):
+                continue
+            data = {k: v for k, v in data.items() if k not in ("usn", "history")}
+            self.cards[card_id] = {"data": data, "mod": mod, "usn": usn, "origin": client}
+            self.graves.pop(card_id, None)
+            self.log.append((usn, "cards", card_id, None))
+
+        known: dict[str, set] = {}  # Card id -> (date, rating) of its stored reviews
+        for card_id, when, rating in batch.get("reviews", []):
+            reviews = self.reviews.setdefault(card_id, [])
+            keys = known.get(card_id)
+            if keys is None:
+                keys = known[card_id] = {(review[0], review[1]) for review in reviews}
+            if (when, rating) not in keys:
+                keys.add((when, rating))
+                review = [when, rating, usn, client]
+                reviews.append(review)
+                self.log.append((usn, "reviews", card_id, review))
+
+        for card_id, mod in batch.get("removed", []):
+            current = self.cards.get(card_id)
+            if current is not None and current["mod"] > mod:
+                continue
+            self.cards.pop(card_id, None)
+            for review in self.reviews.pop(card_id, []):
+                review[2] = -1  # Retires its change log entry
+            known.pop(card_id, None)
+            self.graves[card_id] = {"mod": mod, "usn": usn, "origin": client}
+            self.log.append((usn, "removed", card_id, None))
+
+    def _current(self, item: tuple[int, str, str, Optional[list]]) -> Optional[tuple[str, object]]:
+        """
+        The change a log entry stands for, as (origin, payload), or None if
+        it was superseded by a later change.
+        """
+        usn, kind, card_id, review = item
+        if kind == "cards":
+            entry = self.cards.get(card_id)
+            if entry is None or entry["usn"] != usn:
+                return None
+            return entry["origin"], dict(entry["data"], usn=usn, mod=entry["mod"])
+        if kind == "removed":
+            entry = self.graves.get(card_id)
+            if entry is None or entry["usn"] != usn:
+                return None
+            return entry["origin"], [card_id, entry["mod"]]
+        if review[2] != usn:
+            return None
+        return review[3], [card_id, review[0], review[1]]
+
+    def pull(self, client: str, since: int, until: Optional[int] = None, limit: int = BATCH_SIZE) -> dict:
+        """
+        Changes made by other clients with since < usn <= until, oldest first.
+        A page holds about limit changes (whole pushes are never split); the
+        response's "usn" is where the next page starts and "more" tells
+        whether there is one.
+        """
+        with self.lock:
+            if until is None:
+                until = self.usn
+            page = {"usn": until, "until": until, "more": False, "cards": [], "reviews": [], "removed": []}
+            count, last = 0, since
+            i = bisect.bisect_right(self.log, since, key=lambda item: item[0])
+            while i < len(self.log) and self.log[i][0] <= until:
+                usn = self.log[i][0]
+                if count >= limit:
+                    page["usn"], page["more"] = last, True
+                    break
+                last = usn
+                while i < len(self.log) and self.log[i][0] == usn:
+                    change = self._current(self.log[i])
+                    if change is not None and change[0] != client:
+                        page[self.log[i][1]].append(change[1])
+                        count += 1
+                    i += 1
+        return page
+
+
+class SyncHandler(BaseHTTPRequestHandler):
+    """
+    HTTP front end of a SyncStore:
+        GET  /pull?client=ID&since=USN[&until=USN]  -> one page of changes
+        POST /push?client=ID  (body: a batch)        -> {"usn": usn of the push}
+    Request and response bodies are zlib-compressed JSON (see encode_batch).
+    """
+
+    store: SyncStore = None
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path != "/pull":
+            self.send_error(404)
+            return
+        try:
+            until = int(query["until"][0]) if "until" in query else None
+            page = self.store.pull(query["client"][0], int(query.get("since", ["0"])[0]), until)
+        except (KeyError, ValueError) as e:
+            self.send_error(400, str(e))
+            return
+        self._reply(encode_batch(page))
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path != "/push":
+            self.send_error(404)
+            return
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            usn = self.store.push(query["client"][0], decode_batch(body))
+        except (KeyError, ValueError, TypeError, zlib.error) as e:
+            self.send_error(400, str(e))
+            return
+        self._reply(encode_batch({"usn": usn}))
+
+    def _reply(self, body: bytes) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, path: Optional[str] = SERVER_FILE) -> ThreadingHTTPServer:
+    """
+    Create a sync server storing its data in path (None keeps it in memory).
+    Port 0 picks a free port (see server.server_address).
+    """
+    handler = type("BoundSyncHandler", (SyncHandler,), {"store": SyncStore(path)})
+    return ThreadingHTTPServer((host, port), handler)
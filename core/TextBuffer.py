@@ -0,0 +1,260 @@
+import bisect
+from typing import Callable, NamedTuple, Optional
+
+ORIGINAL = 0
+
+# Typed text goes into append-only chunks of about this many characters
+CHUNK_SIZE = 1024
+
+# Called with (start, old_end, new_end) after every change of the text
+ChangeListener = Callable[[int, int, int], None]
+
+
+class Edit(NamedTuple):
+    """One undoable change: `removed` at `start` was replaced by `inserted`."""
+    start: int
+    removed: str
+    inserted: str
+    caret_before: int
+    caret_after: int
+
+
+class TextBuffer:
+    """
+    Editable text stored as a piece table.
+
+    The text is a sequence of pieces pointing into the original text or
+    into append-only chunks of typed text, with the start offset of every
+    piece kept in a sorted list, so the piece holding a position is found
+    with a binary search. Typed text is appended to the last chunk until it
+    holds CHUNK_SIZE characters and a new chunk is started, so a keystroke
+    copies at most one chunk, never everything typed so far. Typing extends
+    the last piece instead of adding one, which keeps the table short.
+
+    Offsets after an edit are recomputed from the edited piece on, which is
+    linear in the number of pieces after it. Pieces only multiply with edits
+    at separate places and card texts are short, so this list is kept
+    instead of an offset tree. The buffer also tracks a caret and a selection
+    anchor, keeps an undo/redo history (consecutive typing within a word is
+    undone as one step) and tells its listeners which range changed.
+    """
+
+    def __init__(self, text: str = "") -> None:
+        self.listeners: list[ChangeListener] = []
+        self.length = 0
+        self.set_text(text)
+
+    # ─── Text ─────────────────────────────────────────────────────────────
+
+    def set_text(self, text: str) -> None:
+        """Replace the whole text and clear caret, selection and history."""
+        old_length = self.length
+        self._buffers = [text, ""]  # The original text, then chunks of typed text
+        self._pieces: list[tuple[int, int, int]] = [(ORIGINAL, 0, len(text))] if text else []
+        self._starts: list[int] = [0] if text else []
+        self.length = len(text)
+        self._text: Optional[str] = text
+
+        self.caret = len(text)
+        self.anchor: Optional[int] = None
+        self._undo: list[Edit] = []
+        self._redo: list[Edit] = []
+        self._notify(0, old_length, self.length)
+
+    def text(self) -> str:
+        if self._text is None:
+            self._text = "".join(self._buffers[src][s:s + n] for src, s, n in self._pieces)
+        return self._text
+
+    def __str__(self) -> str:
+        return self.text()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def slice(self, start: int, end: int) -> str:
+        """Return text[start:end] without joining the whole text."""
+        if self._text is not None:
+            return self._text[start:end]
+        if start >= end:
+            return ""
+        parts = []
+        i = self._find(start)
+        while i < len(self._pieces) and self._starts[i] < end:
+            src, s, n = self._pieces[i]
+            lo = max(start - self._starts[i], 0)
+            hi = min(end - self._starts[i], n)
+            parts.append(self._buffers[src][s + lo:s + hi])
+            i += 1
+        return "".join(parts)
+
+    # ─── Piece table ──────────────────────────────────────────────────────
+
+    def _find(self, pos: int) -> int:
+        """Index of the piece containing pos (len(pieces) at the end of the text)."""
+        if pos >= self.length:
+            return len(self._pieces)
+        return bisect.bisect_right(self._starts, pos) - 1
+
+    def _split(self, pos: int) -> int:
+        """Make sure a piece starts at pos and return its index."""
+        i = self._find(pos)
+        if i == len(self._pieces) or self._starts[i] == pos:
+            return i
+        src, s, n = self._pieces[i]
+        cut = pos - self._starts[i]
+        self._pieces[i:i + 1] = [(src, s, cut), (src, s + cut, n - cut)]
+        self._starts.insert(i + 1, pos)
+        return i + 1
+
+    def _reindex(self, i: int) -> None:
+        """Recompute piece start offsets from index i on."""
+        del self._starts[i:]
+        offset = 0
+        if i > 0:
+            src, s, n = self._pieces[i - 1]
+            offset = self._starts[i - 1] + n
+        for src, s, n in self._pieces[i:]:
+            self._starts.append(offset)
+            offset += n
+
+    def _replace(self, start: int, end: int, text: str) -> str:
+        removed = self.slice(start, end)
+        i = self._split(start)
+        if end > start:
+            j = self._split(end)
+            del self._pieces[i:j]
+            del self._starts[i:j]
+
+        if text:
+            last = len(self._buffers) - 1
+            chunk = self._buffers[last]
+            if len(chunk) >= CHUNK_SIZE:
+                last, chunk = last + 1, ""
+                self._buffers.append(chunk)
+            previous = self._pieces[i - 1] if i > 0 else None
+            if previous and previous[0] == last and previous[1] + previous[2] == len(chunk):
+                # Typing right after the last typed text: grow that piece
+                self._pieces[i - 1] = (last, previous[1], previous[2] + len(text))
+            else:
+                self._pieces.insert(i, (last, len(chunk), len(text)))
+                self._starts.insert(i, start)
+                i += 1
+            self._buffers[last] = chunk + text
+
+        self._reindex(max(i - 1, 0))
+        self.length += len(text) - (end - start)
+        self._text = None
+        self._notify(start, end, start + len(text))
+        return removed
+
+    def _notify(self, start: int, old_end: int, new_end: int) -> None:
+        for listener in self.listeners:
+            listener(start, old_end, new_end)
+
+    # ─── Editing ──────────────────────────────────────────────────────────
+
+    def selection(self) -> Optional[tuple[int, int]]:
+        """Return the selected (start, end) range, or None."""
+        if self.anchor is None or self.anchor == self.caret:
+            return None
+        return min(self.anchor, self.caret), max(self.anchor, self.caret)
+
+    def selected_text(self) -> str:
+        sel = self.selection()
+        return self.slice(*sel) if sel else ""
+
+    def replace(self, start: int, end: int, text: str) -> None:
+        """Replace text[start:end] with text, as one undoable step."""
+        before = self.caret
+        removed = self._replace(start, end, text)
+        self.caret = start + len(text)
+        self.anchor = None
+        self._record(Edit(start, removed, text, before, self.caret))
+
+    def insert(self, text: str) -> None:
+        """Type text at the caret, replacing the selection."""
+        start, end = self.selection() or (self.caret, self.caret)
+        self.replace(start, end, text)
+
+    def delete_backward(self) -> None:
+        sel = self.selection()
+        if sel:
+            self.replace(*sel, "")
+        elif self.caret > 0:
+            self.replace(self.caret - 1, self.caret, "")
+
+    def delete_forward(self) -> None:
+        sel = self.selection()
+        if sel:
+            self.replace(*sel, "")
+        elif self.caret < self.length:
+            self.replace(self.caret, self.caret + 1, "")
+
+    def _record(self, edit: Edit) -> None:
+        self._redo.clear()
+        if self._undo and self._can_merge(self._undo[-1], edit):
+            last = self._undo[-1]
+            if edit.inserted:
+                self._undo[-1] = last._replace(inserted=last.inserted + edit.inserted, caret_after=edit.caret_after)
+            else:
+                self._undo[-1] = last._replace(start=edit.start, removed=edit.removed + last.removed,
+                                               caret_after=edit.caret_after)
+            return
+        self._undo.append(edit)
+
+    @staticmethod
+    def _can_merge(last: Edit, edit: Edit) -> bool:
+        # Typing: plain inserts right after each other, broken up at word starts
+        if not last.removed and not edit.removed and len(edit.inserted) == 1:
+            if edit.start != last.start + len(last.inserted):
+                return False
+            return edit.inserted.isspace() or not last.inserted[-1:].isspace()
+        # Backspacing: single-character deletes ending where the last one started
+        if not last.inserted and not edit.inserted and len(edit.removed) == 1:
+            return edit.start + 1 == last.start
+        return False
+
+    def undo(self) -> bool:
+        if not self._undo:
+            return False
+        edit = self._undo.pop()
+        self._replace(edit.start, edit.start + len(edit.inserted), edit.removed)
+        self.caret, self.anchor = edit.caret_before, None
+        self._redo.append(edit)
+        return True
+
+    def redo(self) -> bool:
+        if not self._redo:
+            return False
+        edit = self._redo.pop()
+        self._replace(edit.start, edit.start + len(edit.removed), edit.inserted)
+        self.caret, self.anchor = edit.caret_after, None
+        self._undo.append(edit)
+        return True
+
+    # ─── Caret ────────────────────────────────────────────────────────────
+
+    def move_to(self, pos: int, select: bool = False) -> None:
+        """
+        Move the caret, extending the selection if select is True.
+        """
+        pos = min(max(pos, 0), self.length)
+        if select:
+            if self.anchor is None:
+                self.anchor = self.caret
+        else:
+            self.anchor = None
+        self.caret = pos
+
+    def move(self, delta: int, select: bool = False) -> None:
+        sel = self.selection()
+        if sel and not select:
+            # Collapse the selection to the side the caret moves towards
+            self.move_to(sel[0] if delta < 0 else sel[1])
+            return
+        self.move_to(self.caret + delta, select)
+
+    def select_all(self) -> None:
+        self.anchor = 0
+        self.caret = self.length
@@ -0,0 +1,317 @@
+import bisect
+from collections import OrderedDict
+from typing import Optional
+
+import pygame
+
+
+class TextLayout:
+    """
+    Line breaking for one font.
+
+    Word widths are measured once and cached. Line breaks are found by binary
+    search over the cumulative widths of a paragraph's words, so laying out a
+    paragraph costs one font.size() call per new word plus about two per line
+    (instead of one per word for every growing prefix line). Laid-out
+    paragraphs are cached, so editing a long text only re-wraps the
+    paragraph that changed, and within that paragraph the lines before the
+    edit are reused from its previous layout.
+    """
+
+    # Shared counters of the paragraph caches (shown in the profiler overlay)
+    hits = 0
+    misses = 0
+
+    def __init__(self, font: pygame.font.Font, max_paragraphs: int = 512, max_words: int = 20000) -> None:
+        self.font = font
+        self.space = font.size(" ")[0]
+        self.max_paragraphs = max_paragraphs
+        self.max_words = max_words
+        self._widths: dict[str, int] = {}
+        self._paragraphs: OrderedDict[tuple[str, int], tuple[str, ...]] = OrderedDict()
+        self._last: tuple[str, int, tuple[str, ...]] = ("", 0, ())
+
+    def word_width(self, word: str) -> int:
+        width = self._widths.get(word)
+        if width is None:
+            if len(self._widths) >= self.max_words:
+                self._widths.clear()
+            width = self.font.size(word)[0] if word else 0
+            self._widths[word] = width
+        return width
+
+    def wrap(self, text: str, max_width: int) -> list[str]:
+        """
+        Split text into lines so that each line fits within a given width.
+        A single word wider than max_width gets a line of its own.
+
+        Args:
+            text (str): Text to wrap.
+            max_width (int): Maximum allowed width in pixels.
+
+        Returns:
+            list[str]: Wrapped lines of text.
+        """
+        lines: list[str] = []
+        for paragraph in text.split("\n"):
+            lines.extend(self.wrap_paragraph(paragraph, max_width))
+        return lines
+
+    def wrap_paragraph(self, paragraph: str, max_width: int) -> tuple[str, ...]:
+        """Wrap a single line-break-free paragraph, using the paragraph cache."""
+        if not paragraph:
+            return ("",)
+
+        key = (paragraph, max_width)
+        lines = self._paragraphs.get(key)
+        if lines is not None:
+            TextLayout.hits += 1
+            self._paragraphs.move_to_end(key)
+            return lines
+
+        TextLayout.misses += 1
+        lines = self._relayout(paragraph, max_width)
+        self._last = (paragraph, max_width, lines)
+        self._paragraphs[key] = lines
+        if len(self._paragraphs) > self.max_paragraphs:
+            self._paragraphs.popitem(last=False)
+        return lines
+
+    def _relayout(self, paragraph: str, max_width: int) -> tuple[str, ...]:
+        """
+        Break a paragraph, reusing the leading lines of the previously broken
+        one (usually the same paragraph before the last keystroke).
+        """
+        previous, previous_width, previous_lines = self._last
+        if previous_width != max_width or len(previous_lines) < 3:
+            return self._break_lines(paragraph, max_width)
+
+        common = common_prefix_length(previous, paragraph)
+
+        # A line is still valid if the line after it (and the space ending it)
+        # lies completely inside the unchanged prefix.
+        kept = 0
+        starts = [0]
+        for line in previous_lines:
+            starts.append(starts[-1] + len(line) + 1)
+        while kept + 2 < len(starts) and starts[kept + 2] <= common:
+            kept += 1
+        if kept == 0:
+            return self._break_lines(paragraph, max_width)
+
+        offset = starts[kept]
+        return previous_lines[:kept] + self._break_lines(paragraph[offset:], max_width)
+
+    def _break_lines(self, paragraph: str, max_width: int) -> tuple[str, ...]:
+        words = paragraph.split(" ")
+        space = self.space
+
+        # offsets[k]: width of words[:k], each followed by a space
+        offsets = [0]
+        total = 0
+        for word in words:
+            total += self.word_width(word) + space
+            offsets.append(total)
+
+        lines = []
+        start = 0
+        n = len(words)
+        while start < n:
+            # Last word index whose line words[start:end] still fits
+            end = bisect.bisect_right(offsets, offsets[start] + max_width + space, start + 1) - 1
+            end = max(end, start + 1)
+
+            # Summed word widths ignore kerning and glyph overhang; confirm the
+            # estimate against real line measurements and nudge it if needed
+            line = " ".join(words[start:end])
+            if self.font.size(line)[0] > max_width:
+                while end > start + 1:
+                    end -= 1
+                    line = " ".join(words[start:end])
+                    if self.font.size(line)[0] <= max_width:
+                        break
+            else:
+                while end < n:
+                    longer = f"{line} {words[end]}"
+                    if self.font.size(longer)[0] > max_width:
+                        break
+                    line = longer
+                    end += 1
+
+            lines.append(line)
+            start = end
+        return tuple(lines)
+
+    def clear(self) -> None:
+        self._widths.clear()
+        self._paragraphs.clear()
+
+
+def common_prefix_length(a: str, b: str) -> int:
+    """Length of the common prefix of two strings, by binary search over slice comparisons."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+_layouts: OrderedDict[int, TextLayout] = OrderedDict()
+
+
+def get_layout(font: pygame.font.Font, max_fonts: int = 16) -> TextLayout:
+    """
+    Return the shared TextLayout of a font. Only the most recently used
+    fonts keep their layout (and a reference to the font).
+    """
+    key = id(font)
+    layout = _layouts.get(key)
+    if layout is not None and layout.font is font:
+        _layouts.move_to_end(key)
+        return layout
+
+    layout = TextLayout(font)
+    _layouts[key] = layout
+    if len(_layouts) > max_fonts:
+        _layouts.popitem(last=False)
+    return layout
+
+
+class WrappedText:
+    """
+    Wrapped and rendered lines of a TextBuffer.
+
+    Subscribes to the buffer's change notifications and re-wraps (and later
+    re-renders) only the paragraphs an edit touched; all other paragraphs
+    keep their lines and rendered surfaces. Also maps between text offsets
+    and line/pixel positions for the caret.
+    """
+
+    def __init__(self, buffer, layout: TextLayout, max_width: int, color: tuple[int, int, int] = (20, 20, 20)) -> None:
+        self.buffer = buffer
+        self.layout = layout
+        self.font = layout.font
+        self.max_width = max_width
+        self.color = color
+        self.line_height = self.font.get_height()
+
+        self._paragraphs: list[tuple[str, ...]] = []
+        self._par_starts: list[int] = []
+        self._surfaces: list[list[Optional[pygame.Surface]]] = []
+        self._lines: Optional[list[str]] = None
+        self._line_starts: list[int] = []
+        self._line_refs: list[tuple[int, int]] = []
+
+        self.on_change(0, 0, len(buffer))
+        buffer.listeners.append(self.on_change)
+
+    def on_change(self, start: int, old_end: int, new_end: int) -> None:
+        """
+        Re-wrap the paragraphs overlapping the changed range.
+
+        Args:
+            start (int): Start of the change.
+            old_end (int): End of the replaced range before the change.
+            new_end (int): End of the inserted text after the change.
+        """
+        if not self._paragraphs:
+            first, last = 0, 0
+            region_start, region_end = 0, len(self.buffer)
+        else:
+            first = bisect.bisect_right(self._par_starts, start) - 1
+            last = bisect.bisect_right(self._par_starts, old_end) - 1
+            old_last_end = self._par_starts[last] + self._paragraph_length(last)
+            region_start = self._par_starts[first]
+            region_end = old_last_end + (new_end - old_end)
+            last += 1
+
+        paragraphs = self.buffer.slice(region_start, region_end).split("\n")
+        self._paragraphs[first:last] = [self.layout.wrap_paragraph(p, self.max_width) for p in paragraphs]
+        self._surfaces[first:last] = [[None] * len(lines) for lines in self._paragraphs[first:first + len(paragraphs)]]
+
+        del self._par_starts[first:]
+        offset = region_start
+        for lines in self._paragraphs[first:]:
+            self._par_starts.append(offset)
+            offset += self._joined_length(lines) + 1
+        self._lines = None
+
+    @staticmethod
+    def _joined_length(lines: tuple[str, ...]) -> int:
+        # Wrapped lines drop exactly one space at every break
+        return sum(len(line) for line in lines) + len(lines) - 1
+
+    def _paragraph_length(self, index: int) -> int:
+        return self._joined_length(self._paragraphs[index])
+
+    def _flatten(self) -> None:
+        self._lines = []
+        self._line_starts = []
+        self._line_refs = []
+        for p, (lines, start) in enumerate(zip(self._paragraphs, self._par_starts)):
+            for i, line in enumerate(lines):
+                self._lines.append(line)
+                self._line_starts.append(start)
+                self._line_refs.append((p, i))
+                start += len(line) + 1
+
+    @property
+    def lines(self) -> list[str]:
+        if self._lines is None:
+            self._flatten()
+        return self._lines
+
+    @property
+    def height(self) -> int:
+        return len(self.lines) * self.line_height
+
+    def render(self, index: int) -> pygame.Surface:
+        """Rendered surface of a line, cached until its paragraph changes."""
+        self.lines
+        p, i = self._line_refs[index]
+        surface = self._surfaces[p][i]
+        if surface is None:
+            surface = self.font.render(self._lines[index], True, self.color)
+            self._surfaces[p][i] = surface
+        return surface
+
+    def line_of(self, pos: int) -> int:
+        self.lines
+        return max(bisect.bisect_right(self._line_starts, pos) - 1, 0)
+
+    def line_start(self, index: int) -> int:
+        self.lines
+        return self._line_starts[index]
+
+    def locate(self, pos: int) -> tuple[int, int]:
+        """
+        Returns:
+            tuple[int, int]: Line index and x offset in pixels of a text position.
+        """
+        index = self.line_of(pos)
+        column = min(pos - self._line_starts[index], len(self._lines[index]))
+        return index, self.font.size(self._lines[index][:column])[0]
+
+    def position_at(self, index: int, x: int) -> int:
+        """
+        Text position closest to pixel offset x on the given line.
+        """
+        lines = self.lines
+        index = min(max(index, 0), len(lines) - 1)
+        line = lines[index]
+        lo, hi = 0, len(line)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.font.size(line[:mid + 1])[0] <= x:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(line):
+            left = self.font.size(line[:lo])[0]
+            right = self.font.size(line[:lo + 1])[0]
+            if x - left > right - x:
+                lo += 1
+        return self._line_starts[index] + lo
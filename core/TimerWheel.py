@@ -0,0 +1,106 @@
+from typing import Any, Optional
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel holding items until their due time.
+
+    Time is split into ticks of slot_ms; an item goes into the slot of its
+    due tick modulo the number of slots, so scheduling is O(1) and advancing
+    the clock only visits the slots of the ticks that passed (at most one
+    full turn) instead of every waiting item. Items due more than one turn
+    ahead share slots with nearer ones and are left in place until their
+    own turn comes. Times are plain milliseconds from any monotonic clock
+    (e.g. pygame.time.get_ticks).
+    """
+
+    def __init__(self, slot_ms: int = 1000, slots: int = 256, now: int = 0) -> None:
+        self.slot_ms = slot_ms
+        self.slots = slots
+        self._wheel: list[list[tuple[int, Any]]] = [[] for _ in range(slots)]
+        self._tick = now // slot_ms
+        self._count = 0
+        self._next: Optional[int] = None  # Cached earliest due time, None = unknown or empty
+
+    def __len__(self) -> int:
+        return self._count
+
+    def schedule(self, item: Any, due: int) -> int:
+        """
+        Hold item until the clock reaches due (in ms). Overdue items are
+        released by the next advance().
+
+        Returns:
+            int: Slot of the item, for remove().
+        """
+        tick = max(due // self.slot_ms, self._tick)
+        slot = tick % self.slots
+        self._wheel[slot].append((due, item))
+        self._count += 1
+        if self._next is not None and due < self._next:
+            self._next = due
+        elif self._count == 1:
+            self._next = due
+        return slot
+
+    def remove(self, item: Any, slot: int) -> bool:
+        """
+        Take a waiting item out of the wheel.
+
+        Returns:
+            bool: False if the item was not waiting in that slot.
+        """
+        bucket = self._wheel[slot]
+        for i, (_, waiting) in enumerate(bucket):
+            if waiting is item:
+                del bucket[i]
+                self._count -= 1
+                self._next = None
+                return True
+        return False
+
+    def advance(self, now: int) -> list[Any]:
+        """
+        Move the clock to now and return the items that became due, earliest first.
+        """
+        target = now // self.slot_ms
+        last = min(target, self._tick + self.slots - 1)
+        expired: list[tuple[int, Any]] = []
+        for tick in range(self._tick, last + 1):
+            index = tick % self.slots
+            bucket = self._wheel[index]
+            if not bucket:
+                continue
+            keep = []
+            for entry in bucket:
+                (expired if entry[0] <= now else keep).append(entry)
+            self._wheel[index] = keep
+        self._tick = target
+
+        if expired:
+            self._count -= len(expired)
+            self._next = None
+            expired.sort(key=lambda entry: entry[0])
+        return [item for _, item in expired]
+
+    def next_due(self) -> Optional[int]:
+        """
+        Due time of the earliest waiting item, or None if the wheel is empty.
+        Scans forward from the current tick to the first slot holding an item
+        of the current turn; the result is cached until it can change.
+        """
+        if self._count == 0:
+            return None
+        if self._next is not None:
+            return self._next
+
+        for offset in range(self.slots):
+            tick = self._tick + offset
+            due_here = [due for due, _ in self._wheel[tick % self.slots] if due // self.slot_ms <= tick]
+            if due_here:
+                self._next = min(due_here)
+                return self._next
+
+        # Everything is more than a full turn ahead
+        self._next = min(due for bucket in self._wheel for due, _ in bucket)
+        return self._next
@@ -0,0 +1,119 @@
+import threading
+from typing import Iterable, Optional
+
+from core.Card import Card
+
+
+class TrigramIndex:
+    """
+    Inverted trigram index over the front and back text of a deck's cards.
+    Supports incremental add/remove and substring queries answered by
+    intersecting posting lists and verifying the (few) candidates.
+    All operations are thread-safe, so queries can run on a search worker.
+    """
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        self._postings: dict[str, set[str]] = {}
+        self._cards: dict[str, Card] = {}
+        self._texts: dict[str, tuple[str, str]] = {}
+        self._order: dict[str, int] = {}
+        self._seq = 0
+        self._lock = threading.RLock()
+
+        for card in cards:
+            self.add(card)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    @staticmethod
+    def _key(card: Card) -> str:
+        return card.id
+
+    @staticmethod
+    def trigrams(text: str) -> set[str]:
+        """Return the set of 3-character substrings of the given text."""
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, card: Card) -> None:
+        """Index a card's current front and back text."""
+        key = self._key(card)
+        front, back = card.front.lower(), card.back.lower()
+        with self._lock:
+            if key in self._cards:
+                self.remove(card)
+
+            self._cards[key] = card
+            self._texts[key] = (front, back)
+            self._order[key] = self._seq
+            self._seq += 1
+
+            for gram in self.trigrams(front) | self.trigrams(back):
+                self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, card: Card) -> None:
+        """Drop a card from the index (no-op if it is not indexed)."""
+        key = self._key(card)
+        with self._lock:
+            texts = self._texts.pop(key, None)
+            if texts is None:
+                return
+            del self._cards[key]
+            del self._order[key]
+
+            front, back = texts
+            for gram in self.trigrams(front) | self.trigrams(back):
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard(key)
+                    if not posting:
+                        del self._postings[gram]
+
+    def update(self, card: Card) -> None:
+        """Re-index a card after its text was edited."""
+        with self._lock:
+            self.remove(card)
+            self.add(card)
+
+    def matches(self, card: Card, term: str) -> bool:
+        """Check a single indexed card against an already lowercased term."""
+        texts = self._texts.get(self._key(card))
+        return texts is not None and (term in texts[0] or term in texts[1])
+
+    def search(self, term: str, within: Optional[Iterable[Card]] = None) -> list[Card]:
+        """
+        Return the cards whose front or back contains the term (case-insensitive),
+        in the order they were indexed.
+
+        Args:
+            term (str): Phrase to look for.
+            within (Iterable[Card], optional): Restrict the search to these cards,
+                e.g. the results of a shorter query this one extends.
+        """
+        term = term.lower()
+        with self._lock:
+            return self._search(term, within)
+
+    def _search(self, term: str, within: Optional[Iterable[Card]]) -> list[Card]:
+        if within is not None:
+            candidates = [self._key(c) for c in within]
+        elif len(term) < 3:
+            candidates = list(self._cards)
+        else:
+            postings = [self._postings.get(g) for g in self.trigrams(term)]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            hits = set(postings[0])
+            for posting in postings[1:]:
+                hits &= posting
+                if not hits:
+                    return []
+            candidates = hits
+
+        found = [
+            k for k in candidates
+            if k in self._texts and (term in self._texts[k][0] or term in self._texts[k][1])
+        ]
+        found.sort(key=self._order.__getitem__)
+        return [self._cards[k] for k in found]
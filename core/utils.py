@@ -1,5 +1,8 @@
 import pygame
 
+from core.Profiler import timed
+from core.TextLayout import get_layout
+
 def point_in_polygon(point, polygon):
     """
     Determine if a point is inside a polygon using the ray casting algorithm.
@@ -25,81 +28,42 @@ def point_in_polygon(point, polygon):
     return inside
 
 
-def wrap_text(text: str, font: pygame.font.Font, max_width: int) -> list[str]:
-    """
-    Split text into lines so that each line fits within a given width.
-
-    Args:
-        text (str): Text to wrap.
-        font (pygame.font.Font): Font used to measure text.
-        max_width (int): Maximum allowed width in pixels.
-
-    Returns:
-        list[str]: Wrapped lines of text.
-    """
-    lines: list[str] = []
-    for paragraph in text.split("\n"):
-        if not paragraph:
-            lines.append("")
-            continue
-
-        words = paragraph.split(" ")
-        line = words[0]
-
-        for word in words[1:]:
-            test_line = f"{line} {word}"
-            if font.size(test_line)[0] <= max_width:
-                line = test_line
-            else:
-                lines.append(line)
-                line = word
-        lines.append(line)
-
-    return lines
-
-
-def draw_wrapped_text_centered(
-    surface: pygame.Surface,
+@timed()
+def render_wrapped_text_centered(
     text: str,
     font: pygame.font.Font,
-    rect: pygame.Rect,
-    scroll: int,
+    size: tuple[int, int],
     color: tuple[int, int, int]
-) -> None:
+) -> tuple[pygame.Surface, int]:
     """
-    Draw wrapped text centered within a rectangle and apply vertical scrolling.
+    Render wrapped, centered text once into a transparent surface. Lines are
+    wrapped by the font's shared TextLayout, so repeated calls only re-wrap
+    changed paragraphs.
 
     Args:
-        surface (pygame.Surface): Target surface to draw on.
         text (str): Text content to render.
         font (pygame.font.Font): Font used to render the text.
-        rect (pygame.Rect): Area within which to draw the text.
-        scroll (int): Vertical scroll offset in pixels.
+        size (tuple[int, int]): Width and height of the text area.
         color (tuple[int, int, int]): Text color as an RGB tuple.
 
     Returns:
-        None
+        tuple[pygame.Surface, int]: The rendered text block and its vertical offset within the area.
     """
-    prev_clip = surface.get_clip()
-    surface.set_clip(rect)
-
-    lines = wrap_text(text, font, rect.width)
+    width, height = size
+    lines = get_layout(font).wrap(text, width)
     line_height = font.get_height()
     total_height = line_height * len(lines)
 
-    y_start = rect.y + max((rect.height - total_height) // 2, 0) - scroll
-    y = y_start
+    y_start = max((height - total_height) // 2, 0)
+    block = pygame.Surface((width, max(min(total_height, height - y_start), 1)), pygame.SRCALPHA)
 
+    y = 0
     for line in lines:
-        if y + line_height < rect.y:
-            y += line_height
-            continue
-        if y > rect.y + rect.height:
+        if y_start + y > height:
             break
-
         rendered = font.render(line, True, color)
-        x = rect.x + (rect.width - rendered.get_width()) // 2
-        surface.blit(rendered, (x, y))
+        # Lines never overlap, so copy their pixels instead of blending onto transparency
+        block.blit(rendered, ((width - rendered.get_width()) // 2, y), special_flags=pygame.BLEND_RGBA_MAX)
         y += line_height
 
-    surface.set_clip(prev_clip)
+    return block, y_start
@@ -1,8 +1,150 @@
-from FlashcardApp import FlashcardApp
+import os
+import argparse
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Flashcard app")
+    parser.add_argument("--import", dest="import_file", metavar="FILE",
+                        help="import cards from a CSV/TSV/text file or an Anki .apkg package and exit")
+    parser.add_argument("--export", dest="export_file", metavar="FILE",
+                        help="export cards to .csv, .tsv, .jsonl or a .zip archive and exit")
+    parser.add_argument("--backup", choices=["incremental", "full"],
+                        help="back up the collection to resources/Backups and exit")
+    parser.add_argument("--shard", type=int, metavar="CARDS",
+                        help="store --deck as a directory of shards with up to CARDS cards each and exit")
+    parser.add_argument("--sync", metavar="URL",
+                        help="sync the collection with a sync server (e.g. http://127.0.0.1:8765) and exit")
+    parser.add_argument("--sync-server", type=int, metavar="PORT",
+                        help="run a local sync server on PORT (data in resources/SyncServer.json)")
+    parser.add_argument("--profile", action="store_true",
+                        help="record frame timings from startup (F3 shows the overlay, F4 dumps them)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="trace allocations: print diffs at every screen change and per-object sizes on exit")
+    parser.add_argument("--deck", help="deck to import into or export (default: file name / all decks)")
+    return parser.parse_args()
+
+
+def run_import(path, deck_name=None):
+    import pygame
+    from core.Deck import Deck
+    from core.Importer import import_file
+    from core.AnkiImporter import import_apkg
+    from core.Storage import SHARD_SUFFIX, is_sharded
+
+    pygame.font.init()
+    folder = os.path.join(os.getcwd(), "resources", "Decks")
+    if path.lower().endswith(".apkg"):
+        for name, added in import_apkg(path, folder).items():
+            print(f"Imported {added} cards into '{name}'")
+        return
+
+    name = deck_name or os.path.splitext(os.path.basename(path))[0]
+    deck_path = os.path.join(folder, f"{name}.json")
+    if is_sharded(os.path.join(folder, name + SHARD_SUFFIX)):
+        deck_path = os.path.join(folder, name + SHARD_SUFFIX)
+    deck = Deck(name, deck_path)
+    added = import_file(path, deck)
+    print(f"Imported {added} cards into '{name}'")
+
+
+def run_export(path=None, deck_name=None, backup=None):
+    import pygame
+    from core.Exporter import BackupManager, export_decks, iter_decks
+
+    pygame.font.init()
+    folder = os.path.join(os.getcwd(), "resources", "Decks")
+    decks = iter_decks(folder)
+    if deck_name:
+        decks = (d for d in decks if d.name == deck_name)
+
+    if backup:
+        archive = BackupManager().backup(decks, incremental=backup == "incremental", complete=not deck_name)
+        print(f"Backup written to {archive}" if archive else "Nothing changed since the last backup")
+    else:
+        count = export_decks(decks, path)
+        print(f"Exported {count} {'decks' if path.lower().endswith('.zip') else 'cards'} to {path}")
+
+
+def run_shard(deck_name, shard_size):
+    import pygame
+    from core.Exporter import iter_decks
+
+    pygame.font.init()
+    folder = os.path.join(os.getcwd(), "resources", "Decks")
+    for deck in iter_decks(folder):
+        if deck.name == deck_name:
+            if deck.storage is not None:
+                print(f"'{deck_name}' is already sharded")
+                return
+            deck.use_shards(shard_size)
+            print(f"Stored {len(deck.cards)} cards of '{deck_name}' in {deck.file_path}")
+            return
+    print(f"Deck '{deck_name}' not found")
+
+
+def run_sync(url):
+    import pygame
+    from core.Exporter import iter_decks
+    from core.Sync import SyncClient, get_sync_state, watch_deletions
+
+    pygame.font.init()
+    folder = os.path.join(os.getcwd(), "resources", "Decks")
+    decks = list(iter_decks(folder))
+    try:
+        summary = SyncClient(url, get_sync_state(folder)).sync(decks, folder)
+    except OSError as e:
+        print(f"Error syncing with {url}: {e}")
+        return
+    watch_deletions(folder)
+    print(f"Sent {summary['pushed']} changes ({summary['sent']} bytes), "
+          f"received {summary['pulled']} ({summary['received']} bytes)")
+    for deck in summary["new_decks"]:
+        print(f"New deck '{deck.name}'")
+
+
+def run_sync_server(port):
+    from core.SyncServer import make_server
+
+    server = make_server(port=port)
+    print(f"Sync server listening on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
 
 def main():
-    app = FlashcardApp()
+    args = parse_args()
+    if args.sync_server is not None:
+        run_sync_server(args.sync_server)
+        return
+    if args.sync:
+        run_sync(args.sync)
+        return
+    if args.shard:
+        if not args.deck:
+            print("--shard needs --deck")
+            return
+        run_shard(args.deck, args.shard)
+        return
+    if args.import_file:
+        run_import(args.import_file, args.deck)
+        return
+    if args.export_file or args.backup:
+        run_export(args.export_file, args.deck, args.backup)
+        return
+
+    memory_profiler = None
+    if args.profile_memory:
+        from core.MemoryProfiler import MemoryProfiler
+        memory_profiler = MemoryProfiler()
+        memory_profiler.start()
+
+    from FlashcardApp import FlashcardApp
+    app = FlashcardApp(profile=args.profile, memory_profiler=memory_profiler)
     app.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
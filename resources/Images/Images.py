@@ -1,14 +1,149 @@
-import os, pygame
-IMAGES = {}
+import os
+import threading
+import pygame
 
-def load_images():
+IMAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ImageRegistry:
     """
-    Load all .png images from /Images into a dictionary
+    Lazy registry of the .png images in /Images.
+
+    Images are looked up like a dictionary (IMAGES["MAIN_MENU"]) but are only
+    loaded and converted on first access. A background thread can pre-warm
+    images for the next likely state, and scaled copies are cached per size.
+    Lookups of both count towards hits and misses.
     """
-    global IMAGES
-    image_dir = os.path.join(os.getcwd(), 'resources\\Images')
-    for file in os.listdir(image_dir):
-        if file.endswith('.png'):
-            key = file[:-4].upper()
-            IMAGES[key] = pygame.image.load(os.path.join(image_dir, file)).convert_alpha()
 
+    def __init__(self, directory: str = IMAGE_DIR) -> None:
+        self.directory = directory
+        self._paths: dict[str, str] = {}
+        self._surfaces: dict[str, pygame.Surface] = {}
+        self._decoded: dict[str, pygame.Surface] = {}
+        self._scaled: dict[tuple[str, tuple[int, int]], pygame.Surface] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def scan(self) -> None:
+        """
+        Index the image folder without decoding any file.
+        """
+        self._paths.clear()
+        for file in os.listdir(self.directory):
+            if file.endswith('.png'):
+                self._paths[file[:-4].upper()] = os.path.join(self.directory, file)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._paths
+
+    def __getitem__(self, key: str) -> pygame.Surface:
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        return self._load(key)
+
+    def _load(self, key: str) -> pygame.Surface:
+        """Return the converted surface of an image, loading it if needed."""
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            return surface
+        if key not in self._paths:
+            raise KeyError(key)
+
+        with self._lock:
+            raw = self._decoded.pop(key, None)
+        if raw is None:
+            raw = pygame.image.load(self._paths[key])
+
+        # Conversion needs the display, so it always happens on the main thread.
+        surface = raw.convert_alpha()
+        self._surfaces[key] = surface
+        return surface
+
+    def keys(self) -> list[str]:
+        return list(self._paths)
+
+    def cached(self) -> list[tuple[str, pygame.Surface]]:
+        """
+        Return every converted and scaled surface currently held in memory.
+        """
+        surfaces = list(self._surfaces.items())
+        surfaces += [
+            (f"{key}@{size[0]}x{size[1]}", s) for (key, size), s in self._scaled.items()
+            if s is not self._surfaces.get(key)
+        ]
+        return surfaces
+
+    def get_scaled(self, key: str, size: tuple[int, int]) -> pygame.Surface:
+        """
+        Return the image scaled to the given size, cached per (key, size).
+        """
+        cache_key = (key, tuple(size))
+        scaled = self._scaled.get(cache_key)
+        if scaled is not None:
+            self.hits += 1
+            return scaled
+
+        self.misses += 1
+        surface = self._load(key)
+        if surface.get_size() != cache_key[1]:
+            surface = pygame.transform.smoothscale(surface, cache_key[1])
+        self._scaled[cache_key] = surface
+        return surface
+
+    def prewarm(self, keys: list[str]) -> threading.Thread | None:
+        """
+        Decode the given images on a background thread so that the
+        first access only has to convert them.
+
+        Returns:
+            threading.Thread or None: The started thread, or None if there was nothing to load.
+        """
+        with self._lock:
+            pending = [
+                k for k in keys
+                if k in self._paths and k not in self._surfaces and k not in self._decoded
+            ]
+        if not pending:
+            return None
+
+        def worker():
+            for key in pending:
+                try:
+                    raw = pygame.image.load(self._paths[key])
+                except (pygame.error, OSError) as e:
+                    print(f"Error while pre-loading image {key}: {e}")
+                    continue
+                with self._lock:
+                    if key not in self._surfaces:
+                        self._decoded[key] = raw
+
+        thread = threading.Thread(target=worker, name="image-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def clear(self) -> None:
+        """
+        Drop all loaded and cached surfaces (the folder index is kept).
+        """
+        with self._lock:
+            self._decoded.clear()
+        self._surfaces.clear()
+        self._scaled.clear()
+
+
+IMAGES = ImageRegistry()
+
+
+def load_images():
+    """
+    Index all .png images from /Images. The images themselves are loaded on first use.
+    """
+    IMAGES.scan()
+    if not IMAGES.keys():
+        raise FileNotFoundError(f"No images found in {IMAGES.directory}")
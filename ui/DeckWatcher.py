@@ -0,0 +1,114 @@
+import os
+import threading
+import pygame
+from typing import Optional
+
+from core.Settings import DECK_WATCH_INTERVAL_MS
+from core.Storage import file_version
+
+# Posted with: folder, added, removed and modified (lists of deck paths)
+DECKS_CHANGED = pygame.event.custom_type()
+
+
+class DeckWatcher:
+    """
+    Watches a deck folder for decks added, removed or changed by other programs.
+
+    A background thread lists the folder every interval and compares the
+    version (modification time and size) of every deck file and sharded
+    deck directory with the previous listing, so a poll costs one scandir
+    plus a stat per deck and never reads deck contents. A change is only
+    reported once the deck's version stayed the same for a whole interval,
+    so half-written files are not picked up. Changes are posted back to the
+    main loop as a DECKS_CHANGED event; the app's own saves show up there
+    too and are told apart by the version each deck recorded when saving.
+    """
+
+    def __init__(self, folder: str, interval_ms: int = DECK_WATCH_INTERVAL_MS) -> None:
+        self.folder = os.path.abspath(folder)
+        self.interval = interval_ms / 1000
+        self._versions = self.scan() or {}  # Reported version of every deck
+        self._seen = dict(self._versions)  # Versions found by the previous poll
+        self._stop = threading.Event()
+
+        self._thread = threading.Thread(target=self._run, name="deck-watcher", daemon=True)
+        self._thread.start()
+
+    def scan(self) -> Optional[dict[str, tuple[int, int]]]:
+        """
+        Returns:
+            dict[str, tuple[int, int]]: Deck path -> version, or None if the folder can't be listed.
+        """
+        versions = {}
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        stat = entry.stat()
+                        versions[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                    elif entry.is_dir():
+                        version = file_version(entry.path)
+                        if version is not None:
+                            versions[entry.path] = version
+        except OSError as e:
+            print(f"Error watching deck folder {self.folder}: {e}")
+            return None
+        return versions
+
+    def poll(self) -> Optional[tuple[list[str], list[str], list[str]]]:
+        """
+        Compare the folder with the last reported state.
+
+        Returns:
+            tuple[list[str], list[str], list[str]]: Added, removed and modified
+            deck paths whose change has settled, or None if there are none.
+        """
+        current = self.scan()
+        if current is None:
+            return None
+
+        added, removed, modified = [], [], []
+        for path in self._versions.keys() | current.keys():
+            old, new = self._versions.get(path), current.get(path)
+            if new == old or self._seen.get(path) != new:
+                continue
+            if old is None:
+                added.append(path)
+            elif new is None:
+                removed.append(path)
+            else:
+                modified.append(path)
+            if new is None:
+                del self._versions[path]
+            else:
+                self._versions[path] = new
+        self._seen = current
+
+        if added or removed or modified:
+            return added, removed, modified
+        return None
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            changes = self.poll()
+            if changes is not None:
+                added, removed, modified = changes
+                pygame.event.post(pygame.event.Event(
+                    DECKS_CHANGED, folder=self.folder, added=added, removed=removed, modified=modified
+                ))
+
+
+_shared: dict[str, DeckWatcher] = {}
+
+
+def get_deck_watcher(folder: str) -> DeckWatcher:
+    """Return the watcher of a deck folder, starting it on first use."""
+    key = os.path.abspath(folder)
+    watcher = _shared.get(key)
+    if watcher is None:
+        watcher = DeckWatcher(key)
+        _shared[key] = watcher
+    return watcher
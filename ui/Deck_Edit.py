@@ -2,7 +2,9 @@ import pygame
 from core.Card import Card
 from resources.Images.Images import IMAGES
 from core.Settings import *
-from core.utils import wrap_text
+from core.TextBuffer import TextBuffer
+from core.TextLayout import TextLayout, WrappedText
+from ui.SearchWorker import get_search_worker
 
 class DeckEdit:
     """
@@ -12,14 +14,18 @@ class DeckEdit:
 
     def __init__(self, deck, panel_width=372, panel_margin=93):
         self.deck = deck
-        self.cards_filtered = list(deck.cards)
-        self.selected_index = None
+        self.cards_filtered = [c for _, _, c in deck.cards]
+        self._last_term = ""
+        self.search_worker = get_search_worker()
+        deck.build_search_index()  # On the main thread, before the worker reads it
+        self.selected_id = None  # Id of the card open in the editor
         self.scroll_offset = 0
         self.max_scroll = 0
 
         self.title_font = pygame.font.Font(font_path, 36)
         self.search_font = pygame.font.Font(font_path, 24)
         self.card_font = pygame.font.Font(font_path, 24)
+        self.card_layout = TextLayout(self.card_font)
 
         self.search_text = ""
         self.searching = False
@@ -62,8 +68,11 @@ class DeckEdit:
         self.save_changes_rect = pygame.rect.Rect(742, 597, 160, 42)
         self.create_card_rect = pygame.rect.Rect(622, 597, 220, 53)
 
-        self.text_front = ""
-        self.text_back = ""
+        # Card text editors: piece-table buffers with incrementally wrapped views
+        self.front_buffer = TextBuffer()
+        self.back_buffer = TextBuffer()
+        self.front_view = WrappedText(self.front_buffer, self.card_layout, self.front_input_rect.width)
+        self.back_view = WrappedText(self.back_buffer, self.card_layout, self.back_input_rect.width)
         self.cursor_front_visible = False
         self.cursor_back_visible = False
 
@@ -71,6 +80,22 @@ class DeckEdit:
         self.text_title = deck.name
         self.title_input_rect = None
 
+    @property
+    def text_front(self) -> str:
+        return self.front_buffer.text()
+
+    @text_front.setter
+    def text_front(self, value: str) -> None:
+        self.front_buffer.set_text(value)
+
+    @property
+    def text_back(self) -> str:
+        return self.back_buffer.text()
+
+    @text_back.setter
+    def text_back(self, value: str) -> None:
+        self.back_buffer.set_text(value)
+
     def draw(self, screen: pygame.Surface) -> None:
         """
         Renders the current state of the deck editor to the screen,
@@ -81,30 +106,34 @@ class DeckEdit:
             self._draw_text_only(
                 screen,
                 self.front_input_rect,
-                self.text_front + ('|' if self.cursor_front_visible else ''),
-                scroll=self.front_scroll
+                self.front_view,
+                scroll=self.front_scroll,
+                caret=self.cursor_front_visible
             )
             self._draw_text_only(
                 screen,
                 self.back_input_rect,
-                self.text_back + ('|' if self.cursor_back_visible else ''),
-                scroll=self.back_scroll
+                self.back_view,
+                scroll=self.back_scroll,
+                caret=self.cursor_back_visible
             )
 
         elif self.editing_card:
             screen.blit(IMAGES["DECK_SAVE"], (0, 0))
-            if self.selected_index is not None:
+            if self.selected_id is not None:
                 self._draw_text_only(
                     screen,
                     self.front_input_rect,
-                    self.text_front + ('|' if self.cursor_front_visible else ''),
-                    scroll=self.front_scroll
+                    self.front_view,
+                    scroll=self.front_scroll,
+                    caret=self.cursor_front_visible
                 )
                 self._draw_text_only(
                     screen,
                     self.back_input_rect,
-                    self.text_back + ('|' if self.cursor_back_visible else ''),
-                    scroll=self.back_scroll
+                    self.back_view,
+                    scroll=self.back_scroll,
+                    caret=self.cursor_back_visible
                 )
 
         else:
@@ -172,36 +201,74 @@ class DeckEdit:
             elif event.unicode.isprintable() and len(self.search_text) < 25:
                 self.search_text += event.unicode
 
-            term = self.search_text.lower()
-            self.cards_filtered = [c for c in self.deck.cards if term in c.front.lower()]
-            self.scroll_offset = 0
-            self.selected_index = None
+            self._submit_search()
 
         # Editing front text
         elif self.clicked_front:
-            self._ensure_caret_visible(self.text_front, self.front_input_rect, 'front_scroll')
-
-            if event.key == pygame.K_BACKSPACE:
-                self.text_front = self.text_front[:-1]
-            elif event.key == pygame.K_RETURN:
-                self.text_front += "\n"
-            elif event.unicode.isprintable():
-                self.text_front += event.unicode
+            self._edit_text(event, self.front_buffer, self.front_view)
+            self._ensure_caret_visible(self.front_buffer, self.front_view, self.front_input_rect, 'front_scroll')
 
         # Editing back text
         elif self.clicked_back:
-            self._ensure_caret_visible(self.text_back, self.back_input_rect, 'back_scroll')
-
-            if event.key == pygame.K_BACKSPACE:
-                self.text_back = self.text_back[:-1]
-            elif event.key == pygame.K_RETURN:
-                self.text_back += "\n"
-            elif event.unicode.isprintable():
-                self.text_back += event.unicode
+            self._edit_text(event, self.back_buffer, self.back_view)
+            self._ensure_caret_visible(self.back_buffer, self.back_view, self.back_input_rect, 'back_scroll')
 
         self.cursor_visible = True
         self.cursor_timer = 0
 
+    @staticmethod
+    def _edit_text(event: pygame.event.Event, buffer: TextBuffer, view: WrappedText) -> None:
+        """
+        Apply a key press to a card text buffer: caret movement (shift extends
+        the selection), deletion, typing, ctrl+z / ctrl+y (or ctrl+shift+z)
+        for undo / redo and ctrl+a to select everything.
+        """
+        ctrl = event.mod & pygame.KMOD_CTRL
+        shift = bool(event.mod & pygame.KMOD_SHIFT)
+
+        if ctrl and event.key == pygame.K_z:
+            buffer.redo() if shift else buffer.undo()
+        elif ctrl and event.key == pygame.K_y:
+            buffer.redo()
+        elif ctrl and event.key == pygame.K_a:
+            buffer.select_all()
+        elif event.key == pygame.K_LEFT:
+            buffer.move(-1, shift)
+        elif event.key == pygame.K_RIGHT:
+            buffer.move(1, shift)
+        elif event.key in (pygame.K_UP, pygame.K_DOWN):
+            line, x = view.locate(buffer.caret)
+            target = line - 1 if event.key == pygame.K_UP else line + 1
+            if target < 0:
+                buffer.move_to(0, shift)
+            elif target >= len(view.lines):
+                buffer.move_to(len(buffer), shift)
+            else:
+                buffer.move_to(view.position_at(target, x), shift)
+        elif event.key in (pygame.K_HOME, pygame.K_END):
+            line = view.line_of(buffer.caret)
+            start = view.line_start(line)
+            buffer.move_to(start if event.key == pygame.K_HOME else start + len(view.lines[line]), shift)
+        elif event.key == pygame.K_BACKSPACE:
+            buffer.delete_backward()
+        elif event.key == pygame.K_DELETE:
+            buffer.delete_forward()
+        elif event.key == pygame.K_RETURN:
+            buffer.insert("\n")
+        elif event.unicode and event.unicode.isprintable() and not ctrl:
+            buffer.insert(event.unicode)
+
+    def _place_caret(self, buffer: TextBuffer, view: WrappedText, rect: pygame.Rect,
+                     scroll: int, pos: tuple[int, int]) -> None:
+        """
+        Move a buffer's caret to the text position under a mouse click.
+        """
+        line = (pos[1] - rect.y + scroll) // view.line_height
+        if line >= len(view.lines):
+            buffer.move_to(len(buffer))
+        else:
+            buffer.move_to(view.position_at(line, pos[0] - rect.x))
+
     def update_cursor(self, dt: int) -> None:
         """
         Updates cursor blink visibility based on elapsed time.
@@ -240,7 +307,7 @@ class DeckEdit:
         # Search bar
         if self.search_rect.collidepoint(pos):
             self.searching = True
-            self.selected_index = None
+            self.selected_id = None
             self.adding_card = self.editing_card = False
             self.clicked_front = self.clicked_back = False
             return 'search', None
@@ -248,7 +315,7 @@ class DeckEdit:
         # "+" icon to add a card
         if not (self.adding_card or self.editing_card) and self.deck_edit_plus_rect.collidepoint(pos):
             self.adding_card = True
-            self.selected_index = None
+            self.selected_id = None
             self.clicked_front = self.clicked_back = False
             self.text_front = self.text_back = ""
             return
@@ -263,17 +330,19 @@ class DeckEdit:
                 new_card = Card(self.text_front, self.text_back)
                 self.deck.add_card(new_card)
                 self.adding_card = False
-                self.cards_filtered = list(self.deck.cards)
+                self._refresh_cards()
 
         # Front/back field clicks
         if self.editing_card or self.adding_card:
             if self.front_input_rect.collidepoint(pos):
                 self.clicked_front, self.clicked_back = True, False
+                self._place_caret(self.front_buffer, self.front_view, self.front_input_rect, self.front_scroll, pos)
                 self.cursor_front_visible = True
                 self.searching = False
                 return 'edit_front', None
             if self.back_input_rect.collidepoint(pos):
                 self.clicked_front, self.clicked_back = False, True
+                self._place_caret(self.back_buffer, self.back_view, self.back_input_rect, self.back_scroll, pos)
                 self.cursor_back_visible = True
                 self.searching = False
                 return 'edit_back', None
@@ -285,21 +354,17 @@ class DeckEdit:
                 self.clicked_front = self.clicked_back = False
                 return
             if self.delete_card_rect.collidepoint(pos):
-                self.deck.delete_card(self.selected_index)
-                self.cards_filtered = list(self.deck.cards)
-                self.selected_index = None
+                if self.selected_id in self.deck.card_map:
+                    self.deck.delete_card(self.selected_id)
+                self._refresh_cards()
+                self.selected_id = None
                 self.editing_card = False
                 self.clicked_front = self.clicked_back = False
                 return
             if self.save_changes_rect.collidepoint(pos):
-                c = self.deck.cards[self.selected_index]
-                c[2].front = self.text_front
-                c[2].back = self.text_back
-                if self.searching:
-                    term = self.search_text.lower()
-                    self.cards_filtered = [c for c in self.deck.cards if term in c[2].front.lower()]
-                else:
-                    self.cards_filtered = list(self.deck.cards)
+                if self.selected_id in self.deck.card_map:
+                    self.deck.edit_card(self.selected_id, self.text_front, self.text_back)
+                self._refresh_cards()
                 self.editing_card = False
                 self.clicked_front = self.clicked_back = False
                 return
@@ -308,22 +373,59 @@ class DeckEdit:
         for i, r in enumerate(self.card_rects):
             if r.collidepoint(pos):
                 self.searching = False
-                self.selected_index = i
+                self.selected_id = self.cards_filtered[i].id
                 self.editing_card = True
                 self.adding_card = False
-                self.text_front = self.deck.cards[i][2].front
-                self.text_back = self.deck.cards[i][2].back
+                self.text_front = self.cards_filtered[i].front
+                self.text_back = self.cards_filtered[i].back
                 self.clicked_front = self.clicked_back = False
                 return 'card', i
 
         # Click outside panel
         if not self.left_rect.collidepoint(pos):
             self.searching = False
-            self.selected_index = None
+            self.selected_id = None
             self.clicked_front = self.clicked_back = False
 
         return None
 
+    def _search(self, term: str, previous: list[Card], last_term: str) -> list[Card]:
+        """
+        Filter the deck's cards through its trigram index.
+        If the new term extends the previous one, only the previous results are re-checked.
+        """
+        if not term:
+            return [c for _, _, c in self.deck.cards]
+        if last_term and last_term in term:
+            return self.deck.search_index.search(term, within=previous)
+        return self.deck.search_index.search(term)
+
+    def _submit_search(self) -> None:
+        """
+        Run the current search on the search worker; the list keeps showing
+        the last results until the new ones arrive.
+        """
+        term = self.search_text.lower()
+        previous, last_term = list(self.cards_filtered), self._last_term
+        self.search_worker.submit(self, lambda: [(term, self._search(term, previous, last_term))])
+
+    def apply_search_results(self, event: pygame.event.Event) -> None:
+        """
+        Show the results of the latest search posted by the search worker.
+        """
+        if event.results is None or not self.search_worker.is_current(event, self):
+            return
+        self._last_term, self.cards_filtered = event.results
+        self.scroll_offset = 0
+
+    def _refresh_cards(self) -> None:
+        """
+        Rebuild the card list right away after the deck itself changed.
+        """
+        self.search_worker.cancel()
+        self._last_term = self.search_text.lower()
+        self.cards_filtered = self._search(self._last_term, [], "")
+
     def _draw_left(self, screen: pygame.Surface) -> None:
         """
         Draws the left-side panel with deck title, search bar,
@@ -387,13 +489,13 @@ class DeckEdit:
 
         y = self.scroll_offset
         for i, card in enumerate(self.cards_filtered):
-            selected = (i == self.selected_index)
+            selected = card.id == self.selected_id
             bg_color = (219, 161, 156) if selected else (255, 221, 210)
 
             entry_rect = pygame.Rect(0, y, list_rect.width, entry_height - 4)
             pygame.draw.rect(view, bg_color, entry_rect, border_radius=4)
 
-            text_surface = self.card_font.render(card[2].front, True, (20, 20, 20))
+            text_surface = self.card_font.render(card.front, True, (20, 20, 20))
             view.blit(text_surface, (8, y + 4))
 
             self.card_rects.append(pygame.Rect(
@@ -407,37 +509,51 @@ class DeckEdit:
 
         screen.blit(view, list_rect.topleft)
 
-    def _draw_text_only(self, screen, rect: pygame.Rect, text: str, scroll: int) -> None:
+    def _draw_text_only(self, screen, rect: pygame.Rect, view: WrappedText, scroll: int, caret: bool) -> None:
         """
-        Renders multi-line text inside a given rectangle with scroll offset.
+        Renders a card text field inside a given rectangle with scroll offset,
+        its selection and (if visible) its caret. Lines are blitted from the
+        view's cache; only lines of edited paragraphs get rendered again.
         """
         prev_clip = screen.get_clip()
         screen.set_clip(rect)
 
-        lines = wrap_text(text, self.card_font, rect.width)
-        line_h = self.card_font.get_height()
-        y0 = rect.y - scroll
+        buffer = view.buffer
+        line_h = view.line_height
+        selection = buffer.selection()
 
-        for ln in lines:
-            if y0 + line_h < rect.y:
-                y0 += line_h
-                continue
+        # Skip straight to the first visible line
+        first = max(scroll // line_h, 0)
+        y0 = rect.y - scroll + first * line_h
+
+        for i in range(first, len(view.lines)):
             if y0 > rect.y + rect.height:
                 break
-            surf = self.card_font.render(ln, True, (20, 20, 20))
-            screen.blit(surf, (rect.x, y0))
+            if selection:
+                start = view.line_start(i)
+                end = start + len(view.lines[i])
+                lo, hi = max(selection[0], start), min(selection[1], end)
+                if lo < hi or (selection[0] <= end < selection[1]):
+                    line = view.lines[i]
+                    x0 = self.card_font.size(line[:lo - start])[0]
+                    x1 = self.card_font.size(line[:hi - start])[0] if lo < hi else x0 + 6
+                    pygame.draw.rect(screen, (245, 190, 210), (rect.x + x0, y0, max(x1 - x0, 6), line_h))
+            screen.blit(view.render(i), (rect.x, y0))
             y0 += line_h
 
+        if caret:
+            line, x = view.locate(buffer.caret)
+            y = rect.y - scroll + line * line_h
+            pygame.draw.line(screen, (20, 20, 20), (rect.x + x, y + 3), (rect.x + x, y + line_h - 3), 2)
+
         screen.set_clip(prev_clip)
 
-    def _ensure_caret_visible(self, text: str, rect: pygame.Rect, scroll_attr: str) -> None:
+    def _ensure_caret_visible(self, buffer: TextBuffer, view: WrappedText, rect: pygame.Rect, scroll_attr: str) -> None:
         """
-        Adjusts scroll to ensure the caret (last line) is visible within the text area.
+        Adjusts scroll to ensure the caret line is visible within the text area.
         """
-        lines = wrap_text(text, self.card_font, rect.width)
-        line_h = self.card_font.get_height()
-        caret_line = len(lines) - 1
-        caret_y = caret_line * line_h
+        line_h = view.line_height
+        caret_y = view.line_of(buffer.caret) * line_h
 
         scroll = getattr(self, scroll_attr)
         if caret_y - scroll > rect.height - line_h:
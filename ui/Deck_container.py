@@ -1,9 +1,20 @@
 import os
 import json
+import shutil
+import bisect
 import datetime
+import itertools
+from collections import ChainMap
 import pygame
 
 from core.Deck import Deck
+from core.FileLock import lock_path
+from core.Storage import file_version, is_sharded
+from core.FullTextSearch import get_collection_index
+from core.Sync import SyncClient, get_sync_state, watch_deletions
+from ui.SearchWorker import get_search_worker
+from ui.DeckWatcher import get_deck_watcher
+from ui.SyncWorker import start_sync
 from ui.Buttons import search_bar_rect, add_deck_rect
 from core.Settings import *
 
@@ -23,11 +34,25 @@ class DeckContainer:
         "Last practised (newest)"
     ]
 
-    def __init__(self):
+    # Folder used when no deck folder is passed in
+    default_folder = os.path.join(os.getcwd(), "resources", "Decks")
+
+    # Sort option -> (pre-sorted index, descending)
+    sort_modes = [
+        ("name", False),
+        ("name", True),
+        ("date", False),
+        ("date", True),
+        ("last_practised", False),
+        ("last_practised", True)
+    ]
+
+    def __init__(self, folder=None):
         # Fonts
         self.font = pygame.font.Font(font_path, 40)
         self.search_font = pygame.font.Font(font_path, 50)
         self.sort_font = pygame.font.Font(font_path, 30)
+        self.hits_font = pygame.font.Font(font_path, 22)
 
         # UI positions and rectangles
         self.rect = pygame.Rect(161, 85, 678, 444)
@@ -48,9 +73,16 @@ class DeckContainer:
 
         # Deck data
         self.decks = []
+        self.card_map = ChainMap()  # Card id -> card over every deck's own card_map
         self.filtered_decks = []
+        self.visible_decks = None  # Set of decks matching the search, None = all
+
+        # Decks kept sorted by every sort key as (key, seq, deck) entries
+        self.sorted_decks = {key: [] for key, _ in self.sort_modes}
+        self._sort_entries = {}
+        self._seq = itertools.count()
         self.deck_count = 0
-        self.folder = os.path.join(os.getcwd(), "resources", "Decks")
+        self.folder = folder or self.default_folder
         self.all_cards = []
 
         # Scroll
@@ -72,6 +104,19 @@ class DeckContainer:
         self.cursor_visible = False
         self.cursor_timer = 0
 
+        # Card content search across the whole collection
+        self.search_index = get_collection_index(self.folder)
+        self.search_worker = get_search_worker()
+        self.card_hits = {}
+        self._pending_decks = None
+
+        # Changes made to the deck folder by other programs
+        self.deck_watcher = get_deck_watcher(self.folder)
+
+        # Sync with the server set up by main.py --sync
+        self.syncing = False
+        watch_deletions(self.folder)
+
         # Load decks from disk
         self.load_all_decks()
 
@@ -101,6 +146,11 @@ class DeckContainer:
                 continue
             deck.draw(self.viewport, x, y, width=deck_width, height=deck_height)
 
+            hits = self.card_hits.get(deck.file_path)
+            if hits and not deck.side:
+                label = self.hits_font.render(f"{len(hits)} matching cards", True, (120, 40, 80))
+                self.viewport.blit(label, label.get_rect(midbottom=(x + deck_width // 2, y + deck_height - 8)))
+
         # Draw search text with optional blinking cursor
         display_text = self.search_text
         if self.searching and self.cursor_visible:
@@ -193,15 +243,64 @@ class DeckContainer:
 
     def handle_search(self, phrase):
         """
-        Filter the decks based on a search phrase and apply current sorting.
+        Start filtering the decks by a search phrase on the search worker.
+        The current results stay on screen until the new ones arrive.
         """
 
-        self.searched_phrase = phrase.lower()
-        self.filtered_decks = [
-            deck for deck in self.decks if self.searched_phrase in deck.name.lower()
-        ]
-        self.order_by()
-        self.scroll_offset = 0
+        decks = list(self.decks)
+        index = self.search_index
+
+        def job():
+            term = phrase.lower()
+            yield ("names", term, [d for d in decks if term in d.name.lower()])
+            if phrase.strip():
+                by_key = {os.path.basename(d.file_path): d for d in decks}
+                for batch in index.search_iter(phrase):
+                    deck = by_key.get(batch[0].deck_key)
+                    if deck is not None:
+                        yield ("cards", deck, batch)
+
+        self.search_worker.submit(self, job)
+
+    def apply_search_results(self, event):
+        """
+        Merge a batch of results posted by the search worker.
+        Decks containing matching cards are added as the index finds them.
+        """
+
+        if not self.search_worker.is_current(event, self):
+            return
+
+        if event.results is not None:
+            kind, key, value = event.results
+            if kind == "names":
+                self.searched_phrase = key
+                self._pending_decks = set(value)
+                self.card_hits = {}
+            elif self._pending_decks is not None:
+                self.card_hits[key.file_path] = value
+                self._pending_decks.add(key)
+            else:
+                self.card_hits[key.file_path] = value
+                if key not in self.visible_decks:
+                    self.visible_decks.add(key)
+                    self.order_by()
+
+        # Swap in the new list once the name matches and a first card batch
+        # (or the end of the query) arrived, to avoid flicker on every keystroke
+        if self._pending_decks is not None and (event.done or event.results[0] == "cards"):
+            self.visible_decks = self._pending_decks
+            self._pending_decks = None
+            self.order_by()
+            self.scroll_offset = 0
+
+    def _cancel_search(self):
+        """
+        Drop an in-flight search whose results would no longer match the deck list.
+        """
+
+        self.search_worker.cancel()
+        self._pending_decks = None
 
     def update_cursor(self, dt):
         """
@@ -234,52 +333,105 @@ class DeckContainer:
 
     def order_by(self):
         """
-        Sort the filtered deck list based on the current sorting mode.
-        Sorting is controlled by self.order.
+        Rebuild the filtered deck list for the current sorting mode.
+        Decks are kept pre-sorted, so this is a stable filter over the
+        sorted sequence for self.order.
+        """
+
+        key, descending = self.sort_modes[self.order]
+        entries = self.sorted_decks[key]
+        ordered = (deck for _, _, deck in (reversed(entries) if descending else entries))
+        if self.visible_decks is None:
+            self.filtered_decks = list(ordered)
+        else:
+            self.filtered_decks = [d for d in ordered if d in self.visible_decks]
+
+    @staticmethod
+    def sort_keys(deck):
+        """
+        Return the value of every sort key for a deck.
         """
 
-        key_map = {
-            0: lambda d: d.name.lower(),
-            1: lambda d: d.name.lower(),
-            2: lambda d: d.date,
-            3: lambda d: d.date,
-            4: lambda d: d.last_practised or datetime.datetime.min,
-            5: lambda d: d.last_practised or datetime.datetime.min
+        return {
+            "name": deck.name.lower(),
+            "date": deck.date,
+            "last_practised": deck.last_practised or datetime.datetime.min
         }
-        reverse_map = {1, 3, 5}
-        self.filtered_decks = sorted(
-            self.filtered_decks,
-            key=key_map.get(self.order, lambda d: d.name),
-            reverse=self.order in reverse_map
-        )
+
+    def _index_deck(self, deck):
+        """
+        Insert a deck into every pre-sorted index.
+        """
+
+        seq = next(self._seq)
+        entries = {}
+        for key, value in self.sort_keys(deck).items():
+            entry = (value, seq, deck)
+            bisect.insort(self.sorted_decks[key], entry, key=lambda e: e[:2])
+            entries[key] = entry
+        self._sort_entries[deck] = entries
+
+    def _unindex_deck(self, deck):
+        """
+        Remove a deck from every pre-sorted index.
+        """
+
+        for key, entry in self._sort_entries.pop(deck, {}).items():
+            entries = self.sorted_decks[key]
+            i = bisect.bisect_left(entries, entry[:2], key=lambda e: e[:2])
+            if i < len(entries) and entries[i][2] is deck:
+                entries.pop(i)
+
+    def reindex_deck(self, deck):
+        """
+        Move a deck whose name, date or last practised time changed
+        to its new place in the sorted indexes (call order_by() afterwards).
+        """
+
+        self._unindex_deck(deck)
+        self._index_deck(deck)
 
     def load_all_decks(self):
         """
-        Load all decks from JSON files in the deck folder.
-        Updates the internal deck list and filtered list.
+        Load all decks from JSON files and sharded deck directories in the
+        deck folder. Updates the internal deck list and filtered list.
         """
 
         for filename in os.listdir(self.folder):
-            if filename.endswith(".json"):
-                path = os.path.join(self.folder, filename)
+            path = os.path.join(self.folder, filename)
+            if filename.endswith(".json") or is_sharded(path):
                 name = os.path.splitext(filename)[0]
-                deck = Deck(name, path)
-                self.decks.append(deck)
-                self.deck_count += 1
-        self.filtered_decks = self.decks.copy()
+                self._insert_deck(Deck(name, path))
+        self.order_by()
+        self.search_index.sync(self.decks)
 
     def delete_deck(self, name):
         """
         Delete a deck by name from memory and from disk.
         """
 
+        self._cancel_search()
+        removed = [d for d in self.decks if d.name == name]
+        for deck in removed:
+            cards = [card for _, _, card in deck.cards]
+            for listener in Deck.delete_listeners:
+                listener(deck, cards)
+            self._unindex_deck(deck)
+            if self.visible_decks is not None:
+                self.visible_decks.discard(deck)
         self.decks = [d for d in self.decks if d.name != name]
-        self.filtered_decks = [d for d in self.filtered_decks if d.name != name]
+        self.card_map = ChainMap(*(d.card_map for d in self.decks))
         self.deck_count = len(self.decks)
 
-        file_path = os.path.join(self.folder, f"{name}.json")
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        paths = [d.file_path for d in removed] or [os.path.join(self.folder, f"{name}.json")]
+        for file_path in paths:
+            if os.path.isdir(file_path):
+                shutil.rmtree(file_path)
+            elif os.path.exists(file_path):
+                os.remove(file_path)
+            if os.path.exists(lock_path(file_path)):
+                os.remove(lock_path(file_path))
+            self.search_index.remove_deck(os.path.basename(file_path))
 
         self.scroll_offset = 0
         self.order_by()
@@ -297,13 +449,131 @@ class DeckContainer:
         with open(file_path, "w", encoding="utf-8") as f:
             json.dump({"cards": []}, f, indent=4)
 
+        self._cancel_search()
         new_deck = Deck(name, file_path)
-        self.decks.append(new_deck)
-        self.filtered_decks.append(new_deck)
-        self.deck_count += 1
+        self._insert_deck(new_deck)
+        if self.visible_decks is not None:
+            self.visible_decks.add(new_deck)
         self.order_by()
         print(f"Added deck: {name}")
 
+    def _insert_deck(self, deck):
+        """
+        Add a loaded deck to the deck list, the card map and the sorted indexes.
+        Cards whose id another deck already uses get a new id, so every card
+        id names one card across the collection.
+        """
+
+        taken = set()
+        for other in self.decks:
+            taken |= deck.card_map.keys() & other.card_map.keys()
+        if taken:
+            for card_id in taken:
+                deck.renumber_card(deck.card_map[card_id])
+            deck.save_deck()
+
+        self.decks.append(deck)
+        self.card_map.maps.append(deck.card_map)
+        self._index_deck(deck)
+        self.deck_count += 1
+
+    def apply_deck_changes(self, event):
+        """
+        Bring the deck list up to date with decks added, removed or changed
+        on disk by other programs, as posted by the deck watcher. Only the
+        changed decks are loaded again; the app's own saves are recognised
+        by the file version the deck recorded and skipped.
+        """
+
+        if event.folder != os.path.abspath(self.folder):
+            return
+
+        by_path = {os.path.abspath(d.file_path): d for d in self.decks}
+        changed = False
+        for path in event.removed:
+            deck = by_path.get(path)
+            if deck is not None and file_version(path) is None:
+                self._unindex_deck(deck)
+                if self.visible_decks is not None:
+                    self.visible_decks.discard(deck)
+                self.decks.remove(deck)
+                self.card_map = ChainMap(*(d.card_map for d in self.decks))
+                self.deck_count = len(self.decks)
+                self.search_index.remove_deck(deck)
+                changed = True
+
+        for path in event.added + event.modified:
+            deck = by_path.get(path)
+            if deck is None:
+                if file_version(path) is not None:
+                    deck = Deck(os.path.splitext(os.path.basename(path))[0], path)
+                    self._insert_deck(deck)
+                    self.search_index.update_deck(deck)
+                    changed = True
+            elif deck.changed_on_disk():
+                deck.reload()
+                self.reindex_deck(deck)
+                self.search_index.update_deck(deck)
+                changed = True
+
+        if not changed:
+            return
+        self._cancel_search()
+        if self.visible_decks is not None:
+            self.handle_search(self.search_text)
+        self.order_by()
+
+    def start_sync(self):
+        """
+        Sync the collection with the sync server. The local changes are
+        collected now; the exchange with the server runs in the background.
+        """
+
+        state = get_sync_state(self.folder)
+        if self.syncing:
+            return
+        if not state.url:
+            print("No sync server set up, run: python main.py --sync URL")
+            return
+        client = SyncClient(state.url, state)
+        self.syncing = True
+        start_sync(self, client, client.collect(self.decks))
+
+    def apply_sync_result(self, event):
+        """
+        Merge the changes pulled by a finished sync into the decks.
+        """
+
+        if event.owner != id(self):
+            return
+        self.syncing = False
+        if event.error is not None:
+            print(f"Error syncing: {event.error}")
+            return
+
+        self._cancel_search()
+        summary = event.client.apply(self.decks, event.changes, event.result, self.folder)
+        watch_deletions(self.folder)
+        for deck in summary["new_decks"]:
+            self._insert_deck(deck)
+        if self.visible_decks is not None:
+            self.handle_search(self.search_text)
+        self.order_by()
+        print(f"Synced: {summary['pushed']} changes sent, {summary['pulled']} received "
+              f"({summary['sent'] + summary['received']} bytes)")
+
+    def get_card(self, card_id: str):
+        """
+        Return the card with the given id from any deck, or None.
+        """
+        return self.card_map.get(card_id)
+
+    def deck_of(self, card_id: str):
+        """
+        Return the deck holding the card with the given id, or None.
+        """
+        return next((deck for deck in self.decks if card_id in deck.card_map), None)
+
     def name_available(self, name: str) -> bool:
         """
         Check if a given deck name is available (case-insensitive, trimmed).
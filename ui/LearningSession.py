@@ -1,16 +1,31 @@
+import os
+import heapq
 import pygame
+from typing import Optional
 from resources.Images.Images import IMAGES
 from core.Subdeck import Subdeck
+from core.StudyPlan import get_study_plan
 from core.Enums import Rating
 from core.Scheduler import Scheduler
 from core.Settings import *
-from core.utils import draw_wrapped_text_centered
+from core.utils import render_wrapped_text_centered
+
+# One-shot timer event posted when the next waiting learning card is due
+CARD_DUE = pygame.event.custom_type()
 
 
 class LearningSession:
     """
     Handles the logic and UI for a single learning session using a Subdeck.
     Displays cards, tracks progress, and processes user input.
+
+    Cards in a learning step wait in the subdeck's timer wheel (driven by
+    pygame.time.get_ticks) until they are due. A one-shot CARD_DUE timer is
+    armed for the earliest of them, so nothing is polled per frame; while
+    only waiting cards are left, a countdown is shown instead of a card.
+
+    Ctrl+Z / Ctrl+Y undo and redo ratings (see Subdeck.undo). Decks are
+    saved once a rating leaves the undo window and when the session closes.
     """
 
     repeat_rect = pygame.Rect(105, 586, 180, 48)
@@ -25,9 +40,13 @@ class LearningSession:
         (easy_rect, Rating.EASY),
     ]
 
+    # Number of upcoming cards whose text is rendered ahead of time
+    prefetch_count = 2
+
     def __init__(self, deck) -> None:
         self.deck = deck  # Can be a Deck or a DeckContainer
-        self.subdeck = Subdeck(self.deck, 20)
+        folder = getattr(deck, "folder", None) or os.path.dirname(deck.file_path)
+        self.subdeck = Subdeck(self.deck, 20, plan=get_study_plan(folder), clock=pygame.time.get_ticks)
         self.current_card = self.subdeck.current_card
         self.side = 0  # 0 = front, 1 = back
         self.card_rect = pygame.Rect(164, 117, 673, 436)
@@ -36,9 +55,18 @@ class LearningSession:
         self.finish = self.current_card is None
         self.scheduler = Scheduler()
 
+        # Card id -> (front, back, front block, back block), see prefetch()
+        self.rendered: dict[str, tuple] = {}
+
+        # Tick at which the next waiting card is due, and the rendered countdown
+        self.next_due_at: Optional[int] = None
+        self._countdown: tuple[str, Optional[pygame.Surface]] = ("", None)
+
     def handle_click(self, event: pygame.event.Event) -> None:
         """Process mouse click events (flip card or submit rating)."""
         pos = event.pos
+        if self.current_card is None:
+            return
 
         if self.card_rect.collidepoint(pos):
             self.side = not self.side
@@ -50,24 +78,113 @@ class LearningSession:
                     self.subdeck.modify_card(rating)
                     self.current_card = self.subdeck.get_next_card()
                     self.side = 0
-                    self.subdeck.save_deck()
+                    if self.subdeck.pending_save:
+                        self.subdeck.save_deck()
+                    self._arm_timer()
 
-                    if not self.current_card:
+                    if not self.current_card and not self.subdeck.has_cards():
                         self.finish = True
                     return
 
+    def handle_key(self, event: pygame.event.Event) -> None:
+        """Ctrl+Z undoes the last rating, Ctrl+Y (or Ctrl+Shift+Z) redoes it."""
+        if not event.mod & pygame.KMOD_CTRL:
+            return
+        if event.key == pygame.K_z and not event.mod & pygame.KMOD_SHIFT:
+            card = self.subdeck.undo()
+            if card is None:
+                return
+            # Show the answer again so the card can be re-rated right away
+            self.current_card, self.side = card, 1
+        elif event.key in (pygame.K_y, pygame.K_z):
+            if self.subdeck.redo() is None:
+                return
+            self.current_card, self.side = self.subdeck.current_card, 0
+        else:
+            return
+        self.finish = self.current_card is None and not self.subdeck.has_cards()
+        self._arm_timer()
+
+    def close(self) -> None:
+        """End the session: commit the undoable ratings and save."""
+        pygame.time.set_timer(CARD_DUE, 0)
+        self.subdeck.commit_all()
+        self.subdeck.save_deck()
+
+    def _arm_timer(self) -> None:
+        """(Re)start the one-shot CARD_DUE timer for the earliest waiting card."""
+        delay = self.subdeck.next_due_in()
+        if delay is None:
+            pygame.time.set_timer(CARD_DUE, 0)
+            self.next_due_at = None
+        else:
+            pygame.time.set_timer(CARD_DUE, max(delay, 1), loops=1)
+            self.next_due_at = pygame.time.get_ticks() + delay
+
+    def on_card_due(self) -> None:
+        """CARD_DUE handler: queue the learning cards that became due."""
+        if self.subdeck.release_due() and self.current_card is None:
+            self.current_card = self.subdeck.get_next_card()
+            self.side = 0
+        self._arm_timer()
+
+    def _render_side(self, text: str) -> tuple[pygame.Surface, int]:
+        return render_wrapped_text_centered(text, self.card_font, self.card_rect.size, (20, 20, 20))
+
+    def rendered_card(self, card) -> tuple[tuple[pygame.Surface, int], tuple[pygame.Surface, int]]:
+        """
+        Return the rendered front and back text of a card, rendering them now
+        if they were not prefetched (or the card text changed since).
+        """
+        entry = self.rendered.get(card.id)
+        if entry is None or entry[0] != card.front or entry[1] != card.back:
+            entry = (card.front, card.back, self._render_side(card.front), self._render_side(card.back))
+            self.rendered[card.id] = entry
+        return entry[2], entry[3]
+
+    def upcoming_cards(self) -> list:
+        """The current card and the next cards in the subdeck queue."""
+        return [card for _, _, card in heapq.nsmallest(self.prefetch_count + 1, self.subdeck.cards)]
+
+    def prefetch(self) -> None:
+        """
+        Render the text of one upcoming card that is not cached yet; called
+        once per frame so showing the next card or flipping is only a blit.
+        Cards that left the queue are dropped from the cache.
+        """
+        if self.finish:
+            return
+        upcoming = self.upcoming_cards()
+        keep = {card.id for card in upcoming}
+        for key in [k for k in self.rendered if k not in keep]:
+            del self.rendered[key]
+
+        for card in upcoming:
+            entry = self.rendered.get(card.id)
+            if entry is None or entry[0] != card.front or entry[1] != card.back:
+                self.rendered_card(card)
+                return
+
+    def _draw_countdown(self, screen: pygame.Surface) -> None:
+        """Shown while only cards in a learning step are left."""
+        screen.blit(IMAGES["CARD_FRONT"], (0, 0))
+        seconds = max(((self.next_due_at or 0) - pygame.time.get_ticks() + 999) // 1000, 0)
+        text = f"Next card in {seconds // 60}:{seconds % 60:02d}"
+        if text != self._countdown[0]:
+            self._countdown = (text, self.card_font.render(text, True, (20, 20, 20)))
+        surface = self._countdown[1]
+        screen.blit(surface, surface.get_rect(center=self.card_rect.center))
+
     def draw(self, screen: pygame.Surface) -> None:
         """Draw the current card side (front/back) and text."""
-        if not self.finish:
+        if not self.finish and self.current_card is None:
+            self._draw_countdown(screen)
+        elif not self.finish:
             image = IMAGES["CARD_BACK"] if self.side else IMAGES["CARD_FRONT"]
             screen.blit(image, (0, 0))
 
-            text = self.current_card.back if self.side else self.current_card.front
-            draw_wrapped_text_centered(
-                surface=screen,
-                text=text,
-                font=self.card_font,
-                rect=self.card_rect,
-                scroll=self.scroll_offset,
-                color=(20, 20, 20),
-            )
\ No newline at end of file
+            block, y = self.rendered_card(self.current_card)[self.side]
+            prev_clip = screen.get_clip()
+            screen.set_clip(self.card_rect)
+            screen.blit(block, (self.card_rect.x, self.card_rect.y + y - self.scroll_offset))
+            screen.set_clip(prev_clip)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import pygame
+
+from core.Profiler import PROFILER
+
+
+class ProfilerOverlay:
+    """
+    Debug overlay showing frame time, the slowest profiled sections and
+    cache hit rates. F3 toggles it (and the profiler), F4 dumps the sample
+    buffer to resources/Profiles.
+    """
+
+    toggle_key = pygame.K_F3
+    dump_key = pygame.K_F4
+
+    def __init__(self, frames: int = 30, rows: int = 6, keep_recording: bool = False) -> None:
+        self.frames = frames
+        self.rows = rows
+        self.visible = False
+        # Keep the profiler running while the overlay is hidden (main.py --profile)
+        self.keep_recording = keep_recording
+        PROFILER.enabled = keep_recording
+        self.font = pygame.font.Font(None, 20)
+        self.line_height = self.font.get_linesize()
+
+    def handle_input(self, event) -> bool:
+        """
+        Handle the overlay's hotkeys.
+
+        Returns:
+            bool: True if the event was consumed.
+        """
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == self.toggle_key:
+            self.visible = not self.visible
+            PROFILER.enabled = self.visible or self.keep_recording
+            return True
+        if event.key == self.dump_key:
+            try:
+                print(f"Profile written to {PROFILER.dump()}")
+            except IOError as e:
+                print(f"Error writing profile: {e}")
+            return True
+        return False
+
+    def lines(self) -> list[str]:
+        summary = PROFILER.summary(self.frames)
+        frame = summary.pop("frame", None)
+
+        lines = []
+        if frame:
+            fps = 1000 / frame["mean_ms"] if frame["mean_ms"] else 0
+            lines.append(f"frame {frame['mean_ms']:.1f} ms avg, {frame['max_ms']:.1f} ms max ({fps:.0f} fps busy)")
+        else:
+            lines.append("frame -")
+
+        slowest = sorted(summary.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        for name, stats in slowest[:self.rows]:
+            lines.append(f"{name}: {stats['mean_ms']:.2f} ms x{stats['count']} (max {stats['max_ms']:.1f})")
+
+        for name, (hits, misses, rate) in PROFILER.hit_rates().items():
+            lines.append(f"{name} cache: {rate:.0%} of {hits + misses}")
+        return lines
+
+    def draw(self, screen: pygame.Surface) -> None:
+        if not self.visible:
+            return
+
+        lines = self.lines()
+        rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(s.get_width() for s in rendered) + 16
+        height = self.line_height * len(rendered) + 12
+
+        background = pygame.Surface((width, height), pygame.SRCALPHA)
+        background.fill((0, 0, 0, 170))
+        screen.blit(background, (8, 8))
+
+        y = 14
+        for surface in rendered:
+            screen.blit(surface, (16, y))
+            y += self.line_height
@@ -0,0 +1,104 @@
+import time
+import threading
+import pygame
+from typing import Callable, Iterable, Optional
+
+from core.Settings import SEARCH_DEBOUNCE_MS
+
+# Posted with: owner, generation, results (a batch or None) and done (bool)
+SEARCH_RESULTS = pygame.event.custom_type()
+
+
+class SearchWorker:
+    """
+    Runs search queries on a background thread so typing never blocks rendering.
+
+    Only the latest submitted query is kept: a new submission cancels the
+    in-flight one. Queries are debounced, and each batch of results is posted
+    back to the main loop as a SEARCH_RESULTS event.
+    """
+
+    def __init__(self, debounce_ms: int = SEARCH_DEBOUNCE_MS) -> None:
+        self.debounce = debounce_ms / 1000
+        self._cond = threading.Condition()
+        self._job: Optional[tuple[int, int, Callable[[], Iterable]]] = None
+        self._job_time = 0.0
+        self._generation = 0
+
+        self._thread = threading.Thread(target=self._run, name="search-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, owner: object, job: Callable[[], Iterable]) -> int:
+        """
+        Schedule a query, replacing any pending or running one.
+
+        Args:
+            owner (object): The widget the results belong to.
+            job (Callable): Returns an iterable of result batches; runs on the worker thread.
+
+        Returns:
+            int: Generation number of the query, echoed in its result events.
+        """
+        with self._cond:
+            self._generation += 1
+            self._job = (self._generation, id(owner), job)
+            self._job_time = time.monotonic()
+            self._cond.notify()
+            return self._generation
+
+    def cancel(self) -> None:
+        """Drop the pending query and stop posting results of the running one."""
+        with self._cond:
+            self._generation += 1
+            self._job = None
+            self._cond.notify()
+
+    def is_current(self, event: pygame.event.Event, owner: object) -> bool:
+        """Check whether a result event belongs to the owner's latest query."""
+        return event.owner == id(owner) and event.generation == self._generation
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._job is None:
+                    self._cond.wait()
+
+                # Debounce: wait until no new query arrived for the whole delay
+                while self._job is not None:
+                    remaining = self._job_time + self.debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._job is None:
+                    continue
+
+                generation, owner, job = self._job
+                self._job = None
+
+            try:
+                for batch in job():
+                    if generation != self._generation:
+                        break
+                    self._post(owner, generation, batch, False)
+            except Exception as e:
+                print(f"Error while searching: {e}")
+
+            if generation == self._generation:
+                self._post(owner, generation, None, True)
+
+    @staticmethod
+    def _post(owner: int, generation: int, results, done: bool) -> None:
+        pygame.event.post(pygame.event.Event(
+            SEARCH_RESULTS, owner=owner, generation=generation, results=results, done=done
+        ))
+
+
+_shared: Optional[SearchWorker] = None
+
+
+def get_search_worker() -> SearchWorker:
+    """Return the application-wide search worker, starting it on first use."""
+    global _shared
+    if _shared is None:
+        _shared = SearchWorker()
+    return _shared
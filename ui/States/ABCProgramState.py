@@ -33,4 +33,10 @@ class ProgramState(ABC):
         Args:
             screen (pygame.Surface): The game screen surface.
         """
+        pass
+
+    def exit(self):
+        """
+        Called when the state is left or the app quits (e.g. to save pending changes).
+        """
         pass
\ No newline at end of file
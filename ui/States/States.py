@@ -6,7 +6,10 @@ from ui.Deck_container import DeckContainer
 from ui.Delete_Window import DeleteWindow
 from ui.Add_Window import AddDeckWindow
 from ui.Deck_Edit import DeckEdit
-from ui.LearningSession import LearningSession
+from ui.LearningSession import CARD_DUE, LearningSession
+from ui.SearchWorker import SEARCH_RESULTS
+from ui.DeckWatcher import DECKS_CHANGED
+from ui.SyncWorker import SYNC_DONE
 
 
 class MainMenuState(ProgramState):
@@ -30,6 +33,9 @@ class MainMenuState(ProgramState):
         # Deck container initialized once here
         self.deck_container = DeckContainer()
 
+        # Backgrounds of the screens reachable from the menu
+        IMAGES.prewarm(["DECKS", "CARD_FRONT", "CARD_BACK", "BUNNY_SMILE"])
+
     def handle_input(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.learn_rect.collidepoint(event.pos):
@@ -93,7 +99,24 @@ class DeckScreenState(ProgramState):
         self.add_window = None
         self.deck_container = DeckContainer()
 
+        IMAGES.prewarm(["DECK_EDIT", "DECK_ADD", "DECK_SAVE", "CARD_FRONT", "CARD_BACK"])
+
     def handle_input(self, event):
+        # ─── SEARCH RESULTS ─────────────────────────────────────────────
+        if event.type == SEARCH_RESULTS:
+            self.deck_container.apply_search_results(event)
+            return
+
+        # ─── DECK FOLDER CHANGES ────────────────────────────────────────
+        if event.type == DECKS_CHANGED:
+            self.deck_container.apply_deck_changes(event)
+            return
+
+        # ─── SYNC ───────────────────────────────────────────────────────
+        if event.type == SYNC_DONE:
+            self.deck_container.apply_sync_result(event)
+            return
+
         # ─── SCROLL WHEEL ───────────────────────────────────────────────
         if event.type == pygame.MOUSEBUTTONDOWN and event.button in (4, 5):
             self.deck_container.handle_scroll(event)
@@ -152,6 +175,10 @@ class DeckScreenState(ProgramState):
 
         # ─── KEYBOARD INPUT ─────────────────────────────────────────────
         if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_F5:
+                self.deck_container.start_sync()
+                return
+
             if self.add_window:
                 result = self.add_window.handle_key_input(event, self.deck_container)
                 if result == "cancel":
@@ -193,6 +220,11 @@ class DeckEditState(ProgramState):
         self.deck_edit = DeckEdit(self.deck)
 
     def handle_input(self, event):
+        # ─── SEARCH RESULTS ─────────────────────────────────────────────────
+        if event.type == SEARCH_RESULTS:
+            self.deck_edit.apply_search_results(event)
+            return
+
         # ─── SCROLL WHEEL ───────────────────────────────────────────────────
         if event.type == pygame.MOUSEBUTTONDOWN and event.button in (4, 5):
             self.deck_edit.handle_scroll(event)
@@ -220,8 +252,8 @@ class DeckEditState(ProgramState):
 
             kind, idx = result
             if kind == 'card':
-                card = self.deck.cards[idx]
-                print(f"Selected card #{idx}: {card[2].front}")
+                card = self.deck_edit.cards_filtered[idx]
+                print(f"Selected card #{idx}: {card.front}")
             return
 
         # ─── KEYBOARD INPUT ───────────────────────────────────────────────────
@@ -254,7 +286,15 @@ class LearnState(ProgramState):
         self.decks_rect = card_decks_rect
         self.session = LearningSession(self.deck)
 
+        IMAGES.prewarm(["FINISH"])
+
     def handle_input(self, event):
+        if event.type == CARD_DUE:
+            self.session.on_card_due()
+            return
+        if event.type == pygame.KEYDOWN:
+            self.session.handle_key(event)
+            return
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.menu_rect.collidepoint(event.pos):
                 self.game.change_state(MainMenuState(self.game))
@@ -266,10 +306,15 @@ class LearnState(ProgramState):
     def update(self, keys):
         if self.session.finish:
             self.game.change_state(FinishState(self.game))
+        else:
+            self.session.prefetch()
 
     def draw(self, screen):
         self.session.draw(screen)
 
+    def exit(self):
+        self.session.close()
+
 
 
 class FinishState(ProgramState):
@@ -0,0 +1,27 @@
+import threading
+import pygame
+
+# Posted with: owner, client, changes, result (None on failure) and error (str or None)
+SYNC_DONE = pygame.event.custom_type()
+
+
+def start_sync(owner: object, client, changes: dict) -> threading.Thread:
+    """
+    Run the network part of a sync (SyncClient.exchange) on a background
+    thread and post the outcome back to the main loop as a SYNC_DONE event,
+    where SyncClient.apply merges it into the decks.
+    """
+
+    def run() -> None:
+        result, error = None, None
+        try:
+            result = client.exchange(changes)
+        except Exception as e:
+            error = str(e)
+        pygame.event.post(pygame.event.Event(
+            SYNC_DONE, owner=id(owner), client=client, changes=changes, result=result, error=error
+        ))
+
+    thread = threading.Thread(target=run, name="sync", daemon=True)
+    thread.start()
+    return thread